@@ -5,12 +5,19 @@ ptt/audio.py – Microphone input, recording control, and stream management.
 import os
 import sys
 import time
+import threading
+import collections
 import contextlib
 
 import numpy as np
-import sounddevice as sd
+try:
+    import sounddevice as sd
+except (ImportError, OSError):   # no PortAudio – only the simulated stream works
+    sd = None
 
 import ptt.state as state
+from ptt import metrics, mic_devices
+from ptt.audio_health import MONITOR as _health
 from ptt.constants import SILENT_THRESHOLD
 from ptt.config import T
 
@@ -30,12 +37,15 @@ def audio_callback(indata, frames, time_info, status):
     # NOTE: audio_chunks.append() is not guarded by record_lock here because
     # PortAudio callbacks must be non-blocking. CPython's GIL makes list.append()
     # effectively atomic, so this is safe in practice on CPython.
+    t0 = _health.begin(frames, time_info)
     data = np.clip(indata, -1.0, 1.0)  # guard against out-of-range values from some ALSA devices
     state.current_volume = min(float(np.sqrt(np.mean(data ** 2))) * 8.0, 1.0)
     if status:
-        state.ui_queue.put(("mic_stream_error", str(status)))
+        # counted only – the overlay reports them rate-limited (audio_health.check)
+        _health.flags(status)
     if state.recording:
         state.audio_chunks.append(data.copy())
+    _health.end(t0)
 
 # ─── Recording control ─────────────────────────────────────────────────────────
 
@@ -112,24 +122,38 @@ def _suppress_alsa_errors():
     except Exception:
         yield  # if fd ops fail just run without suppression
 
-def _open_input_stream(device, samplerate=16000, suppress_errors=False):
+def _open_input_stream(device, samplerate=16000, suppress_errors=False, callback=audio_callback):
     """Open an sd.InputStream and start it. Raises on failure."""
+    if "PTT_SIM_AUDIO" in os.environ:   # headless tests (ptt/sim.py)
+        from ptt.sim import from_env
+        stream = from_env(callback, samplerate, 512)
+        stream.start()
+        return stream
+    if sd is None:
+        raise RuntimeError("sounddevice / PortAudio not available")
     ctx = _suppress_alsa_errors() if suppress_errors else contextlib.nullcontext()
     with ctx:
         stream = sd.InputStream(
             samplerate=samplerate, channels=1, dtype="float32",
-            callback=audio_callback, blocksize=512,
+            callback=callback, blocksize=512,
             device=device,
         )
         stream.start()
     return stream
 
-def start_audio_stream() -> bool:
+def _close(stream):
+    try: stream.stop(); stream.close()
+    except Exception: pass
+
+def _close_stream():
+    global _feed
     if state._audio_stream is not None:
-        try: state._audio_stream.stop(); state._audio_stream.close()
-        except Exception: pass
+        _close(state._audio_stream)
         state._audio_stream = None
+    _feed = None
 
+def _attempts() -> list:
+    """(device, rate) to try for the configured mic, best first."""
     device = state.cfg.get("mic_device", -1)
     if device == -1:
         device = None  # let sounddevice use the OS default
@@ -137,14 +161,27 @@ def start_audio_stream() -> bool:
     # Try requested device first; if ALSA rejects 16 kHz, fall back to system default.
     attempts = [(device, 16000)]
     if device is not None:
+        if mic_devices.supports(device) is False:   # probed: no 16 kHz mono
+            state.log("⚠️  Selected mic doesn't record 16 kHz – using system default.")
+            attempts = []
         attempts.append((None, 16000))   # system default always supports resampling
+    return attempts
+
+def start_audio_stream() -> bool:
+    global _feed
+    _close_stream()
+    attempts = _attempts()
 
     last_err = None
     for i, (dev, rate) in enumerate(attempts):
         is_fallback = (i > 0)
         try:
             # Suppress C-level ALSA noise for non-final attempts that we expect may fail
-            state._audio_stream = _open_input_stream(dev, rate, suppress_errors=not is_fallback and len(attempts) > 1)
+            feed = _Feed(live=True)
+            state._audio_stream = _open_input_stream(dev, rate, callback=feed,
+                                                     suppress_errors=not is_fallback and len(attempts) > 1)
+            _feed = feed
+            _health.restart()
             if is_fallback:
                 state.log(f"⚠️  Selected mic unsupported at {rate} Hz – using system default.")
             state._silent_count = 0; state.MIC_OK = True
@@ -159,11 +196,134 @@ def start_audio_stream() -> bool:
     state.ui_queue.put(("mic_error", str(last_err)))
     return False
 
+# ─── Hot switch ────────────────────────────────────────────────────────────────
+
+VALIDATE_BLOCKS    = 3      # clean blocks a new stream delivers before it takes over
+VALIDATE_TIMEOUT_S = 1.0
+HANDOVER_TIMEOUT_S = 0.2    # old stream silent this long: take over without it
+STAGE_BLOCKS       = 16     # staged while validating (~0.5 s)
+
+_feed       = None          # _Feed of state._audio_stream
+last_switch = {}            # timings of the last switch_audio_stream()
+
+class _Feed:
+    """Callback of one input stream.
+
+    The live feed passes its blocks to ``audio_callback``.  A feed opened by
+    ``switch_audio_stream`` only stages its blocks until it has delivered
+    VALIDATE_BLOCKS clean ones.  Then the live feed hands over at the end of
+    its next block and retires; the new feed's first live call appends the
+    staged audio recorded after that moment, trimmed to the sample, so the
+    recording continues without a gap or a repeat.
+    """
+
+    def __init__(self, live: bool = False, rate: int = 16000):
+        self.live    = live
+        self.rate    = rate
+        self.retired = False
+        self.next    = None                 # feed taking over at the next block boundary
+        self.cut     = None                 # when the previous feed's last block arrived
+        self.blocks  = 0
+        self.staged  = collections.deque(maxlen=STAGE_BLOCKS)
+        self.ready   = threading.Event()    # validated
+        self.taken   = threading.Event()    # live
+
+    def __call__(self, indata, frames, time_info, status):
+        if self.live:
+            if self.cut is not None:         # first block after the hand-over
+                indata = self._splice(indata)
+                frames = len(indata)
+            if frames:
+                audio_callback(indata, frames, time_info, status)
+            nxt = self.next
+            if nxt is not None:              # block boundary: hand over
+                self.live, self.retired = False, True
+                nxt.take_over(time.perf_counter())
+        elif not self.retired:
+            self.staged.append((time.perf_counter(), indata.copy()))
+            if not status:
+                self.blocks += 1
+                if self.blocks >= VALIDATE_BLOCKS:
+                    self.ready.set()
+
+    def take_over(self, cut: float):
+        self.cut  = cut
+        self.live = True
+        self.taken.set()
+
+    def _splice(self, indata):
+        """Append staged audio after the cut; returns the part of *indata* still due."""
+        cut, self.cut = self.cut, None
+        _health.restart()                    # new device, new ADC timeline
+        pending = [(t, d) for t, d in self.staged if t > cut]
+        self.staged.clear()
+        first = True
+        for t, data in pending:
+            if first:   # recorded partly before the cut: keep the tail
+                data, first = data[len(data) - min(len(data), round((t - cut) * self.rate)):], False
+            if state.recording and len(data):
+                state.audio_chunks.append(data)
+        if first:       # no staged block after the cut: trim the current one
+            return indata[len(indata) - min(len(indata), round((time.perf_counter() - cut) * self.rate)):]
+        return indata
+
+def switch_audio_stream() -> bool:
+    """Open the configured microphone next to the running stream and switch
+    over at a block boundary – a recording in progress continues without a
+    gap.  Without a live stream, or when the device can't be opened twice,
+    the stream is reopened with ``start_audio_stream()``.
+    """
+    global _feed
+    old, old_feed = state._audio_stream, _feed
+    if old is None or old_feed is None or not old_feed.live:
+        return start_audio_stream()
+    t0   = time.perf_counter()
+    feed = _Feed()
+    new, last_err = None, None
+    for dev, rate in _attempts():
+        try:
+            new = _open_input_stream(dev, rate, callback=feed)
+            break
+        except Exception as e:
+            last_err = e
+    if new is None:
+        state.log(f"⚠️  Can't open the microphone next to the running one ({last_err}) – reopening")
+        return start_audio_stream()
+    t_open = time.perf_counter()
+    if not feed.ready.wait(VALIDATE_TIMEOUT_S):
+        _close(new)
+        state.log("⚠️  New microphone stream delivered no audio – keeping the current one")
+        return False
+    t_valid = time.perf_counter()
+    old_feed.next = feed
+    if not feed.taken.wait(HANDOVER_TIMEOUT_S):   # old stream stalled
+        old_feed.live, old_feed.retired = False, True
+        feed.take_over(time.perf_counter())
+    t_switch = time.perf_counter()
+    state._audio_stream, _feed = new, feed
+    _close(old)
+    state._silent_count = 0; state.MIC_OK = True
+    last_switch.update(open_s=t_open - t0, validate_s=t_valid - t_open,
+                       handover_s=t_switch - t_valid, total_s=t_switch - t0)
+    metrics.MIC_SWITCH.observe(t_switch - t0)
+    state.log(f"🎤 Microphone switched in {(t_switch - t0) * 1000:.0f} ms "
+              f"(open {(t_open - t0) * 1000:.0f}, check {(t_valid - t_open) * 1000:.0f}, "
+              f"hand-over {(t_switch - t_valid) * 1000:.0f} ms)")
+    state.ui_queue.put(("mic_ok", None))
+    return True
+
 def restart_audio_stream():
+    """🎤 / recovery: hot-switch while a recording runs on a live stream,
+    otherwise reopen after re-reading the device list (PortAudio can only be
+    re-initialised with no stream open)."""
     state.log("🔄 Restarting microphone...")
-    request_windows_mic_permission()
-    time.sleep(0.5)
-    if start_audio_stream():
+    if state.recording and _feed is not None and _feed.live:
+        ok = switch_audio_stream()
+    else:
+        _close_stream()
+        mic_devices.scan(reinit=True)   # pick up plugged / unplugged devices
+        ok = start_audio_stream() or (request_windows_mic_permission() and start_audio_stream())
+    if ok:
         state.ui_queue.put(("status", "ready", T("ready")))
     else:
         state.ui_queue.put(("status", "error", T("mic_error")))
@@ -0,0 +1,158 @@
+"""
+ptt/audio_health.py – Timing and error counters for ``audio_callback``.
+
+PortAudio calls ``audio_callback`` every 512 frames – a 32 ms budget at
+16 kHz.  ``MONITOR`` measures every call without allocating containers:
+
+* callback duration     histogram against the block budget, late calls
+* inter-callback jitter |interval − 32 ms| histogram, max
+* flags                 input overflow / underflow (and others) from ``status``
+* dropped blocks        gaps in the ADC timestamps PortAudio reports
+
+All counters and histogram buckets are preallocated; the callback only
+increments them.  ``check()`` is polled from the Tk thread: it returns a
+one-line summary for the overlay and, at most every ``ALERT_INTERVAL_S``, an
+alert with what went wrong since the last one.
+"""
+
+import bisect
+import time
+
+SAMPLE_RATE      = 16000
+BLOCK_FRAMES     = 512
+ALERT_INTERVAL_S = 30.0
+
+DURATION_MS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0)   # + over budget
+JITTER_MS   = (0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)   # + beyond
+
+
+def _quantile(hist: list, bounds: tuple, q: float) -> float:
+    """Upper bound (ms) of the bucket holding quantile *q*; inf past the last one."""
+    total = sum(hist)
+    if not total:
+        return 0.0
+    need, acc = q * total, 0
+    for i, n in enumerate(hist):
+        acc += n
+        if acc >= need:
+            return bounds[i] if i < len(bounds) else float("inf")
+    return float("inf")
+
+
+class AudioHealth:
+    """Counters for one input stream; written by the audio thread only."""
+
+    def __init__(self, block_frames: int = BLOCK_FRAMES, rate: int = SAMPLE_RATE):
+        self.rate   = rate
+        self.budget = block_frames / rate
+        self.reset()
+
+    def reset(self):
+        self.callbacks  = 0
+        self.late       = 0     # callbacks over the block budget
+        self.overflows  = 0
+        self.underflows = 0
+        self.other      = 0     # any other status flag
+        self.dropped    = 0     # blocks missing from the ADC timeline
+        self.dur_hist   = [0] * (len(DURATION_MS) + 1)
+        self.jit_hist   = [0] * (len(JITTER_MS) + 1)
+        self.dur_max    = 0.0   # ms
+        self.jit_max    = 0.0   # ms
+        self._alert_at  = float("-inf")
+        self._alerted   = (0, 0, 0, 0)
+        self.restart()
+
+    def restart(self):
+        """New stream: the gap to the old one is neither jitter nor a drop."""
+        self._last     = 0.0
+        self._last_adc = 0.0
+
+    # ── audio thread ──────────────────────────────────────────────────────────
+
+    def begin(self, frames: int, time_info=None) -> float:
+        t = time.perf_counter()
+        expected = frames / self.rate
+        if self._last:
+            jit = abs(t - self._last - expected) * 1000.0
+            self.jit_hist[bisect.bisect_left(JITTER_MS, jit)] += 1
+            if jit > self.jit_max:
+                self.jit_max = jit
+        self._last = t
+        adc = getattr(time_info, "inputBufferAdcTime", 0.0) if time_info is not None else 0.0
+        if adc:
+            if self._last_adc:
+                gap = adc - self._last_adc - expected
+                if gap > expected * 0.5:
+                    self.dropped += int(gap / expected + 0.5)
+            self._last_adc = adc
+        return t
+
+    def flags(self, status):
+        over  = getattr(status, "input_overflow", False)
+        under = getattr(status, "input_underflow", False)
+        if over:
+            self.overflows += 1
+        if under:
+            self.underflows += 1
+        if not (over or under):
+            self.other += 1
+
+    def end(self, t0: float):
+        ms = (time.perf_counter() - t0) * 1000.0
+        self.dur_hist[bisect.bisect_left(DURATION_MS, ms)] += 1
+        if ms > self.dur_max:
+            self.dur_max = ms
+        if ms > self.budget * 1000.0:
+            self.late += 1
+        self.callbacks += 1
+
+    # ── readers ───────────────────────────────────────────────────────────────
+
+    def snapshot(self) -> dict:
+        dur, jit = list(self.dur_hist), list(self.jit_hist)
+        return {
+            "callbacks":  self.callbacks,
+            "budget_ms":  self.budget * 1000.0,
+            "late":       self.late,
+            "overflows":  self.overflows,
+            "underflows": self.underflows,
+            "other":      self.other,
+            "dropped":    self.dropped,
+            "dur_p50_ms": _quantile(dur, DURATION_MS, 0.50),
+            "dur_p99_ms": _quantile(dur, DURATION_MS, 0.99),
+            "dur_max_ms": self.dur_max,
+            "jit_p99_ms": _quantile(jit, JITTER_MS, 0.99),
+            "jit_max_ms": self.jit_max,
+        }
+
+    def summary(self) -> str:
+        s = self.snapshot()
+        if not s["callbacks"]:
+            return ""
+        text = (f"cb ≤{s['dur_p99_ms']:g}/{s['budget_ms']:.0f} ms · "
+                f"jitter ≤{s['jit_p99_ms']:g} ms")
+        errors = s["late"] + s["overflows"] + s["underflows"] + s["dropped"]
+        return text + (f" · ⚠ {errors}" if errors else "")
+
+    def check(self, now: float = None):
+        """``(summary, alert)``; *alert* is None unless something new went wrong
+        and the last alert is at least ``ALERT_INTERVAL_S`` old."""
+        now   = time.monotonic() if now is None else now
+        cur   = (self.late, self.overflows, self.underflows, self.dropped)
+        delta = [c - a for c, a in zip(cur, self._alerted)]
+        alert = None
+        if any(delta) and now - self._alert_at >= ALERT_INTERVAL_S:
+            parts = [f"{n} {what}" for n, what in zip(
+                delta, ("late callbacks", "input overflows", "input underflows",
+                        "dropped blocks")) if n]
+            alert = (f"🎚️  Audio: {', '.join(parts)} (callback max {self.dur_max:.1f} ms, "
+                     f"jitter max {self.jit_max:.1f} ms)")
+            self._alert_at, self._alerted = now, cur
+        return self.summary(), alert
+
+
+MONITOR = AudioHealth()
+
+
+def check(now: float = None):
+    return MONITOR.check(now)
@@ -0,0 +1,128 @@
+"""
+ptt/benchmark.py – Local latency benchmark: transcription time vs. thread count.
+
+Run:  python -m ptt.benchmark [--model base] [--threads 1,2,4] [--wav speech.wav]
+                              [--engine ct2,ov]
+
+Loads the configured model once per engine and thread count, transcribes the
+same clip ``--runs`` times and prints median latency and real-time factor.
+``--engine ct2,ov`` compares faster-whisper (CTranslate2) with OpenVINO on
+the CPU side by side.  The row marked ``auto`` is what the app picks when
+``cpu_threads`` is 0.  Without ``--wav`` a synthetic 5 s clip is used
+(latency only – the text is noise).
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+import ptt.state as state
+from ptt.config import load_settings
+from ptt.hardware import auto_threads, physical_cores, _usable_cpus
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_clip(seconds: float = 5.0) -> np.ndarray:
+    """Voiced-like test signal: harmonics with a syllable-rate envelope."""
+    t   = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    f0  = 140 + 30 * np.sin(2 * np.pi * 0.7 * t)
+    sig = sum(np.sin(2 * np.pi * k * np.cumsum(f0) / SAMPLE_RATE) / k for k in range(1, 6))
+    env = 0.5 * (1 + np.sin(2 * np.pi * 4 * t)) ** 2
+    return (0.1 * sig * env).astype(np.float32)
+
+
+def load_clip(path: str) -> np.ndarray:
+    import soundfile as sf
+    audio, sr = sf.read(path, dtype="float32", always_2d=True)
+    audio = audio.mean(axis=1)
+    if sr != SAMPLE_RATE:   # linear resample is good enough for timing
+        n = int(len(audio) * SAMPLE_RATE / sr)
+        audio = np.interp(np.linspace(0, len(audio) - 1, n),
+                          np.arange(len(audio)), audio).astype(np.float32)
+    return audio
+
+
+def bench_engine(kind: str, model: str, device: str, compute: str, threads: int,
+                 audio: np.ndarray, runs: int, beam: int) -> dict:
+    """Load *model* with engine *kind* (see ``ptt.engines``) and time ``runs`` decodes."""
+    from ptt.model_manager import create_engine
+    eng  = create_engine(kind, model, device, compute, threads=threads)
+    lang = state.cfg.get("language")
+    lang = None if lang in (None, "", "auto") else lang
+
+    def once():
+        segments, _ = eng.transcribe(audio, language=lang, beam_size=beam, vad_filter=False)
+        return " ".join(s.text.strip() for s in segments)
+
+    eng.warmup()   # first call allocates buffers
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        once()
+        times.append(time.perf_counter() - t0)
+    return {"load_s": eng.stats.load_s, "median_s": statistics.median(times), "min_s": min(times)}
+
+
+ALIASES = {"ov": "openvino"}
+
+
+def engine_device(kind: str, device: str) -> str:
+    """App device the benchmark runs *kind* on (OpenVINO always on its CPU plugin)."""
+    return "ov_cpu" if kind == "openvino" else device
+
+
+def default_thread_counts() -> list:
+    logical = len(_usable_cpus())
+    counts  = {1, auto_threads("cpu"), physical_cores(), logical}
+    n = 2
+    while n < logical:
+        counts.add(n); n *= 2
+    return sorted(counts)
+
+
+def main(argv=None):
+    load_settings()
+    ap = argparse.ArgumentParser(prog="python -m ptt.benchmark", description=__doc__.split("\n\n")[0])
+    ap.add_argument("--model",   default=state.cfg["model"])
+    ap.add_argument("--device",  default="cpu", choices=["cpu", "cuda"])
+    ap.add_argument("--compute", default="int8")
+    ap.add_argument("--threads", help="comma-separated thread counts (default: 1, 2, 4, …, auto)")
+    ap.add_argument("--runs",    type=int, default=3)
+    ap.add_argument("--beam",    type=int, default=state.cfg["beam_size"])
+    ap.add_argument("--wav",     help="speech clip to transcribe (default: synthetic 5 s)")
+    ap.add_argument("--engine",  default="ct2",
+                    help="comma-separated engines: ct2 (faster-whisper), ov / openvino "
+                         "(OpenVINO CPU), stub")
+    args = ap.parse_args(argv)
+
+    audio   = load_clip(args.wav) if args.wav else synthetic_clip()
+    dur     = len(audio) / SAMPLE_RATE
+    counts  = ([int(x) for x in args.threads.split(",")] if args.threads
+               else default_thread_counts())
+    auto    = auto_threads(args.device)
+
+    print(f"Model {args.model} | {args.device}/{args.compute} | beam {args.beam} | "
+          f"clip {dur:.1f} s | {physical_cores()} physical / {len(_usable_cpus())} logical cores")
+    from ptt import engines
+    kinds = [ALIASES.get(e.strip(), e.strip()) for e in args.engine.split(",") if e.strip()]
+    print(f"{'engine':<15s} {'threads':>8s} {'load s':>8s} {'median ms':>10s} {'min ms':>8s} {'RTF':>6s}")
+    for n in counts:
+        for kind in kinds:
+            label = engines.get(kind).label
+            if kind == "openvino":
+                label += " CPU"
+            try:
+                r = bench_engine(kind, args.model, engine_device(kind, args.device),
+                                 args.compute, n, audio, args.runs, args.beam)
+            except Exception as e:
+                print(f"{label:<15s} {n:>8d}  failed: {e}")
+                continue
+            mark = "  ← auto" if n == auto else ""
+            print(f"{label:<15s} {n:>8d} {r['load_s']:>8.1f} {r['median_s']*1000:>10.0f} "
+                  f"{r['min_s']*1000:>8.0f} {r['median_s']/dur:>6.2f}{mark}")
+
+if __name__ == "__main__":
+    main()
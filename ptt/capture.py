@@ -0,0 +1,181 @@
+"""
+ptt/capture.py – Opt-in archive of utterances for offline replay.
+
+With ``capture_utterances`` on, every utterance that reached the engine is
+stored in ``capture_dir`` (default ``captures/`` next to settings.json):
+
+    20260412-093015-123.flac   16 kHz mono audio (int16 WAV without soundfile)
+    20260412-093015-123.json   text, outcome, stage timings, served model and
+                               the recognition settings in effect
+
+``submit()`` only picks the file name and queues the array – encoding and
+file I/O happen on a writer thread, and when the writer falls behind
+utterances are dropped rather than delaying the paste.  The oldest captures are deleted beyond
+``capture_max_mb``.  ``python -m ptt.replay`` runs a capture directory back
+through the pipeline.
+"""
+
+import json
+import queue
+import threading
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+import ptt.state as state
+from ptt.constants import BASE_DIR, VERSION
+
+SAMPLE_RATE = 16000
+QUEUE_MAX   = 8
+
+# settings that change what or how fast the pipeline recognizes
+SETTINGS_KEYS = ("model", "device", "engine", "compute_type", "language",
+                 "language_candidates", "sticky_language", "output_language",
+                 "beam_size", "vad_filter", "vad_silence_ms", "cpu_threads",
+                 "num_workers", "inference_process")
+
+_queue   = queue.Queue(QUEUE_MAX)
+_thread  = None
+_lock    = threading.Lock()
+_pending = set()      # names handed out by submit() but not written yet
+dropped  = 0
+
+
+def capture_dir() -> Path:
+    return Path(state.cfg.get("capture_dir") or BASE_DIR / "captures")
+
+
+# ─── Audio files ───────────────────────────────────────────────────────────────
+
+def write_audio(path: Path, audio: np.ndarray) -> Path:
+    """FLAC via soundfile, else 16-bit WAV; returns the file written."""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+    try:
+        import soundfile as sf
+        path = path.with_suffix(".flac")
+        sf.write(str(path), pcm, SAMPLE_RATE, subtype="PCM_16", format="FLAC")
+    except ImportError:
+        path = path.with_suffix(".wav")
+        with wave.open(str(path), "wb") as w:
+            w.setnchannels(1); w.setsampwidth(2); w.setframerate(SAMPLE_RATE)
+            w.writeframes(pcm.tobytes())
+    return path
+
+
+def read_audio(path: Path) -> np.ndarray:
+    """16 kHz mono float32 from a file written by ``write_audio``."""
+    path = Path(path)
+    if path.suffix == ".wav":
+        with wave.open(str(path), "rb") as w:
+            pcm = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+        return pcm.astype(np.float32) / 32767
+    import soundfile as sf
+    audio, _ = sf.read(str(path), dtype="float32", always_2d=True)
+    return audio.mean(axis=1)
+
+
+# ─── Writer ────────────────────────────────────────────────────────────────────
+
+def _reserve(folder: Path, t: float) -> str:
+    """Unused capture name for time *t* (caller holds ``_lock``)."""
+    name = time.strftime("%Y%m%d-%H%M%S", time.localtime(t)) + f"-{int(t * 1000) % 1000:03d}"
+    stem, n = name, 1
+    while stem in _pending or (folder / stem).with_suffix(".json").exists():   # same millisecond
+        stem, n = f"{name}_{n}", n + 1
+    _pending.add(stem)
+    return stem
+
+
+def submit(audio: np.ndarray, **record):
+    """Queue an utterance for archiving; returns its capture id (the file
+    stem, e.g. for the history's ``audio`` column) or None if it was dropped.
+
+    *record* holds text, result, timings, model, device and language; the
+    settings snapshot is taken here, when the utterance was recognized.
+    """
+    global _thread, dropped
+    record["settings"] = {k: state.cfg.get(k) for k in SETTINGS_KEYS}
+    record["time"]     = time.time()
+    folder = capture_dir()
+    with _lock:
+        stem = _reserve(folder, record["time"])
+        try:
+            _queue.put_nowait((audio, record, folder / stem,
+                               int(state.cfg.get("capture_max_mb", 0) or 0)))
+        except queue.Full:
+            _pending.discard(stem)
+            dropped += 1
+            return None
+        if _thread is None or not _thread.is_alive():
+            _thread = threading.Thread(target=_run, daemon=True, name="capture-writer")
+            _thread.start()
+    return stem
+
+
+def flush(timeout: float = 10.0) -> bool:
+    """Wait until everything submitted so far is on disk."""
+    deadline = time.monotonic() + timeout
+    while _queue.unfinished_tasks:
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def _run():
+    while True:
+        try:
+            item = _queue.get(timeout=5)
+        except queue.Empty:
+            return   # restarted by the next submit()
+        try:
+            _write(*item)
+        except Exception as e:
+            state.log(f"⚠️  Capture failed: {e}")
+        finally:
+            with _lock:
+                _pending.discard(item[2].name)
+            _queue.task_done()
+
+
+def _write(audio, record, stem: Path, max_mb: int):
+    folder = stem.parent
+    folder.mkdir(parents=True, exist_ok=True)
+    path = write_audio(stem, audio)
+    record.update(audio=path.name, sample_rate=SAMPLE_RATE,
+                  duration_s=round(len(audio) / SAMPLE_RATE, 3), version=VERSION,
+                  timings={k: round(v, 4) for k, v in record.get("timings", {}).items()})
+    stem.with_suffix(".json").write_text(json.dumps(record, ensure_ascii=False, indent=1),
+                                         encoding="utf-8")
+    if max_mb:
+        _evict(folder, max_mb * 1024 * 1024)
+
+
+def _evict(folder: Path, limit: int):
+    entries = sorted(folder.glob("*.json"))
+    sizes   = {p: sum(f.stat().st_size for f in folder.glob(p.stem + ".*")) for p in entries}
+    total   = sum(sizes.values())
+    for p in entries[:-1]:   # never the capture just written
+        if total <= limit:
+            break
+        for f in folder.glob(p.stem + ".*"):
+            f.unlink(missing_ok=True)
+        total -= sizes[p]
+
+
+# ─── Reading ───────────────────────────────────────────────────────────────────
+
+def load(folder) -> list:
+    """``[(id, record, audio path), ...]`` of a capture directory, oldest first."""
+    out = []
+    for p in sorted(Path(folder).glob("*.json")):
+        try:
+            record = json.loads(p.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        audio = p.with_name(record.get("audio", ""))
+        if audio.is_file():
+            out.append((p.stem, record, audio))
+    return out
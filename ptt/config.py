@@ -1,8 +1,17 @@
 """
 ptt/config.py – Translation helper, settings load/save, model directory resolver.
+
+Settings are written behind the UI: ``save_settings()`` only snapshots
+``state.cfg`` and returns; a writer thread debounces bursts of saves and
+replaces ``settings.json`` atomically (temp file + fsync + rename).
 """
 
+import atexit
 import json
+import os
+import tempfile
+import threading
+import time
 from pathlib import Path
 
 import ptt.state as state
@@ -18,22 +27,162 @@ def T(key: str, lang: str = None) -> str:
 
 # ─── Settings ──────────────────────────────────────────────────────────────────
 
+SAVE_DEBOUNCE_S = 0.5   # coalesce saves arriving within this window
+
+
+class _SettingsWriter:
+    """Debounced, atomic write-behind for settings.json.
+
+    ``dirty`` is only set when the serialized settings differ from what is
+    known to be on disk, so unchanged settings are never rewritten.
+    """
+
+    def __init__(self, path: Path, debounce: float = SAVE_DEBOUNCE_S):
+        self.path      = path
+        self.debounce  = debounce
+        self._cond     = threading.Condition()
+        self._io_lock  = threading.Lock()
+        self._pending  = None    # (seq, serialized snapshot) waiting to be written
+        self._inflight = []      # (seq, snapshot) taken for writing, not yet in the file
+        self._on_disk  = None    # last snapshot known to be in the file
+        self._seq      = 0       # submit counter; older snapshots never overwrite newer
+        self._written  = 0
+        self._deadline = 0.0
+        self._thread   = None
+        self.writes    = 0
+
+    @property
+    def dirty(self) -> bool:
+        with self._cond:
+            return self._pending is not None or bool(self._inflight)
+
+    def mark_clean(self, snapshot: str):
+        with self._cond:
+            self._on_disk = snapshot
+            self._pending = None
+
+    def _newest(self):
+        """Snapshot the file will hold once pending and in-flight writes are done (lock held)."""
+        if self._pending is not None:
+            return self._pending[1]
+        if self._inflight:
+            return max(self._inflight)[1]
+        return self._on_disk
+
+    def submit(self, snapshot: str):
+        """Queue *snapshot* for writing after the debounce interval."""
+        with self._cond:
+            if snapshot == self._newest():
+                return
+            if snapshot == self._on_disk and not self._inflight:
+                self._pending = None     # reverted before the write: nothing to do
+                return
+            self._seq     += 1
+            self._pending  = (self._seq, snapshot)
+            self._deadline = time.monotonic() + self.debounce
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True,
+                                                name="settings-writer")
+                self._thread.start()
+            self._cond.notify()
+
+    def flush(self, timeout: float = 10.0):
+        """Write any pending snapshot now and wait for a write in progress
+        (called on close and at exit): afterwards everything submitted is on disk."""
+        with self._cond:
+            item = self._take()
+        if item is not None:
+            self._write(*item)
+        with self._cond:
+            self._cond.wait_for(lambda: not self._inflight, timeout)
+
+    def _take(self):
+        """Pending snapshot → in flight (lock held)."""
+        item, self._pending = self._pending, None
+        if item is not None:
+            self._inflight.append(item)
+        return item
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if self._pending is None:
+                    self._thread = None
+                    return
+                delay = self._deadline - time.monotonic()
+                if delay > 0:
+                    self._cond.wait(delay)
+                    continue
+                item = self._take()
+            self._write(*item)
+
+    def _write(self, seq: int, snapshot: str):
+        try:
+            with self._io_lock:
+                if seq <= self._written:
+                    return   # a newer snapshot was flushed meanwhile
+                self._write_file(snapshot)
+                self._written = seq
+        finally:
+            with self._cond:
+                self._inflight.remove((seq, snapshot))
+                self._cond.notify_all()
+
+    def _write_file(self, snapshot: str):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".settings-", suffix=".tmp",
+                                       dir=str(self.path.parent))
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    f.write(snapshot)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp, self.path)
+            except BaseException:
+                try: os.unlink(tmp)
+                except OSError: pass
+                raise
+            with self._cond:
+                self._on_disk = snapshot
+            self.writes += 1
+        except Exception as e:
+            state.ui_queue.put(("log", f"⚠️ Settings save error: {e}"))
+
+
+_writer = _SettingsWriter(SETTINGS_FILE)
+atexit.register(_writer.flush)
+
+
+def _serialize(cfg: dict) -> str:
+    return json.dumps(cfg, indent=2, ensure_ascii=False)
+
 def load_settings():
     state.cfg.clear()
     state.cfg.update(DEFAULTS)
     if SETTINGS_FILE.exists():
         try:
             with open(SETTINGS_FILE, encoding="utf-8") as f:
-                state.cfg.update(json.load(f))
+                on_disk = json.load(f)
+            state.cfg.update(on_disk)
+            if on_disk == state.cfg:   # file already complete → nothing to rewrite
+                _writer.mark_clean(_serialize(state.cfg))
         except Exception:
             pass
 
-def save_settings():
+def save_settings(flush: bool = False):
+    """Schedule a write of state.cfg; pass flush=True to write synchronously."""
     try:
-        with open(SETTINGS_FILE, "w", encoding="utf-8") as f:
-            json.dump(state.cfg, f, indent=2, ensure_ascii=False)
+        _writer.submit(_serialize(state.cfg))
     except Exception as e:
         state.ui_queue.put(("log", f"⚠️ Settings save error: {e}"))
+        return
+    if flush:
+        _writer.flush()
+
+def flush_settings():
+    """Write pending settings immediately (blocking)."""
+    _writer.flush()
 
 # ─── Model directory ───────────────────────────────────────────────────────────
 
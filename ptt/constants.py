@@ -11,6 +11,8 @@ from pathlib import Path
 
 BASE_DIR        = Path(sys.executable).parent if getattr(sys, 'frozen', False) else Path(__file__).parent.parent
 SETTINGS_FILE   = BASE_DIR / "settings.json"
+HISTORY_FILE    = BASE_DIR / "history.db"
+MIC_CACHE_FILE  = BASE_DIR / "mic_devices.json"
 MODEL_CACHE_DIR = str(BASE_DIR / "models")
 
 # ─── Defaults ──────────────────────────────────────────────────────────────────
@@ -18,21 +20,39 @@ MODEL_CACHE_DIR = str(BASE_DIR / "models")
 DEFAULTS = {
     "hotkey":          "ctrl+alt+space" if sys.platform == "win32" else "ctrl+space",
     "language":        "de",        # Whisper recognition language
+    "language_candidates": "",      # auto-detect only among these, e.g. "de,en" (empty = all)
+    "sticky_language": True,        # auto-detect: keep a confidently detected language
     "ui_lang":         "en",        # Interface language
     "model":           "base",
-    "device":          "auto",
+    "progressive_start": False,     # serve with progressive_model while "model" loads
+    "progressive_model": "tiny",
+    "device":          "auto",      # auto | cuda | npu | cpu | ov_cpu
+    "engine":          "auto",      # auto = by device | ct2 | openvino | stub (ptt.engines)
+    "inference_process": False,     # run the engine in a supervised worker process
     "compute_type":    "auto",
     "paste_mode":      "clipboard",
+    "type_backend":    "auto",      # direct-typing sink: auto | win32 | pynput | ydotool | wtype
     "output_language": "same",   # "same" = no translation, "en" = translate to English
     "vad_filter":      True,
     "vad_silence_ms":  300,
     "sound_feedback":  True,
     "opacity":         0.95,
     "beam_size":       5,
+    "cpu_threads":     0,    # inference threads per worker (0 = auto from physical cores)
+    "num_workers":     0,    # concurrent transcriptions (0 = auto = 1 for push-to-talk)
     "window_x":        -1,
     "window_y":        -1,
     "models_dir":      "",   # empty = BASE_DIR/models
+    "ov_cache_max_mb": 4096, # OpenVINO compiled-model cache size limit (models_dir/ov_cache)
+    "prefetch_model":  "",   # model to download in the background after startup
     "mic_device":      -1,   # -1 = default device, else device index
+    "history_enabled": True, # store transcripts in history.db (searchable)
+    "idle_unload_min": 0,    # unload the model after N idle minutes (0 = never)
+    "capture_utterances": False,  # archive utterances for python -m ptt.replay
+    "capture_dir":     "",   # empty = BASE_DIR/captures
+    "capture_max_mb":  500,  # oldest captures are deleted beyond this size
+    "metrics_port":    0,    # Prometheus endpoint on 127.0.0.1:<port>/metrics (0 = off)
+    "metrics_textfile": "",  # or write metrics to this .prom file (node_exporter textfile)
 }
 
 # ─── Colors ────────────────────────────────────────────────────────────────────
@@ -114,6 +134,14 @@ TRANSLATIONS = {
         "en": "📋 Copy log", "de": "📋 Log kopieren",
         "fr": "📋 Copier journal", "es": "📋 Copiar log",
     },
+    "btn_profile": {
+        "en": "⏱ Profile", "de": "⏱ Profilieren",
+        "fr": "⏱ Profiler", "es": "⏱ Perfilar",
+    },
+    "btn_profile_stop": {
+        "en": "⏹ Save profile", "de": "⏹ Profil speichern",
+        "fr": "⏹ Enregistrer profil", "es": "⏹ Guardar perfil",
+    },
     "flash_copied": {
         "en": "📋 Copied!", "de": "📋 Kopiert!",
         "fr": "📋 Copié!", "es": "📋 ¡Copiado!",
@@ -122,6 +150,25 @@ TRANSLATIONS = {
         "en": "📌 Pasted!", "de": "📌 Eingefügt!",
         "fr": "📌 Collé!", "es": "📌 ¡Pegado!",
     },
+    # ── History window ─────────────────────────────────────────────────────────
+    "history_win_title": {
+        "en": "History – Whisper PTT", "de": "Verlauf – Whisper PTT",
+        "fr": "Historique – Whisper PTT", "es": "Historial – Whisper PTT",
+    },
+    "history_hint": {
+        "en": "Double-click an entry to copy it",
+        "de": "Doppelklick auf einen Eintrag kopiert ihn",
+        "fr": "Double-cliquez sur une entrée pour la copier",
+        "es": "Doble clic en una entrada para copiarla",
+    },
+    "history_count": {
+        "en": "{n} entries", "de": "{n} Einträge",
+        "fr": "{n} entrées", "es": "{n} entradas",
+    },
+    "history_disabled": {
+        "en": "History is unavailable (see log)", "de": "Verlauf nicht verfügbar (siehe Log)",
+        "fr": "Historique indisponible (voir journal)", "es": "Historial no disponible (ver log)",
+    },
     # ── Settings window ────────────────────────────────────────────────────────
     "settings_title": {
         "en": "⚙  Settings", "de": "⚙  Einstellungen",
@@ -206,6 +253,22 @@ TRANSLATIONS = {
         "fr": "Langue de reconnaissance (entrée)",
         "es": "Idioma de reconocimiento (entrada)",
     },
+    "lang_candidates_label": {
+        "en": "Auto-detect only among:", "de": "Automatisch nur erkennen aus:",
+        "fr": "Détection auto parmi:", "es": "Detección auto solo entre:",
+    },
+    "lang_candidates_hint": {
+        "en": "e.g. de,en – empty = all languages",
+        "de": "z. B. de,en – leer = alle Sprachen",
+        "fr": "ex. de,en – vide = toutes les langues",
+        "es": "p. ej. de,en – vacío = todos los idiomas",
+    },
+    "sticky_language": {
+        "en": "Keep detected language (click 🌐 in the overlay to reset)",
+        "de": "Erkannte Sprache beibehalten (🌐 im Overlay klicken zum Zurücksetzen)",
+        "fr": "Garder la langue détectée (cliquer 🌐 pour réinitialiser)",
+        "es": "Mantener idioma detectado (clic en 🌐 para restablecer)",
+    },
     "sec_output_lang": {
         "en": "Output Language / Translation",
         "de": "Ausgabesprache / Übersetzung",
@@ -248,6 +311,12 @@ TRANSLATIONS = {
         "fr": "Apparence",
         "es": "Apariencia",
     },
+    "history_enabled": {
+        "en": "Save transcripts to searchable history",
+        "de": "Transkripte im durchsuchbaren Verlauf speichern",
+        "fr": "Enregistrer les transcriptions dans l'historique",
+        "es": "Guardar transcripciones en el historial",
+    },
     "sound_feedback": {
         "en": "Audio feedback (beep on start/stop)",
         "de": "Audio-Feedback (Beep bei Start/Stop)",
@@ -330,6 +399,54 @@ TRANSLATIONS = {
         "fr": "(1=rapide, 5=défaut, 10=précis)",
         "es": "(1=rápido, 5=defecto, 10=preciso)",
     },
+    "sec_threads": {
+        "en": "CPU Threads  (0 = auto)",
+        "de": "CPU-Threads  (0 = automatisch)",
+        "fr": "Threads CPU  (0 = auto)",
+        "es": "Hilos de CPU  (0 = auto)",
+    },
+    "cpu_threads_label": {
+        "en": "Threads:", "de": "Threads:",
+        "fr": "Threads:", "es": "Hilos:",
+    },
+    "num_workers_label": {
+        "en": "Workers:", "de": "Worker:",
+        "fr": "Workers:", "es": "Workers:",
+    },
+    "threads_hint": {
+        "en": "auto: {n} threads (physical cores − 1) – benchmark: python -m ptt.benchmark",
+        "de": "auto: {n} Threads (physische Kerne − 1) – Benchmark: python -m ptt.benchmark",
+        "fr": "auto: {n} threads (cœurs physiques − 1) – benchmark: python -m ptt.benchmark",
+        "es": "auto: {n} hilos (núcleos físicos − 1) – benchmark: python -m ptt.benchmark",
+    },
+    "inference_process": {
+        "en": "Run recognition in a separate process (survives engine crashes)",
+        "de": "Erkennung in separatem Prozess (übersteht Engine-Abstürze)",
+        "fr": "Reconnaissance dans un processus séparé (résiste aux plantages)",
+        "es": "Reconocimiento en un proceso aparte (sobrevive a fallos del motor)",
+    },
+    "capture_utterances": {
+        "en": "Keep recordings for replay (captures/ – for bug reports)",
+        "de": "Aufnahmen für Replay behalten (captures/ – für Fehlerberichte)",
+        "fr": "Conserver les enregistrements (captures/ – pour rapports de bug)",
+        "es": "Guardar grabaciones para replay (captures/ – para informes de errores)",
+    },
+    "sec_idle": {
+        "en": "Unload model when idle",
+        "de": "Modell bei Inaktivität entladen",
+        "fr": "Décharger le modèle en cas d'inactivité",
+        "es": "Descargar el modelo en inactividad",
+    },
+    "idle_unload_label": {
+        "en": "after (min):", "de": "nach (Min.):",
+        "fr": "après (min) :", "es": "tras (min):",
+    },
+    "idle_hint": {
+        "en": "0 = never – frees RAM/VRAM; reload starts on the next PTT press",
+        "de": "0 = nie – gibt RAM/VRAM frei; Neuladen startet beim nächsten PTT-Druck",
+        "fr": "0 = jamais – libère RAM/VRAM ; rechargement à la prochaine pression PTT",
+        "es": "0 = nunca – libera RAM/VRAM; recarga al siguiente PTT",
+    },
     "btn_reset": {
         "en": "↺  Reset all settings to defaults",
         "de": "↺  Alle Einstellungen auf Standard zurücksetzen",
@@ -465,6 +582,26 @@ TRANSLATIONS = {
         "fr": "Laisser vide pour utiliser le défaut (à côté du .exe)",
         "es": "Dejar vacío para usar el predeterminado (junto al .exe)",
     },
+    "progressive_start": {
+        "en": "Progressive start: use a small model until this one has loaded",
+        "de": "Schnellstart: kleines Modell nutzen, bis dieses geladen ist",
+        "fr": "Démarrage progressif : petit modèle jusqu'au chargement de celui-ci",
+        "es": "Inicio progresivo: modelo pequeño hasta que cargue este",
+    },
+    "sec_prefetch": {
+        "en": "Prefetch Model", "de": "Modell vorab laden",
+        "fr": "Précharger un modèle", "es": "Precargar modelo",
+    },
+    "prefetch_none": {
+        "en": "(none)", "de": "(keins)",
+        "fr": "(aucun)", "es": "(ninguno)",
+    },
+    "prefetch_hint": {
+        "en": "Downloaded in the background after the current model has loaded",
+        "de": "Wird im Hintergrund geladen, nachdem das aktuelle Modell bereit ist",
+        "fr": "Téléchargé en arrière-plan après le chargement du modèle actuel",
+        "es": "Se descarga en segundo plano tras cargar el modelo actual",
+    },
     "btn_browse": {
         "en": "Browse…", "de": "Auswählen…",
         "fr": "Parcourir…", "es": "Examinar…",
@@ -517,15 +654,35 @@ def _recog_lang_labels(ui: str) -> dict:
     return labels.get(ui, labels["en"])
 
 MODELS     = ["tiny", "base", "small", "medium", "large-v2", "large-v3"]
-MODELS_OV  = {
-    "tiny":     "OpenVINO/whisper-tiny-fp16-ov",
-    "base":     "OpenVINO/whisper-base-fp16-ov",
-    "small":    "OpenVINO/whisper-small-fp16-ov",
-    "medium":   "OpenVINO/whisper-medium-fp16-ov",
-    "large-v2": "OpenVINO/whisper-large-v2-fp16-ov",
-    "large-v3": "OpenVINO/whisper-large-v3-int8-ov",
+MODELS_OV  = {   # OpenVINO IR conversions per OpenVINO device
+    "NPU": {
+        "tiny":     "OpenVINO/whisper-tiny-fp16-ov",
+        "base":     "OpenVINO/whisper-base-fp16-ov",
+        "small":    "OpenVINO/whisper-small-fp16-ov",
+        "medium":   "OpenVINO/whisper-medium-fp16-ov",
+        "large-v2": "OpenVINO/whisper-large-v2-fp16-ov",
+        "large-v3": "OpenVINO/whisper-large-v3-int8-ov",
+    },
+    "CPU": {     # INT8 weights: the CPU plugin's fastest Whisper variant
+        "tiny":     "OpenVINO/whisper-tiny-int8-ov",
+        "base":     "OpenVINO/whisper-base-int8-ov",
+        "small":    "OpenVINO/whisper-small-int8-ov",
+        "medium":   "OpenVINO/whisper-medium-int8-ov",
+        "large-v2": "OpenVINO/whisper-large-v2-fp16-ov",
+        "large-v3": "OpenVINO/whisper-large-v3-int8-ov",
+    },
+}
+MODELS_CT2 = {   # faster-whisper (CTranslate2) conversions on the HuggingFace Hub
+    "tiny":     "Systran/faster-whisper-tiny",
+    "base":     "Systran/faster-whisper-base",
+    "small":    "Systran/faster-whisper-small",
+    "medium":   "Systran/faster-whisper-medium",
+    "large-v2": "Systran/faster-whisper-large-v2",
+    "large-v3": "Systran/faster-whisper-large-v3",
 }
-DEVICES      = {"auto": "Auto", "cuda": "NVIDIA CUDA", "npu": "NPU (OpenVINO)", "cpu": "CPU"}
+DEVICES      = {"auto": "Auto", "cuda": "NVIDIA CUDA", "npu": "NPU (OpenVINO)", "cpu": "CPU",
+                "ov_cpu": "CPU (OpenVINO)"}
+OV_DEVICES   = {"npu": "NPU", "ov_cpu": "CPU"}   # app device → OpenVINO device name
 COMPUTE_TYPES = {"auto": "Auto", "float16": "float16 (GPU)", "int8": "int8", "float32": "float32 (CPU)"}
 
 SILENT_THRESHOLD = 3
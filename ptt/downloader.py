@@ -0,0 +1,335 @@
+"""
+ptt/downloader.py – Resumable, verified, parallel model downloads.
+
+Files of a HuggingFace repo are split into ``PART_SIZE`` ranges that are
+fetched by ``CONNECTIONS`` concurrent HTTP range requests straight into a
+preallocated ``<file>.part``.  Finished ranges are recorded in a sidecar
+``<file>.part.json`` so an interrupted download resumes where it stopped.
+Completed files are checked against the repo's SHA-256 once; the result is
+cached in ``.verified.json`` keyed by size and mtime, so later loads never
+hash multi-GB files again.
+
+``prefetch()`` downloads a model in a background thread (e.g. the configured
+``prefetch_model`` while the current model serves).
+"""
+
+import fnmatch
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import ptt.state as state
+
+HF_ENDPOINT = os.environ.get("HF_ENDPOINT", "https://huggingface.co")
+CONNECTIONS = 4
+PART_SIZE   = 8 * 1024 * 1024
+READ_SIZE   = 256 * 1024
+TIMEOUT_S   = 30
+VERIFY_FILE = ".verified.json"
+
+
+class DownloadError(Exception):
+    pass
+
+
+class RemoteFile:
+    """One file of a repo: relative *name*, *url*, *size* and optional *sha256*."""
+
+    def __init__(self, name: str, url: str, size: int = None, sha256: str = None):
+        self.name   = name
+        self.url    = url
+        self.size   = size
+        self.sha256 = sha256
+
+    def __repr__(self):
+        return f"RemoteFile({self.name!r}, size={self.size})"
+
+
+class Progress:
+    """Byte counter shared by all download threads.
+
+    *callback(done, total, rate)* is called at most every *interval* seconds
+    (and once at the end) from whichever thread advanced the counter.
+    """
+
+    def __init__(self, total: int = 0, callback=None, interval: float = 0.25):
+        self.total     = total
+        self.done      = 0
+        self._cb       = callback
+        self._interval = interval
+        self._lock     = threading.Lock()
+        self._t0       = time.monotonic()
+        self._last     = 0.0
+
+    @property
+    def rate(self) -> float:
+        return self.done / max(1e-6, time.monotonic() - self._t0)
+
+    def add(self, n: int):
+        with self._lock:
+            self.done += n
+            now = time.monotonic()
+            if self._cb is None or now - self._last < self._interval:
+                return
+            self._last = now
+        self._cb(self.done, self.total, self.rate)
+
+    def finish(self):
+        if self._cb is not None:
+            self._cb(self.done, self.total, self.rate)
+
+
+# ─── Verification cache ────────────────────────────────────────────────────────
+
+def sha256_file(path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class VerifyCache:
+    """``.verified.json`` in a model directory: name → size, mtime_ns, sha256."""
+
+    def __init__(self, directory):
+        self.path    = Path(directory) / VERIFY_FILE
+        self._lock   = threading.Lock()
+        self.hashed  = 0   # files actually hashed (for tests)
+        try:
+            self._data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._data = {}
+
+    def _key(self, path: Path):
+        st = path.stat()
+        return st.st_size, st.st_mtime_ns
+
+    def verified(self, path: Path, name: str, sha256: str = None, size: int = None) -> bool:
+        """True if *path* matches *sha256* / *size*; hashes only on a cache miss."""
+        try:
+            fsize, mtime = self._key(path)
+        except OSError:
+            return False
+        if size is not None and fsize != size:
+            return False
+        entry = self._data.get(name)
+        if entry and entry["size"] == fsize and entry["mtime_ns"] == mtime:
+            return sha256 is None or entry.get("sha256") == sha256
+        if sha256 is None:
+            return size is not None   # nothing to hash against; size matched
+        self.hashed += 1
+        ok = sha256_file(path) == sha256
+        if ok:
+            self.record(path, name, sha256)
+        return ok
+
+    def record(self, path: Path, name: str, sha256: str = None):
+        fsize, mtime = self._key(path)
+        with self._lock:
+            self._data[name] = {"size": fsize, "mtime_ns": mtime, "sha256": sha256}
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self._data, indent=1), encoding="utf-8")
+            os.replace(tmp, self.path)
+
+
+# ─── Downloader ────────────────────────────────────────────────────────────────
+
+class DownloadManager:
+
+    def __init__(self, endpoint: str = None, connections: int = CONNECTIONS,
+                 part_size: int = PART_SIZE, timeout: float = TIMEOUT_S):
+        self.endpoint    = (endpoint or HF_ENDPOINT).rstrip("/")
+        self.connections = connections
+        self.part_size   = part_size
+        self.timeout     = timeout
+
+    # ── HTTP ──────────────────────────────────────────────────────────────────
+
+    def _open(self, url: str, headers: dict = None):
+        req = urllib.request.Request(url, headers={"User-Agent": "whisper-ptt", **(headers or {})})
+        token = os.environ.get("HF_TOKEN")
+        if token and url.startswith(self.endpoint):
+            # not forwarded when /resolve/ redirects to the CDN
+            req.add_unredirected_header("Authorization", f"Bearer {token}")
+        return urllib.request.urlopen(req, timeout=self.timeout)
+
+    def list_repo(self, repo_id: str, revision: str = "main") -> list:
+        """Files of *repo_id* with sizes and LFS SHA-256 from the Hub API."""
+        url = f"{self.endpoint}/api/models/{repo_id}/revision/{revision}?blobs=true"
+        with self._open(url) as r:
+            info = json.load(r)
+        files = []
+        for s in info.get("siblings", []):
+            name = s["rfilename"]
+            lfs  = s.get("lfs") or {}
+            files.append(RemoteFile(
+                name,
+                f"{self.endpoint}/{repo_id}/resolve/{revision}/{urllib.parse.quote(name)}",
+                lfs.get("size", s.get("size")), lfs.get("sha256")))
+        return files
+
+    # ── Files ─────────────────────────────────────────────────────────────────
+
+    def _probe(self, rf: RemoteFile) -> bool:
+        """Fill in rf.size if unknown; True if the server honours Range requests."""
+        with self._open(rf.url, {"Range": "bytes=0-0"}) as r:
+            ranged = r.status == 206
+            if rf.size is None:
+                cr = r.headers.get("Content-Range", "")
+                if ranged and "/" in cr and cr.rsplit("/", 1)[1].isdigit():
+                    rf.size = int(cr.rsplit("/", 1)[1])
+                elif r.headers.get("Content-Length"):
+                    rf.size = int(r.headers["Content-Length"])
+        return ranged and rf.size is not None
+
+    def _fetch_range(self, rf: RemoteFile, part_path: Path, start: int, end: int, progress):
+        with self._open(rf.url, {"Range": f"bytes={start}-{end}"}) as r:
+            if r.status != 206:
+                raise DownloadError(f"{rf.name}: server ignored range request")
+            with open(part_path, "r+b") as f:
+                f.seek(start)
+                left = end - start + 1
+                while left > 0:
+                    block = r.read(min(READ_SIZE, left))
+                    if not block:
+                        raise DownloadError(f"{rf.name}: connection closed at {end - left + 1}")
+                    f.write(block)
+                    left -= len(block)
+                    if progress: progress.add(len(block))
+
+    def _fetch_stream(self, rf: RemoteFile, part_path: Path, progress):
+        with self._open(rf.url) as r, open(part_path, "wb") as f:
+            for block in iter(lambda: r.read(READ_SIZE), b""):
+                f.write(block)
+                if progress: progress.add(len(block))
+
+    def fetch_file(self, rf: RemoteFile, dest, progress: Progress = None,
+                   pool: ThreadPoolExecutor = None, verify: VerifyCache = None) -> Path:
+        """Download *rf* to *dest* (resuming a previous ``.part``) and verify it."""
+        dest   = Path(dest)
+        verify = verify or VerifyCache(dest.parent)
+        if dest.exists() and verify.verified(dest, rf.name, rf.sha256, rf.size):
+            if progress: progress.add(rf.size or 0)
+            return dest
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        part_path = dest.with_name(dest.name + ".part")
+        meta_path = dest.with_name(dest.name + ".part.json")
+
+        if not self._probe(rf):
+            self._fetch_stream(rf, part_path, progress)   # no ranges → no resume
+        else:
+            parts = [(i, min(i + self.part_size, rf.size) - 1)
+                     for i in range(0, rf.size, self.part_size)] or [(0, -1)]
+            done  = set()
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+                if (meta["size"], meta["sha256"], meta["part_size"]) == \
+                        (rf.size, rf.sha256, self.part_size) and part_path.exists():
+                    done = set(meta["done"])
+            except (OSError, ValueError, KeyError):
+                pass
+            if not done or not part_path.exists():
+                with open(part_path, "wb") as f:
+                    f.truncate(rf.size)
+            if progress:
+                progress.add(sum(e - s + 1 for s, e in parts if s in done))
+
+            meta_lock = threading.Lock()
+            def _part(span):
+                start, end = span
+                if end >= start:
+                    self._fetch_range(rf, part_path, start, end, progress)
+                with meta_lock:
+                    done.add(start)
+                    meta_path.write_text(json.dumps({
+                        "size": rf.size, "sha256": rf.sha256,
+                        "part_size": self.part_size, "done": sorted(done)}), encoding="utf-8")
+
+            todo = [p for p in parts if p[0] not in done]
+            own  = pool is None
+            pool = pool or ThreadPoolExecutor(self.connections, thread_name_prefix="download")
+            try:
+                for fut in [pool.submit(_part, p) for p in todo]:
+                    fut.result()
+            finally:
+                if own: pool.shutdown(wait=False)
+
+        if rf.sha256 and sha256_file(part_path) != rf.sha256:
+            for p in (part_path, meta_path):
+                try: p.unlink()
+                except OSError: pass
+            raise DownloadError(f"{rf.name}: checksum mismatch")
+        os.replace(part_path, dest)
+        try: meta_path.unlink()
+        except OSError: pass
+        verify.record(dest, rf.name, rf.sha256)
+        return dest
+
+    def fetch_repo(self, repo_id: str, dest_dir, allow=None, ignore=None,
+                   progress_cb=None, revision: str = "main") -> Path:
+        """Download all files of *repo_id* matching *allow* (and not *ignore*)."""
+        dest_dir = Path(dest_dir)
+        files = [f for f in self.list_repo(repo_id, revision)
+                 if (not allow or any(fnmatch.fnmatch(f.name, p) for p in allow))
+                 and not any(fnmatch.fnmatch(f.name, p) for p in (ignore or []))]
+        if not files:
+            raise DownloadError(f"{repo_id}: no matching files")
+        progress = Progress(sum(f.size or 0 for f in files), progress_cb)
+        verify   = VerifyCache(dest_dir)
+        with ThreadPoolExecutor(self.connections, thread_name_prefix="download") as parts, \
+             ThreadPoolExecutor(len(files), thread_name_prefix="download-file") as per_file:
+            futs = [per_file.submit(self.fetch_file, f, dest_dir / f.name,
+                                    progress, parts, verify) for f in files]
+            for fut in futs:
+                fut.result()
+        progress.finish()
+        return dest_dir
+
+    def is_complete(self, dest_dir, names) -> bool:
+        """Quick local check (no network): every file in *names* verified."""
+        verify = VerifyCache(dest_dir)
+        return all(verify._data.get(n) and verify.verified(Path(dest_dir) / n, n)
+                   for n in names)
+
+
+# ─── Shared instance / helpers ─────────────────────────────────────────────────
+
+manager = DownloadManager()
+
+def status_progress(status_cb, label: str):
+    """Progress callback that renders byte progress into the overlay status."""
+    def _cb(done, total, rate):
+        mb = 1024 * 1024
+        pct = f"{done * 100 // total}% " if total else ""
+        status_cb("loading", f"⬇ {label} {pct}({done // mb}/{total // mb} MB, {rate / mb:.1f} MB/s)")
+    return _cb
+
+_prefetching = set()
+_prefetch_lock = threading.Lock()
+
+def prefetch(key: str, fn):
+    """Run download *fn* in a background thread unless *key* is already running."""
+    with _prefetch_lock:
+        if key in _prefetching:
+            return None
+        _prefetching.add(key)
+    def _run():
+        try:
+            state.log(f"⬇️  Prefetching {key} in background")
+            fn()
+            state.log(f"✅ Prefetched {key}")
+        except Exception as e:
+            state.log(f"⚠️  Prefetch {key} failed: {e}")
+        finally:
+            with _prefetch_lock:
+                _prefetching.discard(key)
+    t = threading.Thread(target=_run, daemon=True, name=f"prefetch-{key}")
+    t.start()
+    return t
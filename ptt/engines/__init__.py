@@ -0,0 +1,70 @@
+"""
+ptt/engines – Pluggable speech-recognition backends.
+
+    from ptt import engines
+    eng = engines.create("ct2")
+    eng.load(path, "cpu", compute_type="int8")
+    segments, info = eng.transcribe(audio, language="de")
+
+Built-in engines: ``ct2`` (faster-whisper, CPU/CUDA), ``openvino``
+(OpenVINO GenAI, NPU/CPU) and ``stub`` (deterministic, for tests).  A new
+backend subclasses ``Engine`` and registers itself with ``@register``;
+``for_device()`` maps an app device to the engine that serves it.
+"""
+
+import importlib
+
+from ptt.engines.base import (BEAM_SEARCH, DETECT_LANGUAGE, STREAMING, TRANSLATE, VAD,
+                              Engine, EngineStats, Info, Segment, live_engines)
+
+_REGISTRY = {}
+
+
+def register(cls):
+    """Class decorator: make *cls* available under ``cls.name``."""
+    _REGISTRY[cls.name] = cls
+    return cls
+
+
+def names() -> list:
+    return sorted(_REGISTRY)
+
+
+def get(name: str):
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        raise ValueError(f"Unknown engine '{name}' (available: {', '.join(names())})") from None
+
+
+def create(name: str, model=None) -> Engine:
+    return get(name)(model)
+
+
+def for_device(device: str) -> str:
+    """Engine name for an app device ("cpu", "cuda", "npu", "ov_cpu")."""
+    for name, cls in _REGISTRY.items():
+        if device in cls.devices:
+            return name
+    return "ct2"
+
+
+def preload(name: str) -> list:
+    """Import the libraries engine *name* loads lazily, so the first ``load()``
+    doesn't pay for them (``ptt.startup``); returns the ones not installed."""
+    missing = []
+    for module in get(name).modules:
+        try:
+            importlib.import_module(module)
+        except ImportError:
+            missing.append(module)
+    return missing
+
+
+def counters() -> list:
+    """Stats of every live engine: ``[{"engine", "model", "device", ...}, ...]``."""
+    return [{"engine": e.name, "model": e.model_name, "device": e.device,
+             **e.stats.snapshot()} for e in live_engines()]
+
+
+from ptt.engines import ct2, openvino, stub   # noqa: E402,F401 – register built-ins
@@ -0,0 +1,179 @@
+"""
+ptt/engines/base.py – Interface every speech-recognition backend implements.
+
+An engine wraps one loaded model:
+
+    load(path, device, **options)   build the model (engine-specific options)
+    warmup()                        one tiny decode so the first utterance is fast
+    transcribe(audio, language, task, **decode) → (segments, info)
+    detect_language(audio, allowed) → (lang, prob)   if DETECT_LANGUAGE
+    unload()                        drop the model
+
+``transcribe`` takes 16 kHz mono float32 audio.  *segments* is an iterator of
+``Segment``; streaming engines yield them while decoding.  Decode options the
+app passes are ``beam_size``, ``vad_filter`` and ``vad_silence_ms`` – engines
+ignore what they don't support (see the capability flags).
+"""
+
+import threading
+import time
+import weakref
+from typing import NamedTuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# ─── Capability flags ──────────────────────────────────────────────────────────
+
+STREAMING       = "streaming"         # segments are yielded while decoding
+DETECT_LANGUAGE = "detect_language"   # separate detect_language() step
+TRANSLATE       = "translate"         # task="translate" (→ English)
+BEAM_SEARCH     = "beam_search"       # honours beam_size
+VAD             = "vad"               # built-in silence filter (vad_filter)
+
+
+class Segment(NamedTuple):
+    text:  str
+    start: float = 0.0
+    end:   float = 0.0
+
+
+class Info(NamedTuple):
+    language:             str   = None   # detected / forced language (None = unknown)
+    language_probability: float = 0.0
+    duration:             float = 0.0    # seconds of input audio
+
+
+# ─── Performance counters ──────────────────────────────────────────────────────
+
+class EngineStats:
+    """Per-engine counters; updated once per utterance under a short lock."""
+
+    def __init__(self):
+        self._lock    = threading.Lock()
+        self.load_s   = 0.0
+        self.warmup_s = 0.0
+        self.calls    = 0
+        self.errors   = 0
+        self.audio_s  = 0.0    # total input audio
+        self.busy_s   = 0.0    # total decode time
+        self.last_s   = 0.0    # decode time of the last utterance
+        self.first_segment_s = 0.0   # time to first segment, last utterance
+
+    def record(self, audio_s: float, busy_s: float, first_s: float = None, ok: bool = True):
+        with self._lock:
+            self.calls   += 1
+            self.errors  += not ok
+            self.audio_s += audio_s
+            self.busy_s  += busy_s
+            self.last_s   = busy_s
+            if first_s is not None:
+                self.first_segment_s = first_s
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "load_s":   self.load_s,
+                "warmup_s": self.warmup_s,
+                "calls":    self.calls,
+                "errors":   self.errors,
+                "audio_s":  self.audio_s,
+                "busy_s":   self.busy_s,
+                "last_s":   self.last_s,
+                "first_segment_s": self.first_segment_s,
+                "rtf":      self.busy_s / self.audio_s if self.audio_s else 0.0,
+            }
+
+
+# ─── Engine ────────────────────────────────────────────────────────────────────
+
+_live = weakref.WeakSet()   # every engine instance still referenced somewhere
+
+
+def live_engines() -> list:
+    return list(_live)
+
+
+class Engine:
+    """Base class – subclasses implement ``_load`` and ``_transcribe``."""
+
+    name         = "base"       # registry key
+    label        = "Base"       # shown in logs / benchmark
+    devices      = ()           # app devices this engine serves by default
+    capabilities = frozenset()
+    modules      = ()           # heavy libraries ``_load`` imports (``engines.preload``)
+
+    def __init__(self, model=None):
+        self.model      = model
+        self.model_name = None
+        self.device     = None
+        self.stats      = EngineStats()
+        _live.add(self)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.model_name or '-'} on {self.device or '-'}>"
+
+    def supports(self, flag: str) -> bool:
+        return flag in self.capabilities
+
+    @property
+    def loaded(self) -> bool:
+        return self.model is not None
+
+    def load(self, path, device: str, model_name: str = None, **options):
+        t0 = time.perf_counter()
+        self.model      = self._load(path, device, **options)
+        self.model_name = model_name or str(path)
+        self.device     = device
+        self.stats.load_s = time.perf_counter() - t0
+        return self
+
+    def warmup(self, seconds: float = 1.0) -> float:
+        """Decode a short quiet clip (not counted in the stats); returns seconds."""
+        rng   = np.random.default_rng(0)
+        audio = (rng.standard_normal(int(seconds * SAMPLE_RATE)) * 1e-3).astype(np.float32)
+        t0 = time.perf_counter()
+        segments, _ = self._transcribe(audio, "en", "transcribe", beam_size=1, vad_filter=False)
+        for _ in segments:
+            pass
+        self.stats.warmup_s = time.perf_counter() - t0
+        return self.stats.warmup_s
+
+    def transcribe(self, audio: np.ndarray, language: str = None,
+                   task: str = "transcribe", **options):
+        """``(segments, info)`` – the stats are updated once *segments* is consumed."""
+        t0 = time.perf_counter()
+        try:
+            segments, info = self._transcribe(audio, language, task, **options)
+        except Exception:
+            self.stats.record(len(audio) / SAMPLE_RATE, time.perf_counter() - t0, ok=False)
+            raise
+        return self._timed(segments, len(audio) / SAMPLE_RATE, t0), info
+
+    def _timed(self, segments, audio_s: float, t0: float):
+        first, ok = None, True
+        try:
+            for seg in segments:
+                if first is None:
+                    first = time.perf_counter() - t0
+                yield seg
+        except Exception:
+            ok = False
+            raise
+        finally:
+            self.stats.record(audio_s, time.perf_counter() - t0, first, ok)
+
+    def detect_language(self, audio: np.ndarray, allowed) -> tuple:
+        raise NotImplementedError(f"{self.name}: no separate language detection")
+
+    def unload(self):
+        self.model = None
+
+    # ── subclass hooks ──────────────────────────────────────────────────────
+
+    def _load(self, path, device: str, **options):
+        raise NotImplementedError
+
+    def _transcribe(self, audio: np.ndarray, language, task: str, **options) -> tuple:
+        raise NotImplementedError
@@ -0,0 +1,37 @@
+"""
+ptt/engines/ct2.py – faster-whisper (CTranslate2) engine for CPU / CUDA.
+"""
+
+from ptt.engines import register
+from ptt.engines.base import (BEAM_SEARCH, DETECT_LANGUAGE, STREAMING, TRANSLATE, VAD,
+                              Engine, Info, Segment)
+
+
+@register
+class CT2Engine(Engine):
+    name         = "ct2"
+    label        = "faster-whisper"
+    devices      = ("cpu", "cuda")
+    capabilities = frozenset({STREAMING, DETECT_LANGUAGE, TRANSLATE, BEAM_SEARCH, VAD})
+    modules      = ("faster_whisper",)
+
+    def _load(self, path, device: str, compute_type: str = "int8", **options):
+        from faster_whisper import WhisperModel
+        return WhisperModel(str(path), device=device, compute_type=compute_type, **options)
+
+    def _transcribe(self, audio, language, task, beam_size=5, vad_filter=False,
+                    vad_silence_ms=300, **_):
+        segments, info = self.model.transcribe(
+            audio,
+            language=language, task=task,
+            beam_size=beam_size,
+            vad_filter=vad_filter,
+            vad_parameters=dict(min_silence_duration_ms=vad_silence_ms) if vad_filter else None,
+            condition_on_previous_text=False,
+        )
+        return ((Segment(s.text, s.start, s.end) for s in segments),
+                Info(info.language, info.language_probability, info.duration))
+
+    def detect_language(self, audio, allowed) -> tuple:
+        from ptt.language import detect_restricted
+        return detect_restricted(self.model, audio, allowed)
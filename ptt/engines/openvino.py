@@ -0,0 +1,40 @@
+"""
+ptt/engines/openvino.py – OpenVINO GenAI ``WhisperPipeline`` engine (NPU / CPU).
+"""
+
+from ptt.engines import register
+from ptt.engines.base import BEAM_SEARCH, TRANSLATE, SAMPLE_RATE, Engine, Info, Segment
+
+
+@register
+class OpenVINOEngine(Engine):
+    name         = "openvino"
+    label        = "OpenVINO"
+    devices      = ("npu", "ov_cpu")
+    capabilities = frozenset({TRANSLATE, BEAM_SEARCH})
+    modules      = ("openvino_genai",)
+
+    def supports(self, flag: str) -> bool:
+        # the static NPU pipeline decodes greedily – beam search only on CPU
+        if flag == BEAM_SEARCH and self.device is not None and self.device != "CPU":
+            return False
+        return super().supports(flag)
+
+    def _load(self, path, device: str, **properties):
+        import openvino_genai
+        return openvino_genai.WhisperPipeline(str(path), device=device, **properties)
+
+    def generation_config(self, language, task: str, beam_size: int = 1):
+        """Map the faster-whisper decode settings onto a WhisperGenerationConfig."""
+        config = self.model.get_generation_config()
+        if language:
+            config.language = f"<|{language}|>"
+        config.task = task
+        if self.supports(BEAM_SEARCH):   # NPU keeps the pipeline's default
+            config.num_beams = max(1, int(beam_size))
+        return config
+
+    def _transcribe(self, audio, language, task, beam_size=1, **_):
+        result = self.model.generate(audio, self.generation_config(language, task, beam_size))
+        return (iter([Segment(t) for t in result.texts]),
+                Info(language, 1.0 if language else 0.0, len(audio) / SAMPLE_RATE))
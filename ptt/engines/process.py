@@ -0,0 +1,348 @@
+"""
+ptt/engines/process.py – Run any engine in a supervised worker process.
+
+``ProcessEngine("ct2")`` starts a spawned child that loads the ``ct2`` engine
+and serves requests over a pipe; the GUI process only holds a proxy.  A
+native crash or OOM kills the worker, not the overlay, and Python-side
+decoding no longer competes for the GIL with ``audio_callback`` and Tk.
+
+* audio is written into a ``SharedMemory`` block – only its name and the
+  sample count travel over the pipe, the array is never pickled
+* segments are sent back one message each while the child decodes, so the
+  proxy streams like the engine it wraps
+* a supervisor thread restarts the worker when it exits unexpectedly
+  (backoff 0 s, 1 s, 2 s … 30 s); a request in flight fails with
+  ``WorkerCrashed``, the next one waits for an immediate restart but fails
+  fast while a backoff is pending – the lock is not held during the backoff
+"""
+
+import multiprocessing as mp
+import threading
+import time
+import weakref
+
+import numpy as np
+
+import ptt.state as state
+from ptt.engines.base import SAMPLE_RATE, Engine, Info, Segment
+
+MIN_SHM_S   = 30      # shared audio block holds at least this many seconds
+MAX_RESTART = 5       # consecutive failed restarts before giving up
+
+
+class WorkerCrashed(RuntimeError):
+    pass
+
+
+# ─── Child side ────────────────────────────────────────────────────────────────
+
+class _PipeQueue:
+    """Stands in for ``state.ui_queue`` in the child: log lines go to the parent."""
+
+    def __init__(self, send):
+        self._send = send
+
+    def put(self, msg, *a, **kw):
+        if msg and msg[0] == "log":
+            self._send(msg)
+
+    def put_nowait(self, msg):
+        self.put(msg)
+
+
+def _attach(name: str):
+    # Spawned children share the parent's resource tracker, so registering the
+    # block again is harmless; the parent unlinks it once.
+    from multiprocessing import shared_memory
+    return shared_memory.SharedMemory(name=name)
+
+
+def _child_main(conn, kind: str, load_args: tuple, cfg: dict):
+    import signal
+    try:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)   # Ctrl+C belongs to the GUI
+    except (ValueError, AttributeError):
+        pass
+    lock = threading.Lock()
+
+    def send(msg):
+        with lock:
+            conn.send(msg)
+
+    state.cfg.clear(); state.cfg.update(cfg)
+    state.ui_queue = _PipeQueue(send)
+    from ptt.model_manager import create_engine
+    try:
+        eng = create_engine(kind, *load_args, process=False,
+                            status_cb=lambda s, m: send(("status", s, m)))
+    except BaseException as e:
+        send(("error", f"{type(e).__name__}: {e}"))
+        return
+    send(("ready", eng.stats.load_s))
+
+    shm = audio = segments = None
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        op = msg[0]
+        if op == "quit":
+            break
+        try:
+            if op == "warmup":
+                send(("done", eng.warmup()))
+                continue
+            name, n = msg[1], msg[2]
+            audio = segments = None   # release the view before remapping
+            if shm is None or shm.name != name:
+                if shm is not None:
+                    shm.close()
+                shm = _attach(name)
+            audio = np.ndarray((n,), dtype=np.float32, buffer=shm.buf)
+            if op == "detect":
+                send(("done", tuple(eng.detect_language(audio, msg[3]))))
+            else:
+                segments, info = eng.transcribe(audio, msg[3], msg[4], **msg[5])
+                send(("info", tuple(info)))
+                for seg in segments:
+                    send(("segment", tuple(seg)))
+                send(("done", None))
+        except Exception as e:
+            send(("error", f"{type(e).__name__}: {e}"))
+    audio = segments = None
+    if shm is not None:
+        shm.close()
+
+
+# ─── Parent side ───────────────────────────────────────────────────────────────
+
+class _Worker:
+    """Process, pipe and shared audio block; owned by a ProcessEngine."""
+
+    def __init__(self, kind: str, load_args: tuple, cfg: dict, status_cb=None):
+        self.kind      = kind
+        self.load_args = load_args
+        self.cfg       = cfg
+        self.restarts  = 0
+        self.proc      = None
+        self.conn      = None
+        self._shm      = None
+        self._lock     = threading.Lock()   # one request at a time
+        self._closed   = False
+        self._wake     = threading.Event()  # close() ends a pending backoff
+        self._restart_at = None             # monotonic time of a pending restart
+        with self._lock:
+            self._spawn(status_cb)
+        threading.Thread(target=self._supervise, daemon=True,
+                         name=f"worker-supervisor-{kind}").start()
+
+    def _spawn(self, status_cb=None) -> float:
+        ctx = mp.get_context("spawn")   # never fork the Tk process
+        parent, child = ctx.Pipe()
+        proc = ctx.Process(target=_child_main, daemon=True, name=f"ptt-{self.kind}",
+                           args=(child, self.kind, self.load_args, self.cfg))
+        proc.start()
+        child.close()
+        self.proc, self.conn = proc, parent
+        return self._recv_until(("ready",), status_cb)
+
+    def _recv_until(self, ops, status_cb=None):
+        """Forward log / status messages until one of *ops* arrives."""
+        while True:
+            try:
+                msg = self.conn.recv()
+            except (EOFError, OSError):
+                self.proc.join(1)
+                raise WorkerCrashed(f"inference worker exited (code {self.proc.exitcode})")
+            op = msg[0]
+            if op == "log":
+                state.log(msg[1])
+            elif op == "status":
+                if status_cb: status_cb(msg[1], msg[2])
+            elif op == "error":
+                raise RuntimeError(msg[1])
+            elif op in ops:
+                return msg[1]
+
+    def _supervise(self):
+        proc = self.proc
+        while True:
+            proc.join()
+            if self._closed:
+                return
+            with self._lock:
+                if self._closed:
+                    return
+                if self.proc is proc:   # not already replaced by a request
+                    self._restart()
+                proc = self.proc
+
+    def _backoff(self) -> float:
+        return min(30, 2 ** (self.restarts - 1)) if self.restarts else 0
+
+    def _restart(self):
+        """Replace the exited worker (lock held; released during the backoff)."""
+        state.log(f"💥 Inference worker exited (code {self.proc.exitcode}) – restarting")
+        delay = self._backoff()
+        self.restarts += 1
+        if delay:
+            state.log(f"⏳ Inference worker restart in {delay:.0f}s")
+            self._restart_at = time.monotonic() + delay
+            self._lock.release()   # requests fail fast meanwhile (_check)
+            try:
+                self._wake.wait(delay)
+            finally:
+                self._lock.acquire()
+                self._restart_at = None
+            if self._closed:
+                return
+        try:
+            load_s = self._spawn()
+            self.conn.send(("warmup",))
+            self._recv_until(("done",))
+            state.log(f"✅ Inference worker restarted ({load_s:.1f}s)")
+        except Exception as e:
+            state.log(f"❌ Inference worker restart failed: {e}")
+            if self.restarts >= MAX_RESTART:
+                self._closed = True
+                state.log("❌ Giving up on the inference worker – reload the model")
+
+    def _audio(self, audio: np.ndarray) -> tuple:
+        from multiprocessing import shared_memory
+        n = len(audio)
+        if self._shm is None or self._shm.size < n * 4:
+            if self._shm is not None:
+                self._shm.close(); self._shm.unlink()
+            self._shm = shared_memory.SharedMemory(
+                create=True, size=max(n, MIN_SHM_S * SAMPLE_RATE) * 4)
+        np.ndarray((n,), dtype=np.float32, buffer=self._shm.buf)[:] = audio
+        return self._shm.name, n
+
+    def _check(self):
+        if self._restart_at is not None:
+            raise WorkerCrashed(f"inference worker restarting in "
+                                f"{max(0.0, self._restart_at - time.monotonic()):.0f}s")
+        # a request may get the lock before the supervisor saw the exit
+        if not self._closed and not self.proc.is_alive():
+            if self._backoff():   # the supervisor waits it out, not the request
+                raise WorkerCrashed(f"inference worker exited (code {self.proc.exitcode})"
+                                    f" – restart in {self._backoff():.0f}s")
+            self._restart()
+        if self._closed:
+            raise WorkerCrashed("inference worker stopped")
+        if not self.proc.is_alive():
+            raise WorkerCrashed(f"inference worker exited (code {self.proc.exitcode})")
+
+    def call(self, *msg):
+        with self._lock:
+            self._check()
+            self.conn.send(msg)
+            result = self._recv_until(("done",))
+            self.restarts = 0
+            return result
+
+    def detect(self, audio, allowed) -> tuple:
+        with self._lock:
+            self._check()
+            self.conn.send(("detect", *self._audio(audio), list(allowed)))
+            return self._recv_until(("done",))
+
+    def transcribe(self, audio, language, task, options: dict):
+        """``(segments, info)``; *segments* streams while the child decodes."""
+        self._lock.acquire()
+        try:
+            self._check()
+            self.conn.send(("transcribe", *self._audio(audio), language, task, options))
+            info = Info(*self._recv_until(("info",)))
+        except BaseException:
+            self._lock.release()
+            raise
+        return self._stream(), info
+
+    def _stream(self):
+        done = False
+        try:
+            while True:
+                try:
+                    msg = self.conn.recv()
+                except (EOFError, OSError):
+                    self.proc.join(1)
+                    done = True
+                    raise WorkerCrashed(f"inference worker exited (code {self.proc.exitcode})")
+                if msg[0] == "segment":
+                    yield Segment(*msg[1])
+                elif msg[0] == "log":
+                    state.log(msg[1])
+                elif msg[0] == "error":
+                    done = True
+                    raise RuntimeError(msg[1])
+                elif msg[0] == "done":
+                    done = True
+                    self.restarts = 0
+                    return
+        finally:
+            try:
+                if not done:   # caller stopped early – drain to keep the pipe in sync
+                    self._recv_until(("done",))
+            except Exception:
+                pass
+            self._lock.release()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+        try:
+            self.conn.send(("quit",))
+        except Exception:
+            pass
+        if self.proc is not None:
+            self.proc.join(2)
+            if self.proc.is_alive():
+                self.proc.terminate()
+        if self._shm is not None:
+            try:
+                self._shm.close(); self._shm.unlink()
+            except Exception:
+                pass
+            self._shm = None
+
+
+class ProcessEngine(Engine):
+    """Proxy for engine *kind* running in a worker process (not registered)."""
+
+    name = "process"
+
+    def __init__(self, kind: str):
+        from ptt import engines
+        super().__init__()
+        inner             = engines.get(kind)
+        self.kind         = kind
+        self.label        = f"{inner.label} (worker)"
+        self.capabilities = inner.capabilities
+
+    def _load(self, path, device: str, compute_type: str = "int8", status_cb=None,
+              cfg: dict = None, **_):
+        worker = _Worker(self.kind, (path, device, compute_type),
+                         dict(cfg or state.cfg), status_cb)
+        weakref.finalize(self, worker.close)   # worker exits with its last proxy
+        return worker
+
+    @property
+    def pid(self):
+        return self.model.proc.pid if self.model is not None else None
+
+    def warmup(self, seconds: float = 1.0) -> float:
+        self.stats.warmup_s = self.model.call("warmup")
+        return self.stats.warmup_s
+
+    def _transcribe(self, audio, language, task, **options):
+        return self.model.transcribe(np.asarray(audio, dtype=np.float32), language, task, options)
+
+    def detect_language(self, audio, allowed) -> tuple:
+        return self.model.detect(np.asarray(audio, dtype=np.float32), allowed)
+
+    def unload(self):
+        if self.model is not None:
+            self.model.close()
+        self.model = None
@@ -0,0 +1,76 @@
+"""
+ptt/engines/stub.py – Deterministic stand-in engine for tests and benchmarks.
+
+No model, no dependencies.  The reply is either fixed (``text=``), taken in
+turn from ``script=`` or, by default, derived from the audio
+(``"stub 1.25 s"``), so the same input always gives the same output.
+Decode time is simulated as ``latency_s + rtf × audio seconds``; segments are
+streamed word by word.  ``busy=True`` spends that time in Python code
+(holding the GIL, like Python-side decoding) instead of sleeping;
+``crash_every=N`` kills the process on every N-th utterance (worker tests).
+"""
+
+import itertools
+import os
+import time
+
+from ptt.engines import register
+from ptt.engines.base import DETECT_LANGUAGE, STREAMING, TRANSLATE, SAMPLE_RATE, Engine, Info, Segment
+
+
+@register
+class StubEngine(Engine):
+    name         = "stub"
+    label        = "Stub"
+    devices      = ()
+    capabilities = frozenset({STREAMING, DETECT_LANGUAGE, TRANSLATE})
+
+    def _load(self, path, device: str, text: str = None, script=None,
+              latency_s: float = 0.0, rtf: float = 0.0, language: str = "en",
+              busy: bool = False, crash_every: int = 0, **_):
+        self._script   = itertools.cycle(script) if script else None
+        self._busy     = busy
+        self._crash    = crash_every
+        self._calls    = 0
+        self._text     = text
+        self._latency  = latency_s
+        self._rtf      = rtf
+        self._language = language
+        return "stub"
+
+    def _reply(self, duration: float, task: str) -> str:
+        if self._script is not None:
+            text = next(self._script)
+        elif self._text is not None:
+            text = self._text
+        else:
+            text = f"stub {duration:.2f} s"
+        return f"[en] {text}" if task == "translate" else text
+
+    def _wait(self, seconds: float):
+        if not self._busy:
+            time.sleep(seconds)
+            return
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            sum(i * i for i in range(200))
+
+    def _transcribe(self, audio, language, task, **_):
+        self._calls += 1
+        if self._crash and self._calls % self._crash == 0:
+            os._exit(70)   # simulated native crash
+        duration = len(audio) / SAMPLE_RATE
+        words    = self._reply(duration, task).split()
+        delay    = self._latency + self._rtf * duration
+
+        def stream():
+            step = duration / max(1, len(words))
+            for i, w in enumerate(words):
+                if delay:
+                    self._wait(delay / len(words))
+                yield Segment(w, i * step, (i + 1) * step)
+        return stream(), Info(language or self._language, 1.0, duration)
+
+    def detect_language(self, audio, allowed) -> tuple:
+        allowed = list(allowed)
+        return (self._language if self._language in allowed or not allowed else allowed[0]), 1.0
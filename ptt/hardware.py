@@ -2,8 +2,9 @@
 ptt/hardware.py – Hardware detection and device resolution.
 """
 
+import os
 import subprocess
-import sounddevice as sd
+import sys
 
 # ─── Hardware detection ────────────────────────────────────────────────────────
 
@@ -58,45 +59,150 @@ def detect_devices() -> dict:
     return r
 
 def resolve_device(dev_cfg, compute_cfg):
-    av = detect_devices()
     if dev_cfg == "auto":
+        av = detect_devices()   # only "auto" needs the (slow) probe
         if av["cuda"]:  d, c = "cuda", "float16"
         elif av["npu"]: d, c = "npu",  "int8"
         else:           d, c = "cpu",  "int8"
     elif dev_cfg == "cuda":         d, c = "cuda", "float16"
     elif dev_cfg in ("npu", "dml"): d, c = "npu",  "int8"   # dml = legacy alias
+    elif dev_cfg == "ov_cpu":       d, c = "ov_cpu", "int8"
     else:                           d, c = "cpu",  "int8"
     if compute_cfg != "auto": c = compute_cfg
     return d, c
 
-# ─── Microphone detection ──────────────────────────────────────────────────────
+# ─── CPU topology / thread tuning ──────────────────────────────────────────────
 
-def get_mic_devices() -> dict:
+_cores_cache: int | None = None
+
+def _physical_cores_windows() -> int:
+    import ctypes
+    class _SLPI(ctypes.Structure):   # SYSTEM_LOGICAL_PROCESSOR_INFORMATION
+        _fields_ = [("mask", ctypes.c_size_t), ("rel", ctypes.c_int),
+                    ("_u", ctypes.c_ulonglong * 2)]
+    fn  = ctypes.windll.kernel32.GetLogicalProcessorInformation
+    size = ctypes.c_ulong(0)
+    fn(None, ctypes.byref(size))
+    buf = (_SLPI * (size.value // ctypes.sizeof(_SLPI)))()
+    if not fn(buf, ctypes.byref(size)):
+        return 0
+    return sum(1 for e in buf if e.rel == 0)   # RelationProcessorCore
+
+def _physical_cores_linux() -> int:
+    cores = set()
+    for cpu in _usable_cpus():
+        try:
+            with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/core_cpus_list") as f:
+                cores.add(f.read().strip())
+        except OSError:
+            try:
+                with open(f"/sys/devices/system/cpu/cpu{cpu}/topology/thread_siblings_list") as f:
+                    cores.add(f.read().strip())
+            except OSError:
+                return 0
+    return len(cores)
+
+def _usable_cpus():
+    try:
+        return sorted(os.sched_getaffinity(0))
+    except AttributeError:
+        return list(range(os.cpu_count() or 1))
+
+def physical_cores() -> int:
+    """Physical cores usable by this process (hyperthreads counted once); cached."""
+    global _cores_cache
+    if _cores_cache is not None:
+        return _cores_cache
+    n = 0
+    try:
+        import psutil
+        n = psutil.cpu_count(logical=False) or 0
+    except ImportError:
+        try:
+            if sys.platform == "win32":
+                n = _physical_cores_windows()
+            elif sys.platform.startswith("linux"):
+                n = _physical_cores_linux()
+            elif sys.platform == "darwin":
+                n = int(subprocess.run(["sysctl", "-n", "hw.physicalcpu"],
+                                       capture_output=True, text=True, timeout=3).stdout)
+        except Exception:
+            n = 0
+    logical = len(_usable_cpus())
+    _cores_cache = max(1, min(n, logical) if n else logical)
+    return _cores_cache
+
+def auto_threads(device: str, num_workers: int = 1) -> int:
+    """Inference threads per worker for *device*.
+
+    CPU inference gets every physical core but one (kept free for the Tk loop
+    and the audio callback), split across concurrent workers.  On CUDA / NPU
+    the CPU only does feature extraction and decoding glue, so a few threads
+    are enough.
     """
-    Get available microphone input devices.
-    Returns dict: {device_index: "Device Name", ...}
-    -1 is always included as the first entry (system default device).
+    cores = physical_cores()
+    if device == "cpu":
+        return max(1, (cores - 1) // max(1, num_workers))
+    return max(1, min(4, cores // 2))
+
+def resolve_threads(cfg: dict, device: str) -> tuple[int, int]:
+    """(cpu_threads, num_workers) from settings; 0 means auto.
+
+    Push-to-talk transcribes one utterance at a time (``state.ptt_lock``), so
+    one worker is the auto default – extra workers would only hold idle
+    thread pools.
     """
-    # -1 = let sounddevice use the OS default; always offer this option first
-    default_label = "Default (system default)"
+    workers = cfg.get("num_workers", 0) or 1
+    threads = cfg.get("cpu_threads", 0) or auto_threads(device, workers)
+    return int(threads), int(workers)
+
+# ─── Process memory ────────────────────────────────────────────────────────────
+
+def process_rss() -> int:
+    """Resident memory of this process in bytes (0 if unknown)."""
     try:
-        default_dev = sd.query_devices(kind="input")
-        default_name = default_dev.get("name", "").strip()
-        if default_name:
-            default_label = f"Default  [{default_name}]"
-    except Exception:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
         pass
-
-    devices = {-1: default_label}
     try:
-        devs = sd.query_devices()
-        if isinstance(devs, dict):
-            devs = [devs]
-        for i, dev in enumerate(devs):
-            if dev.get("max_input_channels", 0) > 0:
-                name = dev.get("name", f"Device {i}").strip()
-                devices[i] = name
+        if sys.platform.startswith("linux"):
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        if sys.platform == "win32":
+            import ctypes
+            from ctypes import wintypes
+            class _PMC(ctypes.Structure):   # PROCESS_MEMORY_COUNTERS
+                _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + \
+                           [(n, ctypes.c_size_t) for n in (
+                               "PeakWorkingSetSize", "WorkingSetSize",
+                               "QuotaPeakPagedPoolUsage", "QuotaPagedPoolUsage",
+                               "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage",
+                               "PagefileUsage", "PeakPagefileUsage")]
+            pmc = _PMC(); pmc.cb = ctypes.sizeof(_PMC)
+            ctypes.windll.psapi.GetProcessMemoryInfo(
+                ctypes.windll.kernel32.GetCurrentProcess(), ctypes.byref(pmc), pmc.cb)
+            return pmc.WorkingSetSize
     except Exception:
         pass
+    return 0
 
-    return devices
+def trim_heap():
+    """Hand freed heap pages back to the OS (glibc keeps them otherwise)."""
+    if sys.platform.startswith("linux"):
+        try:
+            import ctypes
+            ctypes.CDLL("libc.so.6").malloc_trim(0)
+        except Exception:
+            pass
+
+# ─── Microphone detection ──────────────────────────────────────────────────────
+
+def get_mic_devices() -> dict:
+    """
+    Get available microphone input devices (cached, see ptt.mic_devices).
+    Returns dict: {device_index: "Device Name", ...}
+    -1 is always included as the first entry (system default device).
+    """
+    from ptt import mic_devices
+    return mic_devices.devices()
@@ -0,0 +1,237 @@
+"""
+ptt/history.py – Persistent transcript history (SQLite + FTS5 full-text index).
+
+Every recognized utterance is stored with its timestamp, model/device,
+latency and an optional audio reference.  ``add()`` only enqueues the entry;
+a writer thread commits batches in a single transaction so the transcription
+and UI threads never wait for the disk.  ``search()`` uses the FTS index
+(prefix match on every word) and stays in the millisecond range at 100k+
+entries.  Without FTS5 support in the bundled SQLite it falls back to LIKE.
+"""
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+
+import ptt.state as state
+from ptt.constants import HISTORY_FILE
+
+BATCH_MAX    = 256    # entries per transaction
+BATCH_WAIT_S = 0.5    # how long the writer collects entries before committing
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id         INTEGER PRIMARY KEY,
+    ts         REAL    NOT NULL,
+    text       TEXT    NOT NULL,
+    model      TEXT,
+    device     TEXT,
+    language   TEXT,
+    latency_ms REAL,
+    audio      TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_ts ON entries(ts);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts
+    USING fts5(text, content='entries', content_rowid='id');
+CREATE TRIGGER IF NOT EXISTS entries_ai AFTER INSERT ON entries BEGIN
+    INSERT INTO entries_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS entries_ad AFTER DELETE ON entries BEGIN
+    INSERT INTO entries_fts(entries_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+_COLUMNS = ("id", "ts", "text", "model", "device", "language", "latency_ms", "audio")
+
+
+def _fts_query(query: str) -> str:
+    """User input → FTS5 expression: every word is a quoted prefix term."""
+    words = query.replace('"', " ").split()
+    return " ".join(f'"{w}"*' for w in words)
+
+
+class HistoryStore:
+    """SQLite-backed history with a batching writer thread.
+
+    Reads use their own connection (WAL mode lets them run while the writer
+    commits); both connections are only touched under their own lock.
+    """
+
+    def __init__(self, path):
+        self.path    = str(path)
+        self.writes  = 0          # committed transactions (for tests / benchmarks)
+        self._queue  = queue.Queue()
+        self._idle   = threading.Condition()
+        self._busy   = 0          # entries enqueued but not yet committed
+        self._thread = None
+        self._rlock  = threading.Lock()
+        self._wlock  = threading.Lock()
+
+        self._wconn  = self._connect()
+        self._wconn.executescript(_SCHEMA)
+        try:
+            self._wconn.executescript(_FTS_SCHEMA)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False      # SQLite built without FTS5
+        self._wconn.commit()
+        self._rconn  = self._connect()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ── Writing ───────────────────────────────────────────────────────────────
+
+    def add(self, text: str, model: str = None, device: str = None,
+            language: str = None, latency_ms: float = None,
+            audio: str = None, ts: float = None):
+        """Enqueue one entry; returns immediately."""
+        row = (ts if ts is not None else time.time(), text, model, device,
+               language, latency_ms, audio)
+        with self._idle:
+            self._busy += 1
+            self._queue.put(row)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True,
+                                                name="history-writer")
+                self._thread.start()
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until every enqueued entry is committed."""
+        deadline = time.monotonic() + timeout
+        with self._idle:
+            while self._busy:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                self._idle.wait(left)
+        return True
+
+    def _run(self):
+        while True:
+            try:
+                batch = [self._queue.get(timeout=5.0)]
+            except queue.Empty:
+                with self._idle:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+            deadline = time.monotonic() + BATCH_WAIT_S
+            while len(batch) < BATCH_MAX:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=left))
+                except queue.Empty:
+                    break
+            self._commit(batch)
+
+    def _commit(self, batch):
+        try:
+            with self._wlock, self._wconn:
+                self._wconn.executemany(
+                    "INSERT INTO entries (ts, text, model, device, language, latency_ms, audio)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+            self.writes += 1
+        except sqlite3.Error as e:
+            state.log(f"⚠️  History write failed: {e}")
+        finally:
+            with self._idle:
+                self._busy -= len(batch)
+                self._idle.notify_all()
+
+    def add_many(self, rows):
+        """Synchronous bulk import of ``(ts, text, model, device, language,
+        latency_ms, audio)`` tuples (migration / benchmarks)."""
+        with self._wlock, self._wconn:
+            self._wconn.executemany(
+                "INSERT INTO entries (ts, text, model, device, language, latency_ms, audio)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        self.writes += 1
+
+    # ── Reading ───────────────────────────────────────────────────────────────
+
+    def _select(self, sql, args):
+        with self._rlock:
+            rows = self._rconn.execute(sql, args).fetchall()
+        return [dict(zip(_COLUMNS, r)) for r in rows]
+
+    def recent(self, limit: int = 100) -> list:
+        return self._select(
+            f"SELECT {', '.join(_COLUMNS)} FROM entries ORDER BY id DESC LIMIT ?", (limit,))
+
+    def search(self, query: str, limit: int = 100) -> list:
+        """Newest entries matching every word of *query* (prefix match)."""
+        match = _fts_query(query)
+        if not match:                       # blank, or nothing but quotes
+            return self.recent(limit)
+        if self.fts:
+            # rowid DESC + LIMIT inside the FTS query lets SQLite stop after
+            # *limit* hits instead of sorting every match of a common word
+            return self._select(
+                f"SELECT {', '.join(_COLUMNS)} FROM entries WHERE id IN ("
+                " SELECT rowid FROM entries_fts WHERE entries_fts MATCH ?"
+                " ORDER BY rowid DESC LIMIT ?) ORDER BY id DESC",
+                (match, limit))
+        words = query.split()
+        where = " AND ".join("text LIKE ?" for _ in words)
+        return self._select(
+            f"SELECT {', '.join(_COLUMNS)} FROM entries WHERE {where}"
+            " ORDER BY id DESC LIMIT ?", [f"%{w}%" for w in words] + [limit])
+
+    def count(self) -> int:
+        with self._rlock:
+            return self._rconn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def delete(self, entry_id: int):
+        self.flush()
+        with self._wlock, self._wconn:
+            self._wconn.execute("DELETE FROM entries WHERE id = ?", (entry_id,))
+
+    def close(self):
+        self.flush()
+        self._wconn.close()
+        self._rconn.close()
+
+
+# ─── Module-level store ────────────────────────────────────────────────────────
+
+_store        = None
+_store_failed = False
+_store_lock   = threading.Lock()
+
+def get_store():
+    """Shared HistoryStore for HISTORY_FILE; None if the database can't be opened."""
+    global _store, _store_failed
+    with _store_lock:
+        if _store is None and not _store_failed:
+            try:
+                _store = HistoryStore(HISTORY_FILE)
+            except sqlite3.Error as e:
+                _store_failed = True
+                state.log(f"⚠️  History unavailable: {e}")
+        return _store
+
+def record(text: str, **meta):
+    """Store a transcript if history is enabled (non-blocking)."""
+    if not state.cfg.get("history_enabled", True):
+        return
+    store = get_store()
+    if store is not None:
+        store.add(text, **meta)
+
+def _flush_at_exit():
+    if _store is not None:
+        _store.flush()
+
+atexit.register(_flush_at_exit)
@@ -10,7 +10,10 @@ the 'input' group:
 
 import os
 import select as _select
+import struct
+import sys
 import threading
+import time
 
 from pynput import keyboard as pynput_kb
 from pynput import mouse    as pynput_ms
@@ -21,14 +24,21 @@ MOUSE_BTN_NAMES = {
     pynput_ms.Button.left:   "mouse_left",
     pynput_ms.Button.right:  "mouse_right",
     pynput_ms.Button.middle: "mouse_middle",
-#    pynput_ms.Button.x1:     "mouse_x1",
-#    pynput_ms.Button.x2:     "mouse_x2",
-    pynput_ms.Button.button8: "mouse_x1",
-    pynput_ms.Button.button9: "mouse_x2",
 }
+# Side buttons are x1/x2 on Windows, button8/button9 on X11; the dummy backend
+# (headless, PYNPUT_BACKEND=dummy) has neither
+for _attr, _name in (("x1", "mouse_x1"), ("x2", "mouse_x2"),
+                     ("button8", "mouse_x1"), ("button9", "mouse_x2")):
+    if hasattr(pynput_ms.Button, _attr):
+        MOUSE_BTN_NAMES[getattr(pynput_ms.Button, _attr)] = _name
+
+# Keys of the active hotkey that are physically down (see wait_hotkey_released)
+_held_cond    = threading.Condition()
+_held_keys    = set()
+_hotkey_names = set()
 
 # Module-level evdev state (Wayland backend)
-_evdev_stop   = None   # threading.Event
+_evdev_stop   = None   # _EvdevStop
 _evdev_thread = None   # threading.Thread
 
 # ─── Hotkey parsing ────────────────────────────────────────────────────────────
@@ -69,45 +79,6 @@ def _pynput_key_name(key) -> str:
 
 # ─── evdev backend (Wayland) ───────────────────────────────────────────────────
 
-def _evdev_key_name(code: int) -> str:
-    """Convert an evdev key code to the same name strings used by pynput paths."""
-    try:
-        from evdev import ecodes
-        if code in (ecodes.KEY_LEFTCTRL,  ecodes.KEY_RIGHTCTRL):  return 'ctrl'
-        if code in (ecodes.KEY_LEFTALT,   ecodes.KEY_RIGHTALT):   return 'alt'
-        if code in (ecodes.KEY_LEFTSHIFT, ecodes.KEY_RIGHTSHIFT): return 'shift'
-        if code in (ecodes.KEY_LEFTMETA,  ecodes.KEY_RIGHTMETA):  return 'cmd'
-        if code == ecodes.KEY_SPACE:     return 'space'
-        if code == ecodes.KEY_ENTER:     return 'enter'
-        if code == ecodes.KEY_BACKSPACE: return 'backspace'
-        if code == ecodes.KEY_TAB:       return 'tab'
-        if code == ecodes.KEY_ESC:       return 'esc'
-        # F-keys
-        for n in range(1, 13):
-            fk = getattr(ecodes, f'KEY_F{n}', None)
-            if fk is not None and code == fk:
-                return f'f{n}'
-        # Alpha keys: KEY_A..KEY_Z → 'a'..'z'
-        for c in 'abcdefghijklmnopqrstuvwxyz':
-            ak = getattr(ecodes, f'KEY_{c.upper()}', None)
-            if ak is not None and code == ak:
-                return c
-        # Digit keys: KEY_0..KEY_9
-        for n in range(10):
-            dk = getattr(ecodes, f'KEY_{n}', None)
-            if dk is not None and code == dk:
-                return str(n)
-        # Fallback: use evdev name map
-        names = ecodes.KEY.get(code, None)
-        if isinstance(names, str):
-            return names.replace('KEY_', '').lower()
-        if isinstance(names, list) and names:
-            return names[0].replace('KEY_', '').lower()
-        return f'key_{code}'
-    except Exception:
-        return f'key_{code}'
-
-
 _EVDEV_NORMALIZE = {
     # All Ctrl/Alt/Shift/Meta variants → canonical names used in parse_hotkey()
     "leftctrl": "ctrl",  "rightctrl": "ctrl",
@@ -125,100 +96,311 @@ def _evdev_normalize(name: str) -> str:
     return _EVDEV_NORMALIZE.get(name, name)
 
 
-def _evdev_listener_thread(held_keys, on_press, on_release, stop_event):
-    """Background thread: reads raw evdev events from all keyboard devices."""
+_EVDEV_NAMES = None   # flat list: evdev key code → normalized name (built once)
+
+def _evdev_name_table() -> list:
+    """Build the code → name table once from evdev.ecodes.
+
+    Produces the same strings as the pynput paths ('ctrl', 'space', 'f9', 'a',
+    '1', …) so hotkey matching is backend-independent.
+    """
+    global _EVDEV_NAMES
+    if _EVDEV_NAMES is not None:
+        return _EVDEV_NAMES
+    from evdev import ecodes
+    size  = max(getattr(ecodes, "KEY_MAX", 0x2ff), max(ecodes.KEY, default=0)) + 1
+    table = [f"key_{code}" for code in range(size)]
+    # Generic names from the evdev name map (first alias wins)
+    for code, names in ecodes.KEY.items():
+        if isinstance(names, list):
+            names = names[0] if names else None
+        if isinstance(names, str):
+            table[code] = _evdev_normalize(names.replace("KEY_", "").lower())
+    # Explicit names take precedence over evdev aliases
+    explicit = {
+        "LEFTCTRL": "ctrl",   "RIGHTCTRL": "ctrl",
+        "LEFTALT":  "alt",    "RIGHTALT":  "alt",
+        "LEFTSHIFT":"shift",  "RIGHTSHIFT":"shift",
+        "LEFTMETA": "cmd",    "RIGHTMETA": "cmd",
+        "SPACE": "space", "ENTER": "enter", "BACKSPACE": "backspace",
+        "TAB": "tab", "ESC": "esc",
+    }
+    explicit.update({f"F{n}": f"f{n}" for n in range(1, 13)})
+    explicit.update({c.upper(): c for c in "abcdefghijklmnopqrstuvwxyz"})
+    explicit.update({str(n): str(n) for n in range(10)})
+    for key, name in explicit.items():
+        code = getattr(ecodes, f"KEY_{key}", None)
+        if code is not None and code < size:
+            table[code] = name
+    _EVDEV_NAMES = table
+    return table
+
+def _evdev_key_name(code: int) -> str:
+    """Convert an evdev key code to the same name strings used by pynput paths."""
+    try:
+        return _evdev_name_table()[code]
+    except (ImportError, IndexError):
+        return f"key_{code}"
+
+def _evdev_wanted_codes(names) -> frozenset:
+    """Key codes whose normalized name is in *names* (hotkey key + modifiers)."""
+    table = _evdev_name_table()
+    return frozenset(code for code, name in enumerate(table) if name in names)
+
+
+class _EvdevStop:
+    """Stop flag for the evdev thread backed by an eventfd (or pipe).
+
+    ``set()`` makes the fd readable, which wakes the blocking epoll wait, so
+    the listener needs no poll timeout.
+    """
+
+    _ONE = (1).to_bytes(8, sys.byteorder)
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock  = threading.Lock()
+        if hasattr(os, "eventfd"):
+            self._r = self._w = os.eventfd(0, os.EFD_CLOEXEC | os.EFD_NONBLOCK)
+        else:
+            self._r, self._w = os.pipe()
+            os.set_blocking(self._r, False)
+
+    def fileno(self) -> int:
+        return self._r
+
+    def is_set(self) -> bool:
+        return self._event.is_set()
+
+    def set(self):
+        self._event.set()
+        with self._lock:
+            if self._w is not None:
+                try: os.write(self._w, self._ONE)
+                except OSError: pass
+
+    def close(self):
+        with self._lock:
+            for fd in {self._r, self._w}:
+                try: os.close(fd)
+                except OSError: pass
+            self._r = self._w = None
+
+
+# inotify (via libc) – watches /dev/input for keyboards being plugged / unplugged
+_INPUT_DIR     = "/dev/input"
+_IN_ATTRIB     = 0x00000004
+_IN_CREATE     = 0x00000100
+_IN_DELETE     = 0x00000200
+_INOTIFY_EVENT = struct.Struct("iIII")   # wd, mask, cookie, len
+
+def _inotify_watch(path: str, mask: int):
+    """Return a non-blocking inotify fd watching *path*, or None if unavailable."""
+    try:
+        import ctypes, ctypes.util
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, path.encode(), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except Exception:
+        return None
+
+def _inotify_read(fd: int) -> list:
+    """Drain pending inotify events → [(name, mask), ...]."""
+    try:
+        buf = os.read(fd, 4096)
+    except (BlockingIOError, InterruptedError):
+        return []
+    out, off = [], 0
+    while off + _INOTIFY_EVENT.size <= len(buf):
+        _, mask, _, ln = _INOTIFY_EVENT.unpack_from(buf, off)
+        off += _INOTIFY_EVENT.size
+        name = buf[off:off + ln].split(b"\0", 1)[0].decode(errors="replace")
+        off += ln
+        out.append((name, mask))
+    return out
+
+
+def _evdev_open_keyboard(path: str):
+    """Open *path* if it is a real keyboard (EV_KEY with KEY_A), else None."""
+    import evdev
+    from evdev import ecodes
+    try:
+        dev = evdev.InputDevice(path)
+    except Exception:
+        return None   # not (yet) readable – udev may still be fixing permissions
+    try:
+        caps = dev.capabilities()
+        # Only real keyboards: must have EV_KEY and KEY_A (mice don't have KEY_A)
+        if ecodes.KEY_A in caps.get(ecodes.EV_KEY, []):
+            return dev
+    except Exception:
+        pass
+    dev.close()
+    return None
+
+
+def _evdev_log_no_access():
+    import grp, pwd
+    try:
+        in_group = any(
+            g.gr_name == "input"
+            for g in grp.getgrall()
+            if pwd.getpwuid(os.getuid()).pw_name in g.gr_mem
+               or g.gr_gid == os.getgid()
+        )
+        in_current = "input" in [grp.getgrgid(g).gr_name for g in os.getgroups()]
+    except Exception:
+        in_group = in_current = False
+    if in_group and not in_current:
+        state.log(
+            "❌ evdev: You are in the 'input' group (in /etc/group) but your\n"
+            "   current graphical session does not have it yet.\n"
+            "   ➜ Log out of your desktop (GNOME/KDE) completely and log back in.\n"
+            "   Just closing terminals is not enough!"
+        )
+    else:
+        state.log(
+            "❌ evdev: no input devices accessible.\n"
+            "   Add yourself to the 'input' group and re-login:\n"
+            "   sudo usermod -aG input $USER"
+        )
+
+
+def _evdev_listener_thread(held_keys, on_press, on_release, stop_event, wanted=None):
+    """Background thread: reads raw evdev events from all keyboard devices.
+
+    Blocks in epoll without a timeout; *stop_event* (an _EvdevStop) wakes it.
+    /dev/input is watched with inotify so keyboards are attached and detached
+    live.  Only keys named in *wanted* (hotkey key + modifiers) reach the
+    callbacks; every other keystroke is dropped after a single set lookup.
+    """
     try:
         import evdev
         from evdev import ecodes
     except ImportError:
         state.log("❌ evdev not installed – run: pip install evdev")
+        stop_event.close()
         return
 
     all_paths = list(evdev.list_devices())
     if not all_paths:
-        import grp, pwd, os as _os
-        try:
-            in_group = any(
-                g.gr_name == "input"
-                for g in grp.getgrall()
-                if pwd.getpwuid(_os.getuid()).pw_name in g.gr_mem
-                   or g.gr_gid == _os.getgid()
-            )
-            in_current = "input" in [grp.getgrgid(g).gr_name for g in _os.getgroups()]
-        except Exception:
-            in_group = in_current = False
-        if in_group and not in_current:
-            state.log(
-                "❌ evdev: You are in the 'input' group (in /etc/group) but your\n"
-                "   current graphical session does not have it yet.\n"
-                "   ➜ Log out of your desktop (GNOME/KDE) completely and log back in.\n"
-                "   Just closing terminals is not enough!"
-            )
-        else:
-            state.log(
-                "❌ evdev: no input devices accessible.\n"
-                "   Add yourself to the 'input' group and re-login:\n"
-                "   sudo usermod -aG input $USER"
-            )
+        _evdev_log_no_access()
+        stop_event.close()
         return
 
-    kb_devs = []
-    for path in all_paths:
-        try:
-            dev = evdev.InputDevice(path)
-            caps = dev.capabilities()
-            # Only real keyboards: must have EV_KEY and KEY_A (mice don't have KEY_A)
-            key_caps = caps.get(ecodes.EV_KEY, [])
-            if ecodes.EV_KEY in caps and ecodes.KEY_A in key_caps:
-                kb_devs.append(dev)
-            else:
-                dev.close()
-        except Exception:
-            pass
+    table        = _evdev_name_table()
+    wanted_codes = _evdev_wanted_codes(wanted) if wanted else frozenset(range(len(table)))
+    EV_KEY       = ecodes.EV_KEY
+
+    ep      = _select.epoll()
+    devs    = {}   # fd → InputDevice
+    by_path = {}   # path → fd
+    pressed = {}   # fd → names currently held on that device
+
+    def attach(path, quiet=False):
+        if path in by_path:
+            return
+        dev = _evdev_open_keyboard(path)
+        if dev is None:
+            return
+        ep.register(dev.fd, _select.EPOLLIN)
+        devs[dev.fd] = dev; by_path[path] = dev.fd; pressed[dev.fd] = set()
+        if not quiet:
+            state.log(f"⌨️  evdev: keyboard attached: {dev.name}")
+
+    def detach(fd):
+        dev = devs.pop(fd, None)
+        if dev is None:
+            return
+        by_path.pop(dev.path, None)
+        try: ep.unregister(fd)
+        except Exception: pass
+        try: dev.close()
+        except Exception: pass
+        # Keys held on a vanished keyboard will never send key-up – release them
+        for name in pressed.pop(fd, ()):
+            on_release(name)
+        state.log(f"⌨️  evdev: keyboard detached: {dev.name}")
+
+    stop_fd = stop_event.fileno()
+    ep.register(stop_fd, _select.EPOLLIN)
+    ino_fd = _inotify_watch(_INPUT_DIR, _IN_CREATE | _IN_ATTRIB | _IN_DELETE)
+    if ino_fd is not None:
+        ep.register(ino_fd, _select.EPOLLIN)
 
-    if not kb_devs:
+    for path in all_paths:
+        attach(path, quiet=True)
+
+    if devs:
+        names = ", ".join(d.name for d in devs.values())
+        state.log(f"⌨️  evdev listening on {len(devs)} device(s): {names}")
+    elif ino_fd is not None:
+        state.log("⚠️  evdev: no keyboard found yet – waiting for one to be plugged in")
+    else:
         state.log(
             "❌ evdev: no keyboard devices found.\n"
             "   Add yourself to the 'input' group and re-login:\n"
             "   sudo usermod -aG input $USER"
         )
-        return
-
-    names = ", ".join(d.name for d in kb_devs)
-    state.log(f"⌨️  evdev listening on {len(kb_devs)} device(s): {names}")
 
-    fds = {d.fd: d for d in kb_devs}
-    while not stop_event.is_set():
-        try:
-            readable, _, _ = _select.select(list(fds.keys()), [], [], 0.2)
-            for fd in readable:
-                dev = fds.get(fd)
+    try:
+        while not stop_event.is_set() and (devs or ino_fd is not None):
+            for fd, mask in ep.poll():
+                if fd == stop_fd:
+                    break
+                if fd == ino_fd:
+                    for name, imask in _inotify_read(ino_fd):
+                        if not name.startswith("event"):
+                            continue
+                        path = os.path.join(_INPUT_DIR, name)
+                        if imask & _IN_DELETE:
+                            if path in by_path: detach(by_path[path])
+                        else:
+                            attach(path)
+                    continue
+                dev = devs.get(fd)
                 if dev is None:
                     continue
+                if mask & (_select.EPOLLHUP | _select.EPOLLERR):
+                    detach(fd)
+                    continue
                 try:
+                    held = pressed[fd]
                     for event in dev.read():
-                        if event.type != ecodes.EV_KEY:
-                            continue
-                        if event.value == 2:  # key-repeat; ignore
+                        # Drop non-key events, key-repeat (2) and irrelevant keys
+                        if (event.type != EV_KEY or event.value == 2
+                                or event.code not in wanted_codes):
                             continue
-                        name = _evdev_normalize(_evdev_key_name(event.code))
+                        name = table[event.code]
                         if event.value == 1:    # key down
+                            held.add(name)
                             on_press(name)
                         else:                   # key up
+                            held.discard(name)
                             on_release(name)
+                except BlockingIOError:
+                    pass
                 except OSError:
                     # Device disappeared (e.g. USB unplugged)
-                    fds.pop(fd, None)
+                    detach(fd)
                 except Exception as _e:
                     state.log(f"[evdev] read error: {_e}")
-        except Exception:
-            break
-
-    for d in kb_devs:
-        try:
-            d.close()
-        except Exception:
-            pass
+    except Exception as _e:
+        state.log(f"[evdev] listener error: {_e}")
+    finally:
+        for fd in list(devs):
+            try: devs[fd].close()
+            except Exception: pass
+        if ino_fd is not None:
+            try: os.close(ino_fd)
+            except OSError: pass
+        ep.close()
+        stop_event.close()
 
 
 def _is_wayland() -> bool:
@@ -227,8 +409,20 @@ def _is_wayland() -> bool:
 
 # ─── PTT listener lifecycle ────────────────────────────────────────────────────
 
+def wait_hotkey_released(timeout: float = 1.0) -> float:
+    """Block until the hotkey key and its modifiers are physically up.
+
+    Injected keystrokes (Ctrl+V, typed text) would otherwise combine with a
+    still-held Ctrl/Alt.  Returns the seconds spent waiting.
+    """
+    t0 = time.perf_counter()
+    with _held_cond:
+        _held_cond.wait_for(lambda: not (_held_keys & _hotkey_names), timeout)
+    return time.perf_counter() - t0
+
+
 def start_ptt_listener():
-    global _evdev_stop, _evdev_thread
+    global _evdev_stop, _evdev_thread, _held_keys, _hotkey_names
     stop_ptt_listener()
 
     hk       = parse_hotkey(state.cfg["hotkey"])
@@ -236,12 +430,17 @@ def start_ptt_listener():
     hk_key   = hk["key"]
     hk_mouse = hk["mouse"]
     held_keys = set()
+    with _held_cond:
+        _held_keys    = held_keys
+        _hotkey_names = mod_mods | {hk_key} if hk_key else set(mod_mods)
+        _held_cond.notify_all()
 
     def mods_ok():
         return mod_mods.issubset(held_keys)
 
     def on_press(name: str):
-        held_keys.add(name)
+        with _held_cond:
+            held_keys.add(name)
         if hk_key and name == hk_key:
             if mods_ok():
                 _ptt_trigger_press()
@@ -251,17 +450,19 @@ def start_ptt_listener():
     def on_release(name: str):
         if hk_key and name == hk_key:
             _ptt_trigger_release()
-        held_keys.discard(name)
+        with _held_cond:
+            held_keys.discard(name)
+            _held_cond.notify_all()
 
     # ── Wayland: try evdev backend ──────────────────────────────────────────
     if _is_wayland():
         state.log("🐧 Wayland session detected – using evdev keyboard backend")
         try:
             import evdev  # noqa: F401 – just check it's importable
-            _evdev_stop   = threading.Event()
+            _evdev_stop   = _EvdevStop()
             _evdev_thread = threading.Thread(
                 target=_evdev_listener_thread,
-                args=(held_keys, on_press, on_release, _evdev_stop),
+                args=(held_keys, on_press, on_release, _evdev_stop, _hotkey_names),
                 daemon=True,
             )
             _evdev_thread.start()
@@ -325,10 +526,11 @@ def stop_ptt_listener():
 
 def _ptt_trigger_press():
     from ptt.audio import start_recording
+    from ptt import idle
     with state.ptt_lock:
         if state._ptt_active:
             return
-        if state.whisper_model is None and state.openvino_pipe is None:
+        if not idle.ensure_loaded():   # parked model: reload overlaps recording
             state.log("⏳ PTT pressed – model not ready yet, ignoring.")
             return
         state._ptt_active = True
@@ -344,4 +546,4 @@ def _ptt_trigger_release():
         state._ptt_active = False
     state.log("🔍 PTT STOP – transcribing…")
     stop_recording()
-    threading.Thread(target=transcribe_and_paste, daemon=True).start()
+    threading.Thread(target=transcribe_and_paste, daemon=True, name="transcribe").start()
@@ -0,0 +1,159 @@
+"""
+ptt/idle.py – Unload the model after a period of inactivity, reload on demand.
+
+With ``idle_unload_min`` > 0 a watcher thread drops the serving engine once
+nobody has dictated for that long, so a ``large-v3`` model stops pinning
+several GB of RAM / VRAM.  The watcher sleeps until the idle deadline and
+exists only while unloading is enabled and the model is loaded – with the
+default of 0 nothing wakes up.  The model is "parked": the next PTT press starts
+the reload immediately, overlapping with recording, and the transcription
+thread only waits for whatever is left when the key is released.
+"""
+
+import gc
+import threading
+import time
+
+import ptt.state as state
+from ptt.hardware import process_rss, trim_heap
+
+CHECK_S = 30.0   # retry interval while the model can't be unloaded (loading, in use)
+
+_lock      = threading.Lock()
+_last_used = time.monotonic()
+_parked    = None    # name of the unloaded model, None while loaded
+_reload    = None    # thread reloading the parked model
+_watcher   = None
+_wake      = threading.Condition()   # _watcher; notified when the settings change
+
+
+def _mb(n: int) -> str:
+    return f"{n / 1048576:.0f} MB" if n else "? MB"
+
+
+def touch():
+    """Mark activity (PTT press, transcription)."""
+    global _last_used
+    _last_used = time.monotonic()
+
+
+def idle_seconds() -> float:
+    return time.monotonic() - _last_used
+
+
+def is_parked() -> bool:
+    return _parked is not None
+
+
+def _limit() -> float:
+    return state.cfg.get("idle_unload_min", 0) * 60
+
+
+def start():
+    """Arm the watcher (start-up, settings saved, model reloaded).
+
+    No thread while ``idle_unload_min`` is 0 or the model is parked; a
+    sleeping watcher recomputes its deadline.
+    """
+    global _watcher
+    with _wake:
+        if _watcher is not None:
+            _wake.notify()
+        elif _limit() > 0 and _parked is None:
+            _watcher = threading.Thread(target=_watch, daemon=True, name="idle-watch")
+            _watcher.start()
+
+
+def _watch():
+    global _watcher
+    while True:
+        with _wake:
+            limit = _limit()
+            if limit <= 0 or _parked is not None:
+                _watcher = None
+                return
+            left = limit - idle_seconds()
+            if left > 0:            # touch() moved the deadline: sleep until the new one
+                _wake.wait(left)
+                continue
+        if not unload() and _parked is None:
+            with _wake:
+                _wake.wait(CHECK_S)
+
+
+def unload() -> bool:
+    """Drop the serving engine; False if it is in use or nothing is loaded."""
+    global _parked
+    from ptt.model_manager import _publish, active_model
+    with _lock:
+        if _parked is not None or _reload is not None:
+            return False
+        if state.recording or state._ptt_active:
+            return False
+        engine, name, _ = active_model()
+        if engine is None:
+            return False
+        rss = process_rss()
+        _publish()
+        _parked = name
+    # an in-flight transcription still holds its own snapshot; the model is
+    # freed when the last reference goes
+    del engine
+    gc.collect()
+    trim_heap()
+    state.log(f"💤 Model '{name}' unloaded after {idle_seconds() / 60:.0f} min idle"
+              f" – RSS {_mb(rss)} → {_mb(process_rss())}")
+    state.ui_queue.put(("model_idle", name))
+    return True
+
+
+def ensure_loaded() -> bool:
+    """PTT press: start reloading a parked model.
+
+    Returns True if a model serves or is on its way, False if none is loaded
+    yet (startup) – the press is then ignored.
+    """
+    global _parked, _reload
+    touch()
+    with _lock:
+        if _parked is not None and state.engine is not None:
+            _parked = None   # a settings change loaded a model meanwhile
+            start()
+        if _parked is None:
+            return state.engine is not None
+        if _reload is None:
+            state.log(f"⚡ Reloading '{_parked}' while recording…")
+            _reload = threading.Thread(target=_do_reload, daemon=True, name="idle-reload")
+            _reload.start()
+    return True
+
+
+def _do_reload():
+    global _parked, _reload
+    from ptt.model_manager import load_model
+    t0, ok = time.perf_counter(), False
+    try:
+        # no status_cb: the overlay is showing "recording" right now
+        ok = load_model()
+    except Exception as e:
+        state.log(f"⚠️  Reload failed: {e}")
+    finally:
+        with _lock:
+            if ok:
+                _parked = None
+            _reload = None
+    if ok:
+        start()
+        state.log(f"✅ Model reloaded in {time.perf_counter() - t0:.1f}s"
+                  f" – RSS {_mb(process_rss())}")
+        state.ui_queue.put(("served", state.model_name, state.model_device))
+
+
+def wait_ready(timeout: float = None) -> bool:
+    """Transcription thread: wait for a running reload; True once a model serves."""
+    t = _reload
+    if t is not None:
+        t0 = time.perf_counter()
+        t.join(timeout)
+        state.log(f"⏳ Waited {time.perf_counter() - t0:.2f}s for the reload after release")
+    return state.engine is not None
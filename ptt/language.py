@@ -0,0 +1,127 @@
+"""
+ptt/language.py – Sticky language detection for ``language = "auto"``.
+
+Whisper normally scores all ~100 language tokens for every utterance.  The
+session cache remembers the detected language: once the same language has
+been detected ``STICKY_HITS`` times in a row with probability ≥
+``STICKY_PROB`` it is used directly and detection is skipped until the user
+resets it (click on the overlay label) or changes the language settings.
+
+``language_candidates`` (e.g. ``"de,en"``) restricts detection to a subset:
+only those language tokens are scored and renormalised, so a German
+sentence can no longer flip to Dutch.
+"""
+
+import threading
+
+import numpy as np
+
+import ptt.state as state
+from ptt.engines.base import DETECT_LANGUAGE
+
+STICKY_PROB = 0.8   # minimum detection probability that counts as a hit
+STICKY_HITS = 3     # consecutive confident hits before the language sticks
+
+
+class LanguageCache:
+    """Thread-safe session cache of the detected language."""
+
+    def __init__(self, prob: float = STICKY_PROB, hits: int = STICKY_HITS):
+        self._lock  = threading.Lock()
+        self._prob  = prob
+        self._need  = hits
+        self.sticky = None    # language used without detection
+        self.last   = None    # most recent detection (shown while not sticky)
+        self._hits  = 0
+
+    def observe(self, lang: str, prob: float) -> bool:
+        """Record one detection; returns True when *lang* just became sticky."""
+        with self._lock:
+            if self.sticky is not None:
+                return False
+            if lang == self.last and prob >= self._prob:
+                self._hits += 1
+            else:
+                self._hits = 1 if prob >= self._prob else 0
+            self.last = lang
+            if self._hits >= self._need:
+                self.sticky = lang
+                return True
+            return False
+
+    def reset(self):
+        with self._lock:
+            self.sticky = None
+            self.last   = None
+            self._hits  = 0
+
+
+cache = LanguageCache()
+
+
+def candidates() -> list:
+    """Configured candidate languages (empty = all)."""
+    raw = state.cfg.get("language_candidates", "") or ""
+    return [c.strip().lower() for c in raw.replace(";", ",").split(",") if c.strip()]
+
+
+def restrict_probs(all_probs, allowed) -> tuple:
+    """Best ``(lang, prob)`` from ``[(lang, prob), ...]`` renormalised over *allowed*."""
+    probs = [(l, p) for l, p in all_probs if l in allowed]
+    if not probs:
+        return None, 0.0
+    total = sum(p for _, p in probs) or 1.0
+    lang, p = max(probs, key=lambda x: x[1])
+    return lang, p / total
+
+
+def detect_restricted(model, audio: np.ndarray, allowed) -> tuple:
+    """Language detection over *allowed* only, on the first 30 s window.
+
+    Uses faster-whisper's encoder and the CTranslate2 language head directly
+    so no transcription is started; returns ``(lang, prob)``.
+    """
+    fe       = model.feature_extractor
+    features = fe(audio)[:, :fe.nb_max_frames]
+    if features.shape[-1] < fe.nb_max_frames:
+        features = np.pad(features, ((0, 0), (0, fe.nb_max_frames - features.shape[-1])))
+    encoder_output = model.encode(features)
+    results = model.model.detect_language(encoder_output)[0]
+    all_probs = [(token[2:-2], prob) for token, prob in results]   # "<|de|>" → "de"
+    return restrict_probs(all_probs, set(allowed))
+
+
+def resolve_language(engine, audio: np.ndarray):
+    """Language to pass to Whisper for this utterance.
+
+    Returns ``(lang, detected)``: *lang* is None when Whisper should detect on
+    its own (no candidates, not sticky); *detected* tells the caller whether
+    the result of that detection still has to be passed to ``note()``.
+    """
+    if cache.sticky is not None:
+        return cache.sticky, False
+    allowed = candidates()
+    if engine is not None and engine.supports(DETECT_LANGUAGE) and len(allowed) > 1:
+        lang, prob = engine.detect_language(audio, allowed)
+        if lang is not None:
+            note(lang, prob)
+            return lang, False
+    elif len(allowed) == 1:
+        return allowed[0], False
+    return None, True
+
+
+def note(lang: str, prob: float):
+    """Feed a detection into the cache (if enabled) and update the overlay."""
+    if not lang:
+        return
+    if state.cfg.get("sticky_language", True) and cache.observe(lang, prob):
+        state.log(f"🌐 Language locked to '{lang}' (click the label to reset)")
+    elif not state.cfg.get("sticky_language", True):
+        cache.last = lang
+    state.ui_queue.put(("language", cache.sticky or lang, cache.sticky is not None))
+
+
+def reset():
+    cache.reset()
+    state.ui_queue.put(("language", None, False))
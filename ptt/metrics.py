@@ -0,0 +1,325 @@
+"""
+ptt/metrics.py – Prometheus metrics: localhost endpoint or textfile collector.
+
+Opt-in through settings.json – nothing is served or written by default:
+
+    "metrics_port":     9464                         → http://127.0.0.1:9464/metrics
+    "metrics_textfile": "/var/lib/node_exporter/ptt.prom"   (rewritten every 15 s)
+
+Updating a metric is a few attribute operations and no lock: every series
+has a single writer (the audio callback, the transcription thread under
+``ptt_lock``, the model loader), and under the GIL a scrape that races an
+update only sees it one scrape later.  Values that already exist elsewhere
+(queue depth, engine counters, mic state) are read at scrape time.
+"""
+
+import atexit
+import bisect
+import os
+import tempfile
+import threading
+
+import ptt.state as state
+
+TEXTFILE_S = 15.0      # textfile rewrite interval
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+RTF_BUCKETS     = (0.05, 0.1, 0.2, 0.3, 0.5, 0.75, 1.0, 1.5, 2.0, 5.0)
+LOAD_BUCKETS    = (0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+# ─── Metric types ──────────────────────────────────────────────────────────────
+
+def _fmt(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return repr(v) if isinstance(v, float) else str(int(v))
+
+
+def _labels(pairs) -> str:
+    pairs = [(k, v) for k, v in pairs if k]
+    if not pairs:
+        return ""
+    esc = lambda s: str(s).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, label: str = None):
+        self.name, self.help, self.label = name, help, label
+        self._children = {}
+        if label is None:
+            self._children[None] = self._child()
+        _REGISTRY.append(self)
+
+    def labels(self, value):
+        """Series for *value* of the metric's label (created on first use)."""
+        child = self._children.get(value)
+        if child is None:
+            child = self._children.setdefault(value, self._child())
+        return child
+
+    def _child(self):
+        raise NotImplementedError
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for value, child in sorted(self._children.items(), key=lambda kv: str(kv[0])):
+            lines.extend(self._render_child((self.label, value), child))
+        return lines
+
+
+class _CounterValue:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, n: float = 1.0):
+        self.value += n
+
+
+class Counter(_Metric):
+    kind = "counter"
+    _child = _CounterValue
+
+    def inc(self, n: float = 1.0):
+        self._children[None].value += n
+
+    @property
+    def value(self) -> float:
+        return sum(c.value for c in self._children.values())
+
+    def _render_child(self, label, child):
+        return [f"{self.name}{_labels([label])} {_fmt(child.value)}"]
+
+
+class _HistogramValue:
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)   # last slot = +Inf
+        self.sum    = 0.0
+        self.count  = 0
+
+    def observe(self, v: float):
+        self.counts[bisect.bisect_left(self.bounds, v)] += 1
+        self.sum   += v
+        self.count += 1
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, buckets=LATENCY_BUCKETS, label: str = None):
+        self.buckets = tuple(buckets)
+        super().__init__(name, help, label)
+
+    def _child(self):
+        return _HistogramValue(self.buckets)
+
+    def observe(self, v: float):
+        self._children[None].observe(v)
+
+    def _render_child(self, label, child):
+        lines, acc = [], 0
+        for le, n in zip(self.buckets + (float("inf"),), list(child.counts)):
+            acc += n
+            lines.append(f"{self.name}_bucket{_labels([label, ('le', _fmt(le))])} {acc}")
+        lines.append(f"{self.name}_sum{_labels([label])} {_fmt(child.sum)}")
+        lines.append(f"{self.name}_count{_labels([label])} {acc}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Read at scrape time: *fn* returns a number or ``{label value: number}``.
+
+    ``kind="counter"`` exposes a counter that is kept elsewhere (e.g. by
+    ``ptt.audio_health``).
+    """
+
+    def __init__(self, name: str, help: str, fn, label: str = None, kind: str = "gauge"):
+        self.fn, self.kind = fn, kind
+        super().__init__(name, help, label)
+
+    def _child(self):
+        return None
+
+    def render(self) -> list:
+        try:
+            v = self.fn()
+        except Exception:
+            return []
+        values = v.items() if isinstance(v, dict) else [(None, v)]
+        return ([f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+                + [f"{self.name}{_labels([(self.label, k)])} {_fmt(x)}" for k, x in values])
+
+
+_REGISTRY = []
+
+
+# ─── Metrics ───────────────────────────────────────────────────────────────────
+
+UTTERANCES = Counter("ptt_utterances_total",
+                     "Push-to-talk releases by outcome", label="result")
+STAGE      = Histogram("ptt_stage_seconds",
+                       "Latency per pipeline stage (prepare, language, decode, paste, total)",
+                       label="stage")
+RTF        = Histogram("ptt_realtime_factor",
+                       "Decode time divided by audio duration per utterance", RTF_BUCKETS)
+AUDIO      = Counter("ptt_audio_seconds_total", "Seconds of speech transcribed")
+SILENT     = Counter("ptt_silent_recordings_total",
+                     "Recordings without signal (counted towards the mic restart)")
+MIC_RESTARTS = Counter("ptt_mic_restarts_total",
+                       "Microphone restarts after consecutive silent recordings")
+MIC_SWITCH = Histogram("ptt_mic_switch_seconds",
+                       "Gapless microphone switch: open, check and hand-over")
+MODEL_LOAD = Histogram("ptt_model_load_seconds",
+                       "Model load + warm-up time by engine", LOAD_BUCKETS, label="engine")
+
+Gauge("ptt_ui_queue_depth", "Messages waiting for the Tk thread",
+      lambda: state.ui_queue.qsize())
+Gauge("ptt_mic_ok", "1 while the audio stream is healthy", lambda: int(bool(state.MIC_OK)))
+Gauge("ptt_model_loaded", "1 while a model is serving", lambda: int(state.engine is not None))
+
+
+def _engine_values(key):
+    def fn():
+        from ptt import engines
+        return {f'{c["engine"]}/{c["model"]}': c[key] for c in engines.counters()}
+    return fn
+
+
+Gauge("ptt_engine_calls", "Decodes per live engine", _engine_values("calls"), label="engine")
+Gauge("ptt_engine_errors", "Failed decodes per live engine", _engine_values("errors"),
+      label="engine")
+Gauge("ptt_engine_busy_seconds", "Total decode time per live engine",
+      _engine_values("busy_s"), label="engine")
+
+
+def _audio_health():
+    from ptt.audio_health import MONITOR
+    return MONITOR
+
+
+Gauge("ptt_audio_callback_status_total", "Audio callbacks reporting a status flag",
+      lambda: {"input_overflow":  _audio_health().overflows,
+               "input_underflow": _audio_health().underflows,
+               "other":           _audio_health().other}, label="flag", kind="counter")
+Gauge("ptt_audio_callbacks_total", "Audio callbacks", lambda: _audio_health().callbacks,
+      kind="counter")
+Gauge("ptt_audio_late_callbacks_total", "Audio callbacks exceeding the block budget",
+      lambda: _audio_health().late, kind="counter")
+Gauge("ptt_audio_dropped_blocks_total", "Blocks missing from the ADC timeline",
+      lambda: _audio_health().dropped, kind="counter")
+Gauge("ptt_audio_callback_max_ms", "Longest audio callback", lambda: _audio_health().dur_max)
+Gauge("ptt_audio_jitter_max_ms", "Largest deviation from the callback period",
+      lambda: _audio_health().jit_max)
+
+
+def _startup_seconds():
+    from ptt import startup
+    return startup.seconds()
+
+
+Gauge("ptt_startup_seconds", "Seconds from process start until each startup step finished "
+      "(step=\"ready\": time to ready)", _startup_seconds, label="step")
+
+
+def render() -> str:
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for m in _REGISTRY:
+        lines.extend(m.render())
+    return "\n".join(lines) + "\n"
+
+
+# ─── Exporters ─────────────────────────────────────────────────────────────────
+
+_server = None
+_writer = None
+_stop   = threading.Event()
+
+
+def _serve(port: int):
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404); return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+    return server
+
+
+def write_textfile(path) -> None:
+    """Atomically replace *path* (node_exporter reads ``*.prom`` files)."""
+    path = os.path.abspath(path)
+    fd, tmp = tempfile.mkstemp(prefix=".ptt-", suffix=".tmp", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(render())
+        os.replace(tmp, path)
+    except BaseException:
+        try: os.unlink(tmp)
+        except OSError: pass
+        raise
+
+
+def _textfile_loop(path):
+    while True:
+        try:
+            write_textfile(path)
+        except Exception as e:
+            state.log(f"⚠️  Metrics textfile: {e}")
+            return
+        if _stop.wait(TEXTFILE_S):
+            write_textfile(path)   # final values on shutdown
+            return
+
+
+def start() -> bool:
+    """Start the exporters configured in ``metrics_port`` / ``metrics_textfile``."""
+    global _server, _writer
+    port = int(state.cfg.get("metrics_port", 0) or 0)
+    path = state.cfg.get("metrics_textfile", "")
+    _stop.clear()
+    if port and _server is None:
+        try:
+            _server = _serve(port)
+            state.log(f"📈 Metrics on http://127.0.0.1:{port}/metrics")
+        except OSError as e:
+            state.log(f"⚠️  Metrics port {port}: {e}")
+    if path and _writer is None:
+        _writer = threading.Thread(target=_textfile_loop, args=(path,), daemon=True,
+                                   name="metrics-textfile")
+        _writer.start()
+        atexit.register(stop)
+        state.log(f"📈 Metrics → {path} (every {TEXTFILE_S:.0f}s)")
+    return bool(_server or path)
+
+
+def stop():
+    """Stop the HTTP server and write the textfile one last time."""
+    global _server, _writer
+    _stop.set()
+    if _server is not None:
+        _server.shutdown(); _server.server_close()
+        _server = None
+    if _writer is not None:
+        _writer.join(5)
+        _writer = None
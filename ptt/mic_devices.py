@@ -0,0 +1,225 @@
+"""
+ptt/mic_devices.py – Cached microphone list and capability probe.
+
+Listing PortAudio devices and finding out which of them record 16 kHz mono
+is slow on machines with many ALSA / PipeWire endpoints.  It happens here,
+off the Tk thread, instead of in the Settings window and by trial opens in
+``start_audio_stream``:
+
+* ``scan()`` lists the input devices and probes each one with
+  ``sd.check_input_settings`` (mono, PROBE_RATES) – no stream is opened
+* the result is kept in ``mic_devices.json`` next to settings.json; a device
+  whose name, host API, channel count and default rate are unchanged keeps
+  its probe result, so later starts only re-list
+* ``devices()`` / ``supports()`` answer from memory and never wait for a scan;
+  ``supports()`` only asks PortAudio for the device's name, because indexes
+  shift when devices are plugged in between runs
+
+PortAudio only sees hot-plugged devices after it is re-initialised, which
+``scan(reinit=True)`` does when no stream is open: the app scans at start-up
+and whenever the microphone is reopened (🎤, after silent recordings).  A
+hot switch during a recording keeps the old stream open and so skips it.
+"""
+
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import sounddevice as sd
+except (ImportError, OSError):   # no PortAudio: only the default entry is listed
+    sd = None
+
+import ptt.state as state
+from ptt.constants import MIC_CACHE_FILE
+
+SAMPLE_RATE = 16000
+PROBE_RATES = (16000, 44100, 48000)
+
+_entries    = []      # [{"index", "name", "hostapi", "channels", "default_rate", "rates"}]
+_default    = None    # PortAudio index of the default input
+_loaded     = False
+_lock       = threading.Lock()         # _entries / _default
+_scan_lock  = threading.Lock()         # one scan at a time
+_scan_thread = None
+_on_done    = []
+scans       = 0       # scans run by this process (tests)
+probed      = 0       # devices probed by the last scan (tests)
+
+
+# ─── Cache file ────────────────────────────────────────────────────────────────
+
+def _load():
+    global _entries, _default, _loaded
+    with _lock:
+        if _loaded:
+            return
+        _loaded = True
+        try:
+            data = json.loads(MIC_CACHE_FILE.read_text(encoding="utf-8"))
+            _entries, _default = list(data["devices"]), data.get("default")
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+
+def _save(entries, default):
+    tmp = MIC_CACHE_FILE.with_suffix(".tmp")
+    try:
+        tmp.write_text(json.dumps({"default": default, "devices": entries}, ensure_ascii=False,
+                                  indent=1), encoding="utf-8")
+        os.replace(tmp, MIC_CACHE_FILE)
+    except OSError as e:
+        state.log(f"⚠️  Mic list not cached: {e}")
+
+
+# ─── Queries (memory only) ─────────────────────────────────────────────────────
+
+def entries() -> list:
+    _load()
+    with _lock:
+        return [dict(e) for e in _entries]
+
+
+def devices() -> dict:
+    """``{index: name}`` of the input devices; -1 (system default) comes first."""
+    _load()
+    with _lock:
+        default = next((e["name"] for e in _entries if e["index"] == _default), "")
+        out = {-1: f"Default  [{default}]" if default else "Default (system default)"}
+        out.update((e["index"], e["name"]) for e in _entries)
+    return out
+
+
+def _current_name(index):
+    """Name PortAudio gives device *index* right now; None if it can't tell."""
+    if sd is None or index is None:
+        return None
+    try:
+        return sd.query_devices(index).get("name", "").strip()
+    except Exception:
+        return None
+
+
+def supports(index, rate: int = SAMPLE_RATE):
+    """Whether device *index* (-1/None: the default) records *rate* Hz mono;
+    None while it hasn't been probed.
+
+    The cache is keyed by PortAudio index: an entry only counts while the
+    device at that index still has the cached name – after a hot-plug between
+    runs the answer is None and the open attempt decides.
+    """
+    _load()
+    with _lock:
+        if index is None or index == -1:
+            index = _default
+        e = next((e for e in _entries if e["index"] == index), None)
+    if e is None or _current_name(index) != e["name"]:
+        return None
+    return rate in e["rates"]
+
+
+# ─── Scanning ──────────────────────────────────────────────────────────────────
+
+def _probe(index: int) -> list:
+    rates = []
+    for rate in PROBE_RATES:
+        try:
+            sd.check_input_settings(device=index, channels=1, dtype="float32", samplerate=rate)
+            rates.append(rate)
+        except Exception:
+            pass
+    return rates
+
+
+def scan(reinit: bool = False) -> bool:
+    """List and probe the input devices (blocking); True if anything changed.
+
+    With *reinit* PortAudio is re-initialised first so it sees devices
+    plugged in since – skipped while a stream is open, which it would kill.
+    """
+    global _entries, _default, scans, probed
+    if sd is None:
+        return False
+    _load()
+    with _scan_lock:
+        t0 = time.perf_counter()
+        if reinit and state._audio_stream is None:
+            try:
+                sd._terminate()
+                sd._initialize()
+            except Exception as e:
+                state.log(f"⚠️  PortAudio re-init failed: {e}")
+        with _lock:
+            known = {(e["name"], e["hostapi"], e["channels"], e["default_rate"]): e["rates"]
+                     for e in _entries}
+        try:
+            devs = sd.query_devices()
+            apis = sd.query_hostapis()
+            default = sd.default.device[0]
+        except Exception as e:
+            state.log(f"⚠️  Microphone list failed: {e}")
+            return False
+        if isinstance(devs, dict):
+            devs = [devs]
+        new, probed = [], 0
+        quiet = sys.platform.startswith("linux")
+        from ptt.audio import _suppress_alsa_errors   # probing makes ALSA print to stderr
+        for i, d in enumerate(devs):
+            if d.get("max_input_channels", 0) <= 0:
+                continue
+            e = {"index": i, "name": d.get("name", f"Device {i}").strip(),
+                 "hostapi": apis[d["hostapi"]]["name"] if "hostapi" in d else "",
+                 "channels": d["max_input_channels"],
+                 "default_rate": int(d.get("default_samplerate", 0))}
+            rates = known.get((e["name"], e["hostapi"], e["channels"], e["default_rate"]))
+            if rates is None:
+                with _suppress_alsa_errors() if quiet else contextlib.nullcontext():
+                    rates = _probe(i)
+                probed += 1
+            e["rates"] = rates
+            new.append(e)
+        default = default if isinstance(default, int) and default >= 0 else None
+        with _lock:
+            changed = new != _entries or default != _default
+            _entries, _default = new, default
+        scans += 1
+        if changed:
+            _save(new, default)
+            no16 = sum(SAMPLE_RATE not in e["rates"] for e in new)
+            state.log(f"🎤 {len(new)} input devices ({probed} probed"
+                      + (f", {no16} without 16 kHz" if no16 else "")
+                      + f") in {(time.perf_counter() - t0) * 1000:.0f} ms")
+        return changed
+
+
+def refresh(reinit: bool = False, on_done=None):
+    """``scan()`` on a background thread ("mic-scan"); *on_done* runs on that
+    thread when it finishes (joins a scan already running)."""
+    global _scan_thread
+    with _lock:
+        if on_done is not None:
+            _on_done.append(on_done)
+        if _scan_thread is not None:
+            return _scan_thread
+        _scan_thread = threading.Thread(target=_run, args=(reinit,), daemon=True, name="mic-scan")
+        _scan_thread.start()
+        return _scan_thread
+
+
+def _run(reinit):
+    global _scan_thread
+    try:
+        scan(reinit)
+    finally:
+        with _lock:
+            _scan_thread = None
+            callbacks = _on_done[:]
+            _on_done.clear()
+        for fn in callbacks:
+            try:
+                fn()
+            except Exception as e:
+                state.log(f"⚠️  Mic list update failed: {e}")
@@ -2,82 +2,308 @@
 ptt/model_manager.py – Whisper model loading (faster-whisper + OpenVINO GenAI).
 """
 
+import time
+from pathlib import Path
+
 import ptt.state as state
-from ptt.constants import MODELS_OV
+from ptt import downloader, engines, metrics
+from ptt.constants import MODELS, MODELS_CT2, MODELS_OV, OV_DEVICES
 from ptt.config import T, get_models_dir
-from ptt.hardware import resolve_device
+from ptt.hardware import resolve_device, resolve_threads
+
+_OV_IGNORE  = ["*.msgpack", "*.h5", "flax_model*", "tf_model*"]
+_CT2_ALLOW  = ["config.json", "preprocessor_config.json", "model.bin",
+               "tokenizer.json", "vocabulary.*"]
 
 # ─── OpenVINO model helpers ────────────────────────────────────────────────────
 
-def _ov_model_dir(model_name: str):
-    return get_models_dir() / f"{model_name}-ov"
+def _ov_model_dir(model_name: str, ov_device: str = "NPU"):
+    if ov_device == "NPU":
+        return get_models_dir() / f"{model_name}-ov"
+    return get_models_dir() / f"{model_name}-{ov_device.lower()}-ov"
 
-def _download_ov_model(model_name: str, status_cb=None):
+def _download_ov_model(model_name: str, status_cb=None, ov_device: str = "NPU"):
     """Download pre-converted OpenVINO Whisper model from HuggingFace if needed."""
-    repo_id   = MODELS_OV.get(model_name, f"OpenVINO/whisper-{model_name}-fp16-ov")
-    local_dir = _ov_model_dir(model_name)
-    if not local_dir.exists() or not any(local_dir.glob("*.xml")):
+    repo_id   = MODELS_OV.get(ov_device, MODELS_OV["NPU"]).get(
+        model_name, f"OpenVINO/whisper-{model_name}-fp16-ov")
+    local_dir = _ov_model_dir(model_name, ov_device)
+    if not local_dir.exists() or not any(local_dir.glob("*.xml")) \
+            or any(local_dir.glob("*.part")):
         if status_cb: status_cb("loading", f"Downloading '{model_name}' (OV)...")
         state.log(f"⬇️  Downloading OV model: {repo_id}")
-        from huggingface_hub import snapshot_download
-        snapshot_download(
-            repo_id=repo_id,
-            local_dir=str(local_dir),
-            ignore_patterns=["*.msgpack", "*.h5", "flax_model*", "tf_model*"],
-        )
+        try:
+            downloader.manager.fetch_repo(
+                repo_id, local_dir, ignore=_OV_IGNORE,
+                progress_cb=downloader.status_progress(status_cb, f"'{model_name}' (OV)")
+                            if status_cb else None)
+        except Exception as e:
+            state.log(f"⚠️  Download manager failed ({e}) – using huggingface_hub")
+            from huggingface_hub import snapshot_download
+            snapshot_download(repo_id=repo_id, local_dir=str(local_dir),
+                              ignore_patterns=_OV_IGNORE)
         state.log(f"✅ OV model saved to {local_dir}")
     return local_dir
 
-# ─── Model loading ─────────────────────────────────────────────────────────────
+# ─── faster-whisper model helpers ──────────────────────────────────────────────
 
-def load_model(status_cb=None):
-    state.whisper_model = None
-    state.openvino_pipe = None
-    if status_cb: status_cb("loading", f"Loading '{state.cfg['model']}'...")
-    d, c = resolve_device(state.cfg["device"], state.cfg["compute_type"])
+def _ct2_model_dir(model_name: str) -> Path:
+    return get_models_dir() / f"faster-whisper-{model_name}"
 
-    # ── NPU path via OpenVINO GenAI ───────────────────────────────────────────
-    if d == "npu":
-        try:
-            import openvino_genai
-            model_dir = _download_ov_model(state.cfg["model"], status_cb)
-            state.log("ℹ️  Compiling for NPU – first run may take ~1 min...")
-            if status_cb: status_cb("loading", "Compiling for NPU...")
-            state.openvino_pipe = openvino_genai.WhisperPipeline(str(model_dir), device="NPU")
-            if status_cb: status_cb("ready", f"{T('ready')}  [NPU]")
-            state.log("✅ Model loaded on NPU (OpenVINO)")
-            return
-        except Exception as e:
-            state.log(f"⚠️  NPU failed: {e}")
-            state.log("↩️  Falling back to CPU...")
-            d, c = "cpu", "int8"
+def _ct2_model_path(model_name: str, status_cb=None) -> str:
+    """Local directory for *model_name*, downloading it if needed.
 
-    # ── CPU / CUDA path via faster-whisper ────────────────────────────────────
-    lbl = {"cuda": "CUDA (NVIDIA)", "cpu": "CPU"}.get(d, d)
-    state.log(f"ℹ️  Device: {lbl} | Compute: {c} | Model: {state.cfg['model']}")
+    Models already in faster-whisper's own HuggingFace cache layout (older
+    versions of this app) are used as they are.  Unknown names / paths are
+    passed through for faster-whisper to resolve.
+    """
+    repo_id = MODELS_CT2.get(model_name)
+    if repo_id is None or Path(model_name).is_dir():
+        return model_name
+    local_dir = _ct2_model_dir(model_name)
+    if (local_dir / "model.bin").exists() and not any(local_dir.glob("*.part")):
+        return str(local_dir)
     try:
-        from faster_whisper import WhisperModel
-    except ImportError as e:
-        if status_cb: status_cb("error", T("load_error"))
-        state.log(f"❌ faster-whisper not installed: {e}")
-        return
+        from faster_whisper.utils import download_model
+        return download_model(model_name, local_files_only=True,
+                              cache_dir=str(get_models_dir()))
+    except Exception:
+        pass   # not cached yet
+    if status_cb: status_cb("loading", f"Downloading '{model_name}'...")
+    state.log(f"⬇️  Downloading model: {repo_id}")
+    downloader.manager.fetch_repo(
+        repo_id, local_dir, allow=_CT2_ALLOW,
+        progress_cb=downloader.status_progress(status_cb, f"'{model_name}'")
+                    if status_cb else None)
+    state.log(f"✅ Model saved to {local_dir}")
+    return str(local_dir)
+
+def _resolve_model(model_name: str, status_cb=None) -> str:
+    """Model path for WhisperModel; falls back to the name (faster-whisper
+    downloads it itself) if the download manager fails."""
+    try:
+        return _ct2_model_path(model_name, status_cb)
+    except Exception as e:
+        state.log(f"⚠️  Download manager failed ({e}) – using faster-whisper download")
+        return model_name
+
+def prefetch_model(model_name: str, device: str):
+    """Download *model_name* for *device* in the background (no load)."""
+    if not model_name or model_name not in MODELS_CT2:
+        return None
+    if device in OV_DEVICES:
+        ov_device = OV_DEVICES[device]
+        return downloader.prefetch(f"{model_name} (OV {ov_device})",
+                                   lambda: _download_ov_model(model_name, ov_device=ov_device))
+    return downloader.prefetch(model_name, lambda: _ct2_model_path(model_name))
+
+def _ov_properties(device: str) -> dict:
+    """OpenVINO plugin properties; the CPU plugin gets the tuned thread count."""
+    if device.upper() != "CPU":
+        return {}   # NPU / GPU plugins schedule their own work
+    threads, _ = resolve_threads(state.cfg, "cpu")
+    return {"INFERENCE_NUM_THREADS": threads}
 
+def _ov_engine(model_dir, device: str, model_name: str = None):
+    """OpenVINO engine with a persistent compiled-blob cache (see ptt.ov_cache)."""
+    from ptt import ov_cache
+    props = _ov_properties(device)
+    name  = model_name or Path(model_dir).name.removesuffix("-ov")
     try:
-        state.whisper_model = WhisperModel(
-            state.cfg["model"], device=d, compute_type=c,
-            download_root=str(get_models_dir()),
-        )
+        cache_dir, hit = ov_cache.prepare(name, device, model_dir, props)
+        props["CACHE_DIR"] = str(cache_dir)
+    except OSError as e:
+        state.log(f"⚠️  OV cache unavailable: {e}")
+        hit = False
+    if hit:
+        state.log(f"⚡ {device}: using cached compiled model")
+    else:
+        state.log(f"ℹ️  Compiling for {device} – first run may take ~1 min...")
+    eng = engines.create("openvino").load(model_dir, device, model_name=name, **props)
+    state.log(f"⏱️  {device} pipeline ready in {eng.stats.load_s:.1f}s"
+              f" ({'cache hit' if hit else 'compiled + cached'})")
+    return eng
+
+def create_engine(kind: str, model_name: str, device: str, compute_type: str = "int8",
+                  status_cb=None, threads: int = None, process: bool = None, **options):
+    """Download (if needed) and load *model_name* with engine *kind* – not published.
+
+    *device* is the app device ("cpu", "cuda", "npu", "ov_cpu"); *threads*
+    overrides the tuned CPU thread count (benchmark).  With *process*
+    (default: cfg["inference_process"]) the engine runs in a worker process
+    (``ptt.engines.process``).  Extra *options* go to ``Engine.load``.
+    """
+    if process is None:
+        process = state.cfg.get("inference_process", False) and threads is None
+    if process:
+        from ptt.engines.process import ProcessEngine
+        return ProcessEngine(kind).load(model_name, device, model_name=model_name,
+                                        compute_type=compute_type, status_cb=status_cb)
+    if kind == "openvino":
+        ov_dev    = OV_DEVICES.get(device, "CPU")
+        model_dir = _download_ov_model(model_name, status_cb, ov_dev)
+        if status_cb: status_cb("loading", f"Preparing {ov_dev} model...")
+        if threads is None:
+            return _ov_engine(model_dir, ov_dev, model_name)
+        return engines.create("openvino").load(
+            model_dir, ov_dev, model_name=model_name,
+            **({"INFERENCE_NUM_THREADS": threads} if ov_dev == "CPU" else {}), **options)
+    if kind == "ct2":
+        cpu_threads, workers = resolve_threads(state.cfg, device)
+        if threads is not None:
+            cpu_threads, workers = threads, 1
+        return engines.create("ct2").load(
+            _resolve_model(model_name, status_cb), device, model_name=model_name,
+            compute_type=compute_type, cpu_threads=cpu_threads, num_workers=workers,
+            download_root=str(get_models_dir()), **options)
+    return engines.create(kind).load(model_name, device, model_name=model_name, **options)
+
+def _warmup(eng):
+    """First decode allocates buffers – do it before the engine serves."""
+    try:
+        state.log(f"🔥 Warm-up: {eng.warmup():.2f}s")
+    except Exception as e:
+        state.log(f"⚠️  Warm-up failed: {e}")
+
+def _prefetch_next(device: str):
+    """Start downloading the configured ``prefetch_model`` while this one serves."""
+    nxt = state.cfg.get("prefetch_model", "")
+    # not while a progressive-start starter serves: the target is still downloading
+    if nxt and nxt != state.cfg["model"] and state.model_name == state.cfg["model"]:
+        prefetch_model(nxt, device)
+
+# ─── Model loading ─────────────────────────────────────────────────────────────
+
+def _engine_kind(device: str, engine: str = None) -> str:
+    kind = engine or state.cfg.get("engine", "auto")
+    return engines.for_device(device) if kind == "auto" else kind
+
+def fetch_model(model_name: str = None, device: str = None, status_cb=None) -> str:
+    """Resolve device and engine for *model_name* (default: cfg["model"]) and
+    download its weights if needed – nothing is loaded.  A following
+    ``load_model()`` with the same arguments finds the files in place.
+    Returns the engine name.
+    """
+    name = model_name or state.cfg["model"]
+    d, _ = resolve_device(device or state.cfg["device"], state.cfg["compute_type"])
+    kind = _engine_kind(d)
+    if kind == "openvino":
+        _download_ov_model(name, status_cb, OV_DEVICES.get(d, "CPU"))
+    elif kind == "ct2":
+        _resolve_model(name, status_cb)
+    return kind
+
+def _publish(engine=None, name=None, device=None):
+    """Swap the serving engine in one step; the previous one is released."""
+    with state.model_swap_lock:
+        state.engine                         = engine
+        state.model_name, state.model_device = name, device
+
+def active_model():
+    """Consistent snapshot ``(engine, name, device)`` of the serving model."""
+    with state.model_swap_lock:
+        return state.engine, state.model_name, state.model_device
+
+def load_model(status_cb=None, model_name=None, keep_current=False,
+               device=None, compute_type=None, engine=None) -> bool:
+    """Load *model_name* (default: cfg["model"]) and make it the serving model.
+
+    With *keep_current* the previous model keeps serving until the new one is
+    ready and is then swapped out atomically.  *engine* (default: cfg["engine"])
+    overrides the engine picked for the device (``ptt.engines.for_device``).  Returns True on success.
+    """
+    name = model_name or state.cfg["model"]
+    if not keep_current:
+        _publish()
+    if status_cb: status_cb("loading", f"Loading '{name}'...")
+    d, c = resolve_device(device or state.cfg["device"],
+                          compute_type or state.cfg["compute_type"])
+    kind = _engine_kind(d, engine)
+
+    if kind == "openvino":
+        lbl = "NPU" if d == "npu" else "CPU (OpenVINO)"
+        log = f"ℹ️  Device: {lbl} | Model: {name}"
+    else:
+        lbl = {"cuda": "CUDA (NVIDIA)", "cpu": "CPU"}.get(d, d)
+        threads, workers = resolve_threads(state.cfg, d)
+        log = (f"ℹ️  Device: {lbl} | Compute: {c} | Model: {name}"
+               f" | Threads: {threads}×{workers}")
+    if state.cfg.get("inference_process", False):
+        log += " | worker process"
+    if kind not in ("ct2", "openvino"):
+        lbl = f"{lbl}, {engines.get(kind).label}"
+    state.log(log)
+
+    try:
+        t0  = time.perf_counter()
+        eng = create_engine(kind, name, d, c, status_cb)
+        _warmup(eng)
+        metrics.MODEL_LOAD.labels(kind).observe(time.perf_counter() - t0)
+        _publish(eng, name=name, device=d)
         if status_cb: status_cb("ready", f"{T('ready')}  [{lbl}]")
-        state.log(f"✅ Model loaded on {lbl}")
+        state.log(f"✅ Model loaded on {lbl}" + (" (OpenVINO)" if kind == "openvino" else ""))
+        _prefetch_next(d)
+        return True
     except Exception as e:
-        state.log(f"⚠️  {lbl} failed: {e}")
-        try:
-            state.whisper_model = WhisperModel(
-                state.cfg["model"], device="cpu", compute_type="int8",
-                download_root=str(get_models_dir()),
-            )
-            if status_cb: status_cb("ready", f"{T('ready')}  [CPU Fallback]")
-            state.log("✅ CPU fallback active")
-        except Exception as e2:
+        if kind == "ct2" and isinstance(e, ImportError):
             if status_cb: status_cb("error", T("load_error"))
-            state.log(f"❌ Error: {e2}")
+            state.log(f"❌ faster-whisper not installed: {e}")
+            return False
+        state.log(f"⚠️  {lbl} failed: {e}")
+        if kind == "openvino":
+            state.log("↩️  Falling back to CPU...")
+
+    try:
+        t0  = time.perf_counter()
+        eng = create_engine("ct2", name, "cpu", "int8", status_cb)
+        _warmup(eng)
+        metrics.MODEL_LOAD.labels("ct2").observe(time.perf_counter() - t0)
+        _publish(eng, name=name, device="cpu")
+        if status_cb: status_cb("ready", f"{T('ready')}  [CPU Fallback]")
+        state.log("✅ CPU fallback active")
+        _prefetch_next("cpu")
+        return True
+    except Exception as e2:
+        if status_cb: status_cb("error", T("load_error"))
+        state.log(f"❌ Error: {e2}")
+        return False
+
+def progressive_starter():
+    """The model progressive start serves first (always on CPU), or None."""
+    target  = state.cfg["model"]
+    starter = state.cfg.get("progressive_model", "tiny")
+    if (not state.cfg.get("progressive_start", False) or target not in MODELS
+            or starter not in MODELS or MODELS.index(starter) >= MODELS.index(target)):
+        return None
+    return starter
+
+def load_model_progressive(status_cb=None) -> bool:
+    """Progressive start: serve with a small model within seconds, load the
+    configured one in the background and swap it in when ready.
+
+    Falls back to a plain ``load_model()`` when progressive start is off or
+    the starter model is not smaller than the configured one.
+    """
+    target  = state.cfg["model"]
+    starter = progressive_starter()
+    if starter is None:
+        return load_model(status_cb)
+
+    state.log(f"⚡ Progressive start: '{starter}' serves while '{target}' loads")
+    # Starter on CPU/int8: loads in ~1 s and doesn't compete for GPU/NPU init
+    if not load_model(status_cb, model_name=starter, device="cpu", compute_type="int8"):
+        return load_model(status_cb)
+
+    def _bg_status(s, m):
+        # The starter is serving: keep the status row for recording, show the
+        # background load on the model label instead
+        if s == "loading":
+            state.ui_queue.put(("model_loading", target))
+        elif status_cb:
+            status_cb(s, m)
+    t0 = time.time()
+    if load_model(_bg_status, keep_current=True):
+        state.log(f"🔀 Switched to '{target}' after {time.time() - t0:.1f}s")
+        return True
+    state.log(f"⚠️  '{target}' failed to load – '{starter}' keeps serving")
+    if status_cb: status_cb("ready", f"{T('ready')}  [{starter}]")
+    return True
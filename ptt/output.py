@@ -0,0 +1,507 @@
+"""
+ptt/output.py – Text output sinks for "direct typing" mode.
+
+A sink turns a transcript into keystrokes.  Text is sent in bulk chunks (one
+SendInput call / one tool invocation per chunk) instead of one call per
+character with a fixed delay, and every sink reports the achieved throughput
+in characters per second.
+
+    Windows  → Win32UnicodeSink  (SendInput + KEYEVENTF_UNICODE, any character)
+    X11      → PynputSink        (pynput keyboard controller, Unicode keysyms)
+    Wayland  → YdotoolSink       (persistent ydotoold socket, no fork per paste)
+               / WtypeSink
+    headless → CaptureSink       (records text; used for tests / benchmarks)
+
+On Wayland the external tools are probed once (``probe_tools()``) and cached;
+keystrokes go straight to the ydotoold socket, and wl-copy is launched without
+blocking the caller.
+"""
+
+import os
+import shutil
+import socket
+import stat
+import struct
+import subprocess
+import sys
+import threading
+import time
+import unicodedata
+
+import ptt.state as state
+
+# ─── Chunking ──────────────────────────────────────────────────────────────────
+
+def _chunks(text: str, size: int):
+    """Split *text* into chunks of ~*size* code points.
+
+    A chunk never ends in front of a combining mark, so a base character and
+    its accents (e.g. 'e' + U+0301) are always delivered together.
+    """
+    i, n = 0, len(text)
+    while i < n:
+        j = min(i + size, n)
+        while j < n and unicodedata.combining(text[j]):
+            j += 1
+        yield text[i:j]
+        i = j
+
+# ─── Sink base ─────────────────────────────────────────────────────────────────
+
+class OutputSink:
+    """Base class: subclasses implement ``_send(chunk)``."""
+
+    name        = "base"
+    chunk_chars = 128
+
+    def __init__(self):
+        self.last_cps   = 0.0
+        self.last_chars = 0
+
+    def available(self) -> bool:
+        return True
+
+    def type_text(self, text: str) -> float:
+        """Type *text* into the focused window; returns chars per second."""
+        text = text.replace("\r\n", "\n")
+        t0   = time.perf_counter()
+        for chunk in _chunks(text, self.chunk_chars):
+            self._send(chunk)
+        dt = time.perf_counter() - t0
+        self.last_chars = len(text)
+        self.last_cps   = len(text) / dt if dt > 0 else float("inf")
+        return self.last_cps
+
+    def _send(self, chunk: str):
+        raise NotImplementedError
+
+# ─── Windows: SendInput with KEYEVENTF_UNICODE ─────────────────────────────────
+
+class Win32UnicodeSink(OutputSink):
+    """One SendInput call per chunk; UTF-16 units are injected as VK_PACKET."""
+
+    name        = "win32"
+    chunk_chars = 128
+
+    def __init__(self):
+        super().__init__()
+        import ctypes
+        from ctypes import wintypes
+
+        class MOUSEINPUT(ctypes.Structure):
+            _fields_ = [("dx", wintypes.LONG), ("dy", wintypes.LONG),
+                        ("mouseData", wintypes.DWORD), ("dwFlags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+        class KEYBDINPUT(ctypes.Structure):
+            _fields_ = [("wVk", wintypes.WORD), ("wScan", wintypes.WORD),
+                        ("dwFlags", wintypes.DWORD), ("time", wintypes.DWORD),
+                        ("dwExtraInfo", ctypes.c_size_t)]
+
+        class _U(ctypes.Union):
+            _fields_ = [("mi", MOUSEINPUT), ("ki", KEYBDINPUT)]
+
+        class INPUT(ctypes.Structure):
+            _fields_ = [("type", wintypes.DWORD), ("u", _U)]
+
+        self._ct    = ctypes
+        self._INPUT = INPUT
+        self._user32 = ctypes.WinDLL("user32", use_last_error=True)
+
+    def available(self) -> bool:
+        return sys.platform == "win32"
+
+    def _send(self, chunk: str):
+        INPUT_KEYBOARD, KEYEVENTF_KEYUP, KEYEVENTF_UNICODE, VK_RETURN = 1, 0x2, 0x4, 0x0D
+        events = []
+        for ch in chunk:
+            if ch == "\n":
+                events += [(VK_RETURN, 0, 0), (VK_RETURN, 0, KEYEVENTF_KEYUP)]
+                continue
+            data = ch.encode("utf-16-le")
+            for k in range(0, len(data), 2):   # surrogate pairs → two units
+                unit = data[k] | (data[k + 1] << 8)
+                events += [(0, unit, KEYEVENTF_UNICODE),
+                           (0, unit, KEYEVENTF_UNICODE | KEYEVENTF_KEYUP)]
+        arr = (self._INPUT * len(events))()
+        for inp, (vk, scan, flags) in zip(arr, events):
+            inp.type = INPUT_KEYBOARD
+            inp.u.ki.wVk, inp.u.ki.wScan, inp.u.ki.dwFlags = vk, scan, flags
+        sent = self._user32.SendInput(len(events), arr, self._ct.sizeof(self._INPUT))
+        if sent != len(events):
+            raise OSError(self._ct.get_last_error(), "SendInput was blocked")
+
+# ─── X11: pynput controller ────────────────────────────────────────────────────
+
+class PynputSink(OutputSink):
+    name = "pynput"
+
+    def __init__(self):
+        super().__init__()
+        from pynput.keyboard import Controller
+        self._kb = Controller()
+
+    def _send(self, chunk: str):
+        self._kb.type(chunk)
+
+# ─── Wayland: tool probe ───────────────────────────────────────────────────────
+
+_tools = None   # cached result of probe_tools()
+
+def _ydotool_socket_path():
+    """Locate the ydotoold socket ($YDOTOOL_SOCKET, per-user runtime dir, /tmp)."""
+    uid = getattr(os, "getuid", lambda: None)()
+    for path in (os.environ.get("YDOTOOL_SOCKET"),
+                 f"/run/user/{uid}/.ydotool_socket" if uid is not None else None,
+                 "/tmp/.ydotool_socket"):
+        try:
+            if path and stat.S_ISSOCK(os.stat(path).st_mode):
+                return path
+        except OSError:
+            pass
+    return None
+
+def probe_tools(refresh: bool = False) -> dict:
+    """Find wl-copy / ydotool / wtype and the ydotoold socket once; cached."""
+    global _tools
+    if _tools is None or refresh:
+        _tools = {name: shutil.which(name) for name in ("wl-copy", "ydotool", "wtype")}
+        _tools["ydotoold"] = _ydotool_socket_path()
+    return _tools
+
+def log_tools():
+    t = probe_tools()
+    state.log("🧰 Wayland output: " + "  ".join(
+        f"{name} {'✔' if t[name] else '✘'}"
+        for name in ("ydotoold", "wl-copy", "wtype", "ydotool")))
+
+# ─── Wayland: ydotoold socket client ───────────────────────────────────────────
+
+# Linux input event codes (kernel ABI, linux/input-event-codes.h)
+_EV_SYN, _EV_KEY, _SYN_REPORT = 0, 1, 0
+_KEY_LEFTCTRL, _KEY_LEFTSHIFT, _KEY_V = 29, 42, 47
+
+def _us_keymap() -> dict:
+    """char → (keycode, shift) for a US layout – what `ydotool type` uses too."""
+    m = {}
+    rows = [("1234567890-=", 2), ("qwertyuiop[]", 16), ("asdfghjkl;'`", 30),
+            ("\\zxcvbnm,./", 43)]
+    shifted = [("!@#$%^&*()_+", 2), ("QWERTYUIOP{}", 16), ('ASDFGHJKL:"~', 30),
+               ("|ZXCVBNM<>?", 43)]
+    for chars, first in rows:
+        for i, ch in enumerate(chars): m[ch] = (first + i, False)
+    for chars, first in shifted:
+        for i, ch in enumerate(chars): m[ch] = (first + i, True)
+    m.update({" ": (57, False), "\n": (28, False), "\t": (15, False)})
+    return m
+
+_KEYMAP = _us_keymap()
+
+
+class YdotoolClient:
+    """Long-lived datagram connection to ydotoold.
+
+    ydotoold (ydotool ≥ 1.0) accepts one raw ``struct input_event`` per
+    datagram and replays it on its uinput device, so no process is spawned.
+    """
+
+    _EVENT = struct.Struct("llHHi")   # timeval (zeroed), type, code, value
+
+    def __init__(self, path: str):
+        self.path  = path
+        self._lock = threading.Lock()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self._sock.connect(path)
+
+    def close(self):
+        try: self._sock.close()
+        except OSError: pass
+
+    def _key(self, code: int, down: bool):
+        pack = self._EVENT.pack
+        self._sock.send(pack(0, 0, _EV_KEY, code, 1 if down else 0))
+        self._sock.send(pack(0, 0, _EV_SYN, _SYN_REPORT, 0))
+
+    def combo(self, *codes):
+        """Press *codes* in order, release in reverse (e.g. Ctrl, V)."""
+        with self._lock:
+            for c in codes: self._key(c, True)
+            for c in reversed(codes): self._key(c, False)
+
+    def can_type(self, text: str) -> bool:
+        return all(ch in _KEYMAP for ch in text)
+
+    def type(self, text: str):
+        with self._lock:
+            for ch in text:
+                code, shift = _KEYMAP[ch]
+                if shift: self._key(_KEY_LEFTSHIFT, True)
+                self._key(code, True); self._key(code, False)
+                if shift: self._key(_KEY_LEFTSHIFT, False)
+
+
+_ydo        = None   # cached YdotoolClient
+_ydo_failed = False
+
+def ydotool_client():
+    """Return the shared YdotoolClient, or None if ydotoold is not reachable."""
+    global _ydo, _ydo_failed
+    if _ydo is None and not _ydo_failed:
+        path = probe_tools()["ydotoold"]
+        try:
+            _ydo = YdotoolClient(path) if path else None
+        except OSError as e:
+            state.log(f"⚠️  ydotoold socket unusable ({e}) – falling back to tools")
+        _ydo_failed = _ydo is None
+    return _ydo
+
+def _drop_ydotool_client():
+    global _ydo, _ydo_failed
+    if _ydo is not None:
+        _ydo.close()
+    _ydo, _ydo_failed = None, True
+
+def send_paste_keystroke() -> bool:
+    """Simulate Ctrl+V on Wayland: ydotoold socket, else ydotool / wtype binaries."""
+    tools  = probe_tools()
+    client = ydotool_client()
+    if client is not None:
+        try:
+            client.combo(_KEY_LEFTCTRL, _KEY_V)
+            return True
+        except OSError as e:
+            state.log(f"⚠️  ydotoold socket failed: {e}")
+            _drop_ydotool_client()
+    # ydotool works on GNOME Wayland via /dev/uinput (no special protocol needed)
+    if tools["ydotool"]:
+        try:
+            subprocess.run([tools["ydotool"], "key", "ctrl+v"], timeout=5, check=True)
+            return True
+        except Exception as e:
+            state.log(f"⚠️  ydotool failed: {e}")
+    # wtype works on KDE/wlroots compositors
+    if tools["wtype"]:
+        try:
+            subprocess.run([tools["wtype"], "-M", "ctrl", "-k", "v", "-m", "ctrl"],
+                           timeout=3, check=True)
+            return True
+        except Exception as e:
+            state.log(f"⚠️  wtype failed: {e}")
+    if not (tools["ydotool"] or tools["wtype"]):
+        state.log("⚠️  Auto-paste: install ydotool (sudo apt install ydotool)")
+    return False
+
+# ─── Wayland: clipboard ────────────────────────────────────────────────────────
+
+class WlCopy:
+    """wl-copy started without waiting; ``wait()`` confirms clipboard ownership.
+
+    wl-copy's foreground process exits once the selection is set and its
+    forked child keeps serving it, so the exit status is the readiness signal.
+    """
+
+    def __init__(self, text: str):
+        self._proc = subprocess.Popen(
+            [probe_tools()["wl-copy"], "--"], stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        try:
+            self._proc.stdin.write(text.encode())
+        finally:
+            self._proc.stdin.close()
+
+    def wait(self, timeout: float = 3) -> bool:
+        try:
+            return self._proc.wait(timeout) == 0
+        except subprocess.TimeoutExpired:
+            return False
+
+def wl_copy(text: str):
+    """Start copying *text* to the Wayland clipboard; None if wl-copy is missing."""
+    if not probe_tools()["wl-copy"]:
+        return None
+    return WlCopy(text)
+
+# ─── Tk clipboard (X11 / Windows / macOS) ──────────────────────────────────────
+
+def tk_copy(root, text: str) -> bool:
+    """Put *text* on the clipboard through Tk; True once Tk owns CLIPBOARD
+    and serves exactly this text.
+
+    On X11 Tk serves UTF8_STRING itself and pyperclip is not used: its
+    xclip / xsel backend would take the selection away from Tk.  Elsewhere
+    the clipboard is system-wide and pyperclip is a best-effort second copy.
+    """
+    root.clipboard_clear()
+    root.clipboard_append(text)
+    try:
+        owner = root.tk.call("selection", "own", "-selection", "CLIPBOARD")
+        owned = bool(owner) and root.clipboard_get() == text
+    except Exception:   # TclError
+        owned = False
+    if root.tk.call("tk", "windowingsystem") != "x11":
+        try:
+            import pyperclip
+            pyperclip.copy(text)
+        except Exception:
+            pass
+    return owned
+
+# ─── Wayland: typing sinks ─────────────────────────────────────────────────────
+
+class YdotoolSink(OutputSink):
+    """Types through the ydotoold socket; text the US keymap cannot express
+    goes to wtype (full Unicode) or, last resort, one `ydotool type` spawn."""
+
+    name        = "ydotool"
+    chunk_chars = 256
+
+    def available(self) -> bool:
+        t = probe_tools()
+        return bool(t["ydotoold"] or t["ydotool"])
+
+    def _send(self, chunk: str):
+        client = ydotool_client()
+        if client is not None and client.can_type(chunk):
+            try:
+                client.type(chunk)
+                return
+            except OSError as e:
+                state.log(f"⚠️  ydotoold socket failed: {e}")
+                _drop_ydotool_client()
+        tools = probe_tools()
+        if tools["wtype"]:
+            subprocess.run([tools["wtype"], "--", chunk], timeout=30, check=True)
+        elif tools["ydotool"]:
+            subprocess.run([tools["ydotool"], "type", "--key-delay", "0", "--", chunk],
+                           timeout=30, check=True)
+        else:
+            raise FileNotFoundError("ydotool")
+
+
+class WtypeSink(OutputSink):
+    """wtype via the virtual-keyboard protocol (KDE / wlroots); full Unicode."""
+
+    name        = "wtype"
+    chunk_chars = 4096
+
+    def available(self) -> bool:
+        return probe_tools()["wtype"] is not None
+
+    def _send(self, chunk: str):
+        path = probe_tools()["wtype"]
+        if not path:
+            raise FileNotFoundError("wtype")
+        subprocess.run([path, "--", chunk], timeout=30, check=True)
+
+# ─── Stand-in (headless) ───────────────────────────────────────────────────────
+
+class CaptureSink(OutputSink):
+    """Records typed text instead of injecting it.
+
+    *per_chunk_s* / *per_char_s* emulate backend latency so throughput can be
+    benchmarked without a display.  ``sent_at`` holds the ``perf_counter()``
+    time of every chunk; ``wait(n)`` blocks until *n* chunks arrived.
+    """
+
+    name = "capture"
+
+    def __init__(self, per_chunk_s: float = 0.0, per_char_s: float = 0.0,
+                 chunk_chars: int = 128):
+        super().__init__()
+        self.per_chunk_s = per_chunk_s
+        self.per_char_s  = per_char_s
+        self.chunk_chars = chunk_chars
+        self.chunks      = []
+        self.sent_at     = []
+        self._cond       = threading.Condition()
+
+    @property
+    def text(self) -> str:
+        return "".join(self.chunks)
+
+    def _send(self, chunk: str):
+        delay = self.per_chunk_s + self.per_char_s * len(chunk)
+        if delay:
+            time.sleep(delay)
+        with self._cond:
+            self.chunks.append(chunk)
+            self.sent_at.append(time.perf_counter())
+            self._cond.notify_all()
+
+    def wait(self, n: int, timeout: float = None) -> bool:
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self.chunks) >= n, timeout)
+
+# ─── Paste timing ──────────────────────────────────────────────────────────────
+
+class PasteTimer:
+    """Per-step durations of one paste, logged on a single line."""
+
+    def __init__(self, t0: float = None):
+        self._t0   = time.perf_counter() if t0 is None else t0
+        self._last = self._t0
+        self.steps = []
+
+    def step(self, name: str):
+        now = time.perf_counter()
+        self.steps.append((name, (now - self._last) * 1000))
+        self._last = now
+
+    def log(self):
+        parts = " | ".join(f"{n} {ms:.0f} ms" for n, ms in self.steps)
+        total = (self._last - self._t0) * 1000
+        state.log(f"⏱️  Paste: {parts} | total {total:.0f} ms")
+
+# ─── Selection ─────────────────────────────────────────────────────────────────
+
+SINKS = {
+    "win32":   Win32UnicodeSink,
+    "pynput":  PynputSink,
+    "ydotool": YdotoolSink,
+    "wtype":   WtypeSink,
+    "capture": CaptureSink,
+}
+
+_sink = None   # cached OutputSink instance
+
+def is_wayland() -> bool:
+    return os.environ.get("XDG_SESSION_TYPE", "").lower() == "wayland"
+
+def _auto_sink_name() -> str:
+    if sys.platform == "win32":
+        return "win32"
+    if is_wayland():
+        for name in ("ydotool", "wtype"):
+            if SINKS[name]().available():
+                return name
+        return "ydotool"
+    return "pynput"
+
+def get_sink() -> OutputSink:
+    """Return the typing sink for this session (``cfg['type_backend']`` or auto)."""
+    global _sink
+    if _sink is None:
+        name = state.cfg.get("type_backend", "auto")
+        if name not in SINKS:
+            name = _auto_sink_name()
+        _sink = SINKS[name]()
+    return _sink
+
+def set_sink(sink):
+    """Override the active sink (e.g. a CaptureSink for headless runs); None = auto."""
+    global _sink
+    _sink = sink
+
+def type_text(text: str) -> bool:
+    """Type *text* with the active sink and log throughput. Returns success."""
+    sink = get_sink()
+    try:
+        cps = sink.type_text(text)
+    except FileNotFoundError:
+        state.log(f"⚠️  {sink.name} not found – install: sudo apt install {sink.name}")
+        return False
+    except Exception as e:
+        state.log(f"⚠️  {sink.name} type failed: {e}")
+        return False
+    state.log(f"⌨️  Typed {sink.last_chars} chars via {sink.name} ({cps:.0f} chars/s)")
+    return True
@@ -0,0 +1,141 @@
+"""
+ptt/ov_cache.py – Persistent OpenVINO compiled-model cache.
+
+``WhisperPipeline`` compiles its encoder/decoder for the target device on
+every launch (~1 min on NPU).  With OpenVINO's ``CACHE_DIR`` property the
+compiled blobs are written once and imported on later launches.  This module
+owns those directories under ``<models_dir>/ov_cache/``:
+
+* one directory per (model, device, OpenVINO version, pipeline properties,
+  model file fingerprint) – anything that changes the compiled result gives
+  a new key, and stale directories for the same model/device are removed
+* ``manifest.json`` per directory records the key and the last use
+* total size is capped (``ov_cache_max_mb``); least recently used
+  directories are evicted first
+"""
+
+import hashlib
+import json
+import shutil
+import time
+from pathlib import Path
+
+import ptt.state as state
+from ptt.config import get_models_dir
+
+MANIFEST     = "manifest.json"
+DEFAULT_MB   = 4096
+
+
+def cache_root() -> Path:
+    return get_models_dir() / "ov_cache"
+
+
+def ov_version() -> str:
+    try:
+        import openvino
+        return openvino.get_version()
+    except Exception:
+        return "unknown"
+
+
+def _fingerprint(model_dir: Path) -> list:
+    """Name, size and mtime of the IR files – a re-downloaded model recompiles."""
+    out = []
+    for p in sorted(Path(model_dir).glob("*")):
+        if p.suffix in (".xml", ".bin") and p.is_file():
+            st = p.stat()
+            out.append([p.name, st.st_size, st.st_mtime_ns])
+    return out
+
+
+def cache_key(model: str, device: str, model_dir, props: dict, version: str = None) -> dict:
+    return {
+        "model":   model,
+        "device":  device.upper(),
+        "version": version or ov_version(),
+        "props":   {k: str(v) for k, v in sorted(props.items()) if k != "CACHE_DIR"},
+        "files":   _fingerprint(model_dir),
+    }
+
+
+def _digest(key: dict) -> str:
+    return hashlib.sha1(json.dumps(key, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def _read_manifest(d: Path) -> dict:
+    try:
+        return json.loads((d / MANIFEST).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_manifest(d: Path, key: dict):
+    tmp = d / (MANIFEST + ".tmp")
+    tmp.write_text(json.dumps({"key": key, "last_used": time.time()}, indent=1),
+                   encoding="utf-8")
+    tmp.replace(d / MANIFEST)
+
+
+def dir_size(d: Path) -> int:
+    return sum(p.stat().st_size for p in d.rglob("*") if p.is_file())
+
+
+def has_blobs(d: Path) -> bool:
+    """True if OpenVINO already wrote compiled blobs into *d*."""
+    return any(p.is_file() and p.name != MANIFEST and not p.name.endswith(".tmp")
+               for p in d.iterdir()) if d.is_dir() else False
+
+
+def prepare(model: str, device: str, model_dir, props: dict,
+            root: Path = None, max_mb: int = None, version: str = None) -> tuple:
+    """Cache directory for this pipeline → ``(path, hit)``.
+
+    Removes stale directories of the same model/device, touches the manifest
+    and evicts least recently used directories above the size limit.
+    """
+    root   = Path(root or cache_root())
+    key    = cache_key(model, device, model_dir, props, version)
+    prefix = f"{model}-{device.lower()}-"
+    d      = root / (prefix + _digest(key))
+    root.mkdir(parents=True, exist_ok=True)
+
+    for old in root.glob(prefix + "*"):
+        if old != d and old.is_dir():
+            state.log(f"🗑️  OV cache: dropping stale {old.name}")
+            shutil.rmtree(old, ignore_errors=True)
+
+    hit = has_blobs(d) and _read_manifest(d).get("key") == key
+    if not hit and d.exists():
+        shutil.rmtree(d, ignore_errors=True)   # partial / foreign content
+    d.mkdir(exist_ok=True)
+    _write_manifest(d, key)
+
+    if max_mb is None:
+        max_mb = state.cfg.get("ov_cache_max_mb", DEFAULT_MB)
+    evict(root, max_mb * 1024 * 1024, keep=d)
+    return d, hit
+
+
+def evict(root: Path, max_bytes: int, keep: Path = None) -> list:
+    """Delete least recently used cache dirs until the total fits *max_bytes*."""
+    dirs  = [d for d in Path(root).iterdir() if d.is_dir()]
+    sizes = {d: dir_size(d) for d in dirs}
+    total = sum(sizes.values())
+    removed = []
+    for d in sorted(dirs, key=lambda d: _read_manifest(d).get("last_used", 0)):
+        if total <= max_bytes:
+            break
+        if d == keep:
+            continue
+        shutil.rmtree(d, ignore_errors=True)
+        total -= sizes[d]
+        removed.append(d.name)
+    if removed:
+        state.log(f"🗑️  OV cache: evicted {', '.join(removed)}")
+    return removed
+
+
+def clear(root: Path = None):
+    """Remove every compiled blob (manual invalidation)."""
+    shutil.rmtree(Path(root or cache_root()), ignore_errors=True)
@@ -0,0 +1,233 @@
+"""
+ptt/profiler.py – Sampling profiler and allocation tracing for "it got slow" reports.
+
+Off by default and free when off: nothing is sampled or wrapped until
+``start()`` – from the ⏱ button in the overlay's log panel or with
+``PTT_PROFILE`` set in the environment (``1``/``all``, ``sample``, ``alloc``).
+
+* sampler – a thread snapshots the stack of every Python thread (Tk, audio
+  callback, hotkey listener, transcription, …) every ``INTERVAL_S`` and
+  counts them as folded stacks, ``thread;outer;…;inner count`` – the input
+  format of flamegraph.pl, speedscope and inferno
+* allocations – ``transcribe_and_paste`` and ``load_model`` are wrapped with
+  tracemalloc snapshots while profiling; every call logs its peak and
+  retained memory and the top allocation sites.  The wrappers are installed
+  on ``start()`` and removed again on ``stop()``.
+
+``stop()`` writes ``profiles/ptt-<timestamp>.folded`` (and ``.alloc.txt``)
+next to settings.json.  It waits up to ``STOP_WAIT_S`` for wrapped calls
+still running, so their report lines are included.
+"""
+
+import collections
+import functools
+import importlib
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import ptt.state as state
+from ptt.constants import BASE_DIR
+
+INTERVAL_S   = 0.005   # 200 samples/s
+TRACE_FRAMES = 8       # tracemalloc traceback depth
+TOP_N        = 5       # allocation sites per report
+PROFILE_DIR  = BASE_DIR / "profiles"
+STOP_WAIT_S  = 10.0    # stop() waits this long for wrapped calls in flight
+
+# (module, function) wrapped with allocation tracing while profiling
+ALLOC_TARGETS = [("ptt.transcribe", "transcribe_and_paste"),
+                 ("ptt.model_manager", "load_model")]
+
+
+# ─── Sampler ───────────────────────────────────────────────────────────────────
+
+class Sampler:
+    """Collects folded stacks of all Python threads at a fixed interval."""
+
+    def __init__(self, interval: float = INTERVAL_S):
+        self.interval = interval
+        self.counts   = collections.Counter()
+        self.samples  = 0
+        self._labels  = {}
+        self._stop    = threading.Event()
+        self._thread  = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True, name="profiler")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _label(self, code) -> str:
+        lbl = self._labels.get(code)
+        if lbl is None:
+            lbl = self._labels[code] = (f"{code.co_name} "
+                                        f"({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        return lbl
+
+    def _run(self):
+        me = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == me:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, f"thread-{ident}"))
+                self.counts[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.counts.most_common())
+
+
+# ─── Allocation tracing ────────────────────────────────────────────────────────
+
+def _mb(n: int) -> str:
+    return f"{n / 1048576:.1f} MB"
+
+
+_calls    = threading.Condition()   # _inflight
+_inflight = 0        # wrapped calls running
+
+
+def _traced(label: str, fn, report: list):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        global _inflight
+        with _calls:
+            _inflight += 1
+        try:
+            try:
+                tracemalloc.reset_peak()
+                base   = tracemalloc.get_traced_memory()[0]
+                before = tracemalloc.take_snapshot()
+            except RuntimeError:   # session ended before the call
+                return fn(*args, **kwargs)
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                dt = time.perf_counter() - t0
+                if not tracemalloc.is_tracing():   # stop() gave up waiting
+                    state.log(f"🧠 {label}: tracing stopped before it finished ({dt:.2f}s)")
+                else:
+                    cur, peak = tracemalloc.get_traced_memory()
+                    top = tracemalloc.take_snapshot().compare_to(before, "lineno")[:TOP_N]
+                    state.log(f"🧠 {label}: peak +{_mb(peak - base)}, retained {_mb(cur - base)}"
+                              f" ({dt:.2f}s)")
+                    report.append(f"{time.strftime('%H:%M:%S')} {label}: peak +{_mb(peak - base)}, "
+                                  f"retained {_mb(cur - base)}, {dt:.2f}s")
+                    report.extend(f"    {s}" for s in top)
+        finally:
+            with _calls:
+                _inflight -= 1
+                _calls.notify_all()
+    wrapper._ptt_profiled = fn
+    return wrapper
+
+
+# ─── Session ───────────────────────────────────────────────────────────────────
+
+_lock     = threading.Lock()
+_sampler  = None
+_patched  = []      # (module, name, original)
+_report   = []
+_started  = None
+_own_tracemalloc = False
+
+
+def active() -> bool:
+    return _started is not None
+
+
+def start(sample: bool = True, alloc: bool = True, interval: float = INTERVAL_S) -> bool:
+    """Begin a profiling session; False if one is already running."""
+    global _sampler, _started, _own_tracemalloc
+    with _lock:
+        if _started is not None:
+            return False
+        _started = time.time()
+        _report.clear()
+        if alloc:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACE_FRAMES)
+                _own_tracemalloc = True
+            for mod_name, fn_name in ALLOC_TARGETS:
+                mod = importlib.import_module(mod_name)
+                orig = getattr(mod, fn_name)
+                setattr(mod, fn_name, _traced(fn_name, orig, _report))
+                _patched.append((mod, fn_name, orig))
+        if sample:
+            _sampler = Sampler(interval)
+            _sampler.start()
+    what = " + ".join(w for w, on in (("stack sampling", sample), ("allocations", alloc)) if on)
+    state.log(f"⏱️  Profiling started ({what})")
+    return True
+
+
+def stop(out_dir: Path = None):
+    """End the session and write the results; returns the .folded path (or None)."""
+    global _sampler, _started, _own_tracemalloc
+    with _lock:
+        if _started is None:
+            return None
+        sampler, _sampler = _sampler, None
+        for mod, fn_name, orig in _patched:
+            setattr(mod, fn_name, orig)
+        _patched.clear()
+        with _calls:   # let wrapped calls in flight finish their report
+            if not _calls.wait_for(lambda: _inflight == 0, STOP_WAIT_S):
+                state.log(f"⚠️  {_inflight} traced call(s) still running – not in the report")
+        if _own_tracemalloc:
+            tracemalloc.stop()
+            _own_tracemalloc = False
+        started, _started = _started, None
+        report = list(_report)
+    if sampler is not None:
+        sampler.stop()
+
+    out_dir = Path(out_dir or PROFILE_DIR)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stem = out_dir / time.strftime("ptt-%Y%m%d-%H%M%S", time.localtime(started))
+    path = None
+    if sampler is not None:
+        path = stem.with_suffix(".folded")
+        path.write_text(sampler.folded(), encoding="utf-8")
+        state.log(f"⏱️  Profile: {sampler.samples} samples over {time.time() - started:.0f}s"
+                  f" → {path}")
+    if report:
+        alloc = stem.with_suffix(".alloc.txt")
+        alloc.write_text("\n".join(report) + "\n", encoding="utf-8")
+        state.log(f"🧠 Allocation report → {alloc}")
+        path = path or alloc
+    return path
+
+
+def toggle():
+    """Overlay button: start, or stop and return the written file."""
+    if active():
+        return stop()
+    start()
+    return None
+
+
+def start_from_env() -> bool:
+    """Start a session if ``PTT_PROFILE`` is set; it is written at exit."""
+    mode = os.environ.get("PTT_PROFILE", "").strip().lower()
+    if not mode or mode in ("0", "off", "false"):
+        return False
+    import atexit
+    atexit.register(stop)
+    return start(sample=mode in ("1", "all", "on", "true", "sample"),
+                 alloc=mode in ("1", "all", "on", "true", "alloc"))
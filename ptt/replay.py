@@ -0,0 +1,158 @@
+"""
+ptt/replay.py – Run archived utterances back through the pipeline.
+
+Run:  python -m ptt.replay [captures/] [--engine stub] [--model small]
+                           [--device cpu] [--set beam_size=1 ...]
+                           [--save run.json] [--compare base.json]
+
+Loads the model the way the app does (current settings, overridden by the
+options), recognizes every capture written by ``ptt.capture`` with the
+same code as push-to-talk (``ptt.transcribe.recognize``) and prints decode
+latency and the text next to a baseline: what was recognized when the
+utterance was captured, or the results of an earlier ``--save`` run given
+with ``--compare``.  Changed words are shown as ``[-old-]{+new+}``.
+"""
+
+import argparse
+import difflib
+import json
+import statistics
+import sys
+import time
+
+import ptt.state as state
+from ptt import capture
+from ptt.config import load_settings
+
+
+def word_diff(old: str, new: str) -> str:
+    a, b = old.split(), new.split()
+    out  = []
+    for op, i1, i2, j1, j2 in difflib.SequenceMatcher(a=a, b=b, autojunk=False).get_opcodes():
+        if op == "equal":
+            out.extend(a[i1:i2])
+            continue
+        if i2 > i1:
+            out.append("[-" + " ".join(a[i1:i2]) + "-]")
+        if j2 > j1:
+            out.append("{+" + " ".join(b[j1:j2]) + "+}")
+    return " ".join(out)
+
+
+def word_errors(old: str, new: str) -> tuple:
+    """``(edited words, words in old)`` – the numerator/denominator of a WER."""
+    a, b = old.split(), new.split()
+    edits = sum(max(i2 - i1, j2 - j1) for op, i1, i2, j1, j2
+                in difflib.SequenceMatcher(a=a, b=b, autojunk=False).get_opcodes()
+                if op != "equal")
+    return edits, len(a)
+
+
+def _value(text: str):
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def replay(folder) -> list:
+    """Recognize every capture in *folder* with the serving model."""
+    from ptt.model_manager import active_model
+    from ptt.transcribe import recognize
+    engine = active_model()[0]
+    results = []
+    for cid, record, path in capture.load(folder):
+        audio   = capture.read_audio(path)
+        timings = {}
+        t0 = time.perf_counter()
+        try:
+            text, lang = recognize(engine, audio, timings)
+            error = None
+        except Exception as e:
+            text, lang, error = "", None, f"{type(e).__name__}: {e}"
+        results.append({"id": cid, "audio_s": len(audio) / capture.SAMPLE_RATE,
+                        "text": text, "language": lang, "error": error,
+                        "latency_s": time.perf_counter() - t0,
+                        "timings": timings})
+    return results
+
+
+def main(argv=None):
+    load_settings()
+    ap = argparse.ArgumentParser(prog="python -m ptt.replay", description=__doc__.split("\n\n")[0])
+    ap.add_argument("folder",    nargs="?", default=None, help="capture directory (default: capture_dir)")
+    ap.add_argument("--engine",  help="engine (ct2, openvino, stub, …)")
+    ap.add_argument("--model")
+    ap.add_argument("--device")
+    ap.add_argument("--set",     action="append", default=[], metavar="KEY=VALUE",
+                    help="override a setting, e.g. beam_size=1 or language=null")
+    ap.add_argument("--save",    help="write the results to this JSON file")
+    ap.add_argument("--compare", help="baseline results from an earlier --save")
+    args = ap.parse_args(argv)
+
+    for item in args.set:
+        key, _, value = item.partition("=")
+        state.cfg[key.strip()] = _value(value.strip())
+    for key in ("engine", "model", "device"):
+        if getattr(args, key):
+            state.cfg[key] = getattr(args, key)
+
+    folder = args.folder or capture.capture_dir()
+    if not capture.load(folder):
+        print(f"No captures in {folder}")
+        return 1
+
+    from ptt.model_manager import load_model
+    t0 = time.perf_counter()
+    if not load_model():
+        while not state.ui_queue.empty():
+            msg = state.ui_queue.get_nowait()
+            if msg[0] == "log":
+                print(msg[1])
+        return 1
+    load_s  = time.perf_counter() - t0
+    results = replay(folder)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = {r["id"]: r for r in json.load(f)["results"]}
+        label = "base"
+    else:
+        # replay times language resolution + decode – compare the same span
+        base  = {cid: {"text": rec.get("text", ""),
+                       "latency_s": sum(rec.get("timings", {}).get(k, 0.0)
+                                        for k in ("language", "decode")) or None}
+                 for cid, rec, _ in capture.load(folder)}
+        label = "captured"
+
+    print(f"{len(results)} captures | engine {state.cfg['engine']} | model {state.cfg['model']} | "
+          f"device {state.cfg['device']} | loaded in {load_s:.1f}s")
+    print(f"{'capture':<20s} {'audio s':>7s} {label + ' ms':>12s} {'now ms':>8s}  text")
+    changed, edits, words = 0, 0, 0
+    for r in results:
+        b     = base.get(r["id"], {})
+        old   = b.get("text", "")
+        b_ms  = f"{b['latency_s'] * 1000:.0f}" if b.get("latency_s") else "-"
+        text  = r["error"] or (r["text"] if r["text"] == old else word_diff(old, r["text"]))
+        if r["text"] != old:
+            changed += 1
+        e, n   = word_errors(old, r["text"])
+        edits += e; words += n
+        print(f"{r['id']:<20s} {r['audio_s']:>7.1f} {b_ms:>12s} {r['latency_s'] * 1000:>8.0f}  {text}")
+
+    lat = [r["latency_s"] for r in results]
+    rtf = [r["latency_s"] / r["audio_s"] for r in results if r["audio_s"]]
+    print(f"latency median {statistics.median(lat) * 1000:.0f} ms, max {max(lat) * 1000:.0f} ms | "
+          f"RTF median {statistics.median(rtf):.2f} | {changed}/{len(results)} texts changed, "
+          f"word diff {edits / words if words else 0.0:.1%} vs {label}")
+
+    if args.save:
+        cfg = {k: state.cfg.get(k) for k in capture.SETTINGS_KEYS}
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({"config": cfg, "results": results}, f, ensure_ascii=False, indent=1)
+        print(f"Saved → {args.save}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
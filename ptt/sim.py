@@ -0,0 +1,249 @@
+"""
+ptt/sim.py – Simulated microphone and scripted push-to-talk for headless runs.
+
+Run:  python -m ptt.sim [speech.wav] [--runs 5] [--speed 1] [--engine stub]
+
+* ``SimulatedInputStream`` stands in for ``sd.InputStream``: a thread calls
+  ``audio_callback`` with 512-frame float32 blocks at the stream's pace
+  (``speed`` > 1 runs faster than real time), with PortAudio-style
+  ``time_info`` and ``status`` flags.  Between utterances it delivers
+  silence, or loops a WAV file.  ``inject(status)`` flags the next block.
+* ``PTTDriver`` presses and releases the hotkey through
+  ``hotkey._ptt_trigger_press`` / ``_ptt_trigger_release`` while the stream
+  plays an utterance, and times the cycle up to the text arriving in a
+  ``CaptureSink``.
+
+``PTT_SIM_AUDIO`` (a WAV path, or empty for silence) makes the app itself
+open the simulated stream instead of a PortAudio device; ``PTT_SIM_SPEED``
+sets its pace.
+"""
+
+import os
+import statistics
+import threading
+import time
+
+import numpy as np
+
+import ptt.state as state
+
+SAMPLE_RATE = 16000
+BLOCK       = 512
+
+
+class TimeInfo:
+    """Subset of PortAudio's ``PaStreamCallbackTimeInfo``."""
+
+    __slots__ = ("inputBufferAdcTime", "currentTime", "outputBufferDacTime")
+
+    def __init__(self, adc: float, now: float):
+        self.inputBufferAdcTime  = adc
+        self.currentTime         = now
+        self.outputBufferDacTime = 0.0
+
+
+class Status:
+    """Subset of ``sounddevice.CallbackFlags``: falsy unless a flag is set."""
+
+    __slots__ = ("input_overflow", "input_underflow")
+
+    def __init__(self, input_overflow: bool = False, input_underflow: bool = False):
+        self.input_overflow  = input_overflow
+        self.input_underflow = input_underflow
+
+    def __bool__(self):
+        return self.input_overflow or self.input_underflow
+
+    def __str__(self):
+        return ", ".join(n.replace("_", " ") for n in self.__slots__ if getattr(self, n))
+
+
+NO_STATUS = Status()
+
+
+def load_wav(path: str) -> np.ndarray:
+    """16 kHz mono float32 (soundfile if installed, else 16-bit PCM WAV)."""
+    try:
+        from ptt.benchmark import load_clip
+        return load_clip(path)
+    except ImportError:
+        from ptt.capture import read_audio
+        return read_audio(path)
+
+
+# ─── Simulated stream ──────────────────────────────────────────────────────────
+
+class SimulatedInputStream:
+    """Feeds *callback* like a 16 kHz mono input stream (``start``/``stop``/``close``)."""
+
+    def __init__(self, callback, samplerate: int = SAMPLE_RATE, blocksize: int = BLOCK,
+                 source: np.ndarray = None, speed: float = 1.0, **_):
+        self.callback   = callback
+        self.samplerate = samplerate
+        self.blocksize  = blocksize
+        self.speed      = speed
+        self.blocks     = 0
+        self._loop      = source
+        self._loop_pos  = 0
+        self._play      = None      # (audio, pos, done event)
+        self._status    = NO_STATUS
+        self._lock      = threading.Lock()
+        self._stop      = threading.Event()
+        self._thread    = None
+
+    @property
+    def active(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name="sim-audio")
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join()
+
+    def close(self):
+        self.stop()
+
+    def play(self, audio: np.ndarray) -> threading.Event:
+        """Deliver *audio* from the next block on; the event is set once it is out."""
+        done = threading.Event()
+        with self._lock:
+            self._play = (np.asarray(audio, dtype=np.float32).reshape(-1), 0, done)
+        return done
+
+    def inject(self, status: Status):
+        """Report *status* with the next block (e.g. ``Status(input_overflow=True)``)."""
+        self._status = status
+
+    def _next_block(self, out: np.ndarray):
+        n = self.blocksize
+        with self._lock:
+            if self._play is not None:
+                audio, pos, done = self._play
+                chunk = audio[pos:pos + n]
+                out[:len(chunk), 0] = chunk
+                out[len(chunk):, 0] = 0.0
+                if pos + n >= len(audio):
+                    self._play = None
+                    done.set()
+                else:
+                    self._play = (audio, pos + n, done)
+                return
+        if self._loop is not None and len(self._loop):
+            idx = (self._loop_pos + np.arange(n)) % len(self._loop)
+            out[:, 0] = self._loop[idx]
+            self._loop_pos = (self._loop_pos + n) % len(self._loop)
+        else:
+            out.fill(0.0)
+
+    def _run(self):
+        period = self.blocksize / self.samplerate
+        block  = np.zeros((self.blocksize, 1), dtype=np.float32)
+        start  = time.perf_counter()
+        while not self._stop.is_set():
+            # block k is "recorded" during [k, k+1) × period, delivered at its end
+            due  = start + (self.blocks + 1) * period / self.speed
+            wait = due - time.perf_counter()
+            if wait > 0 and self._stop.wait(wait):
+                break
+            self._next_block(block)
+            status, self._status = self._status, NO_STATUS
+            adc = self.blocks * period
+            self.callback(block, self.blocksize, TimeInfo(adc, adc + period), status)
+            self.blocks += 1
+
+
+def from_env(callback, samplerate: int = SAMPLE_RATE, blocksize: int = BLOCK):
+    """Simulated stream configured by ``PTT_SIM_AUDIO`` / ``PTT_SIM_SPEED``."""
+    path = os.environ.get("PTT_SIM_AUDIO", "")
+    return SimulatedInputStream(callback, samplerate, blocksize,
+                                source=load_wav(path) if path else None,
+                                speed=float(os.environ.get("PTT_SIM_SPEED", "1") or 1))
+
+
+# ─── Scripted push-to-talk ─────────────────────────────────────────────────────
+
+class PTTDriver:
+    """Presses PTT, plays an utterance into the simulated stream, releases and
+    waits for the typed text.
+
+    Selects ``paste_mode = "type"`` with a ``CaptureSink`` – the whole
+    press → paste cycle runs without Tk, a display or a sound card.
+    """
+
+    def __init__(self, stream: SimulatedInputStream = None):
+        if not (os.environ.get("DISPLAY") or os.environ.get("WAYLAND_DISPLAY")):
+            os.environ.setdefault("PYNPUT_BACKEND", "dummy")   # importable headless
+        from ptt import hotkey, output
+        self._hotkey = hotkey
+        self.stream  = stream or state._audio_stream
+        self.sink    = output.CaptureSink()
+        output.set_sink(self.sink)
+        state.cfg["paste_mode"] = "type"
+
+    def utterance(self, audio: np.ndarray, tail_s: float = 0.1, timeout: float = 30.0) -> dict:
+        """One press → speak → release → paste cycle; timings in seconds."""
+        speed   = self.stream.speed
+        before  = len(self.sink.chunks)
+        t_press = time.perf_counter()
+        self._hotkey._ptt_trigger_press()
+        if not state.recording:
+            raise RuntimeError("PTT press did not start recording")
+        self.stream.play(audio).wait(timeout)
+        time.sleep(tail_s / speed)
+        t_release = time.perf_counter()
+        self._hotkey._ptt_trigger_release()
+        if not self.sink.wait(before + 1, timeout):
+            raise TimeoutError("no text typed")
+        t_text = self.sink.sent_at[-1]
+        return {"text":      "".join(self.sink.chunks[before:]),
+                "audio_s":   len(audio) / SAMPLE_RATE,
+                "held_s":    (t_release - t_press) * speed,
+                "release_s": t_text - t_release,     # release → text typed
+                "total_s":   t_text - t_press}
+
+
+def main(argv=None):
+    import argparse
+    from ptt.benchmark import synthetic_clip
+    from ptt.config import load_settings
+    load_settings()
+    ap = argparse.ArgumentParser(prog="python -m ptt.sim", description=__doc__.split("\n\n")[0])
+    ap.add_argument("wav",      nargs="?", help="utterance to speak (default: synthetic 2 s)")
+    ap.add_argument("--runs",   type=int, default=5)
+    ap.add_argument("--speed",  type=float, default=1.0, help="stream pace (2 = twice real time)")
+    ap.add_argument("--engine", help="engine override, e.g. stub (no model)")
+    ap.add_argument("--model")
+    args = ap.parse_args(argv)
+    if args.engine: state.cfg["engine"] = args.engine
+    if args.model:  state.cfg["model"]  = args.model
+    state.cfg.update(history_enabled=False, sound_feedback=False, capture_utterances=False)
+
+    from ptt.audio import audio_callback
+    from ptt.model_manager import load_model
+    audio = load_wav(args.wav) if args.wav else synthetic_clip(2.0)
+    if not load_model():
+        print("Model failed to load"); return 1
+    stream = SimulatedInputStream(audio_callback, speed=args.speed)
+    state._audio_stream = stream
+    stream.start()
+    driver = PTTDriver(stream)
+    print(f"{'run':>3s} {'release→text ms':>16s} {'press→text ms':>14s}  text")
+    rows = []
+    for i in range(args.runs):
+        r = driver.utterance(audio)
+        rows.append(r)
+        print(f"{i + 1:>3d} {r['release_s'] * 1000:>16.0f} {r['total_s'] * 1000:>14.0f}  {r['text'][:60]}")
+    stream.close()
+    print(f"median release→text {statistics.median(r['release_s'] for r in rows) * 1000:.0f} ms "
+          f"({len(audio) / SAMPLE_RATE:.1f} s utterance, speed ×{args.speed:g})")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+ptt/startup.py – Parallel application start with a startup timeline.
+
+``launch()`` declares what the app needs before it can take dictation and
+what each step waits for.  A step starts as soon as its dependencies have
+finished – Tk steps on the main thread, all others on their own thread:
+
+    settings ─┬─ setup* ─┬─ ui ──────────────┬─ model-load ┄┄ model-ready
+              │          ├─ audio ┄ mic-scan │
+              │          └─ listener         │
+              ├─ imports ────────────────────┤
+    hardware ─┴──────────── model-resolve ───┘        * first start only
+
+While Tk builds the overlay (or the first-start dialog waits for the user),
+the accelerator probe, the engine's library import (faster-whisper ~1 s)
+and the model lookup/download run in the background.  The microphone opens
+with the cached device list; the device re-scan waits until it is open.
+A failed background step is logged and its dependents run anyway –
+``load_model()`` has its own fallbacks; a failed main-thread step aborts
+the start.
+
+Ready = overlay shown, microphone and hotkey listener started and a model
+serving.  The time to ready is logged and exported as
+``ptt_startup_seconds{step="ready"}``; once every step has finished the
+whole timeline follows:
+
+    🚀 Startup timeline – ready after 1.42 s, done after 4.10 s
+       launch        ██▏                              0 →   180 ms  main
+       hardware       ▕█████████▏                   181 →  1024 ms
+       …
+"""
+
+import threading
+import time
+
+import ptt.state as state
+
+BAR_WIDTH = 32
+
+
+class Cancelled(Exception):
+    """A main-thread step ended the start (first-start setup dismissed)."""
+
+
+class Step:
+    __slots__ = ("name", "fn", "after", "main", "start", "end", "error")
+
+    def __init__(self, name, fn, after=(), main=False):
+        self.name, self.fn, self.after, self.main = name, fn, tuple(after), main
+        self.start = self.end = None
+        self.error = None
+
+    @property
+    def done(self) -> bool:
+        return self.end is not None
+
+
+class Startup:
+    """Dependency-ordered start-up steps with maximum overlap.
+
+    ``add()`` the steps, then call ``run()`` on the main thread: it runs the
+    ``main=True`` steps itself and returns once they are done, while the
+    background steps may still be going.  Return values land in ``results``.
+    ``mark()`` records a milestone (e.g. "model-ready") reached inside a step.
+    """
+
+    def __init__(self, t0: float = None, ready=()):
+        self.t0       = time.perf_counter() if t0 is None else t0
+        self.ready    = tuple(ready)      # steps / milestones that make the app ready
+        self.ready_s  = None
+        self.done_s   = None
+        self.steps    = {}
+        self.results  = {}
+        self._cond    = threading.Condition()
+        self._aborted = False
+
+    def record(self, name: str, start: float, end: float, main: bool = True):
+        """A span that already happened (perf_counter times), e.g. the launch."""
+        step = self.steps[name] = Step(name, None, main=main)
+        step.start, step.end = start, end
+
+    def add(self, name: str, fn, after=(), main: bool = False):
+        self.steps[name] = Step(name, fn, after, main)
+
+    def mark(self, name: str):
+        """Milestone *name* reached now (the first call counts)."""
+        with self._cond:
+            if name in self.steps:
+                return
+            step = self.steps[name] = Step(name, None)
+            step.start = step.end = time.perf_counter()
+            self._progress()
+
+    def elapsed(self, name: str):
+        """Seconds from t0 until *name* finished, or None."""
+        step = self.steps.get(name)
+        return step.end - self.t0 if step is not None and step.done else None
+
+    # ── Scheduling ─────────────────────────────────────────────────────────────
+
+    def _ready_to_start(self, step) -> bool:
+        return (step.start is None and step.fn is not None
+                and all(d in self.steps and self.steps[d].done for d in step.after))
+
+    def _launch_background(self):
+        """Start every background step whose dependencies are done (lock held)."""
+        if self._aborted:
+            return
+        for step in self.steps.values():
+            if not step.main and self._ready_to_start(step):
+                step.start = time.perf_counter()
+                threading.Thread(target=self._execute, args=(step,), daemon=True,
+                                 name=f"startup-{step.name}").start()
+
+    def run(self):
+        for step in self.steps.values():
+            for d in step.after:
+                if d not in self.steps:
+                    raise ValueError(f"startup step '{step.name}' waits for unknown '{d}'")
+        while True:
+            with self._cond:
+                self._launch_background()
+                pending = [s for s in self.steps.values() if s.main and s.fn and not s.done]
+                if not pending:
+                    return self
+                step = next((s for s in pending if self._ready_to_start(s)), None)
+                if step is None:
+                    self._cond.wait()
+                    continue
+                step.start = time.perf_counter()
+            self._execute(step)
+
+    def _execute(self, step):
+        try:
+            self.results[step.name] = step.fn()
+        except BaseException as e:
+            step.error = e
+            if step.main:
+                with self._cond:
+                    self._aborted = True
+            elif not isinstance(e, Cancelled):
+                state.log(f"⚠️  Startup step '{step.name}' failed: {e}")
+        finally:
+            with self._cond:
+                step.end = time.perf_counter()
+                self._launch_background()
+                self._progress()
+        if step.main and step.error is not None:
+            raise step.error
+
+    def _progress(self):
+        """Check for ready / all done (lock held)."""
+        self._cond.notify_all()
+        now = time.perf_counter()
+        if self.ready_s is None and self.ready and all(
+                n in self.steps and self.steps[n].done for n in self.ready):
+            self.ready_s = now - self.t0
+            state.log(f"🚀 Ready after {self.ready_s:.2f}s")
+        if self.done_s is None and not self._aborted and all(
+                s.done for s in self.steps.values() if s.fn is not None):
+            self.done_s = now - self.t0
+            state.log(self.timeline())
+
+    def wait(self, timeout: float = None) -> bool:
+        """Until every step has finished (tests / tools)."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.done_s is not None or self._aborted, timeout)
+
+    # ── Timeline ───────────────────────────────────────────────────────────────
+
+    def timeline(self) -> str:
+        done  = [s for s in self.steps.values() if s.start is not None]
+        total = max((s.end or time.perf_counter()) - self.t0 for s in done) or 1e-9
+        ready = f"ready after {self.ready_s:.2f} s" if self.ready_s is not None else "not ready"
+        lines = [f"🚀 Startup timeline – {ready}, done after {total:.2f} s"]
+        for s in sorted(done, key=lambda s: (s.start, s.end or 0.0)):
+            a   = (s.start - self.t0) * 1000
+            b   = ((s.end or time.perf_counter()) - self.t0) * 1000
+            i   = min(BAR_WIDTH - 1, int(a / 1000 / total * BAR_WIDTH))
+            j   = max(i + 1, round(b / 1000 / total * BAR_WIDTH))
+            if s.fn is None and s.start == s.end and not s.main:
+                bar, span = " " * i + "◆", f"{b:>13.0f} ms"
+            else:
+                bar, span = " " * i + "█" * (j - i), f"{a:>5.0f} → {b:>5.0f} ms"
+            note = ("failed: " + str(s.error or type(s.error).__name__)) if s.error else \
+                   ("main" if s.main else "")
+            lines.append(f"   {s.name:<14s}{bar:<{BAR_WIDTH}s} {span}  {note}".rstrip())
+        return "\n".join(lines)
+
+
+# ─── The app's start ───────────────────────────────────────────────────────────
+
+_last = None   # Startup of this process, for metrics
+
+
+def seconds() -> dict:
+    """``{step: seconds from process start until it finished}`` incl. "ready"."""
+    boot = _last
+    if boot is None:
+        return {}
+    out = {n: boot.elapsed(n) for n in boot.steps}
+    out["ready"] = boot.ready_s
+    return {n: v for n, v in out.items() if v is not None}
+
+
+def _preload_engine():
+    """Import the engine the first load will most likely use.
+
+    With device "auto" the accelerator probe is still running – guess
+    faster-whisper, which serves CPU and CUDA; an unused import only costs
+    memory.  Nothing to preload when inference runs in a worker process.
+    """
+    from ptt import engines
+    from ptt.hardware import resolve_device
+    from ptt.model_manager import _engine_kind, progressive_starter
+    if state.cfg.get("inference_process", False):
+        return []
+    dev = state.cfg["device"]
+    device = "cpu" if progressive_starter() or dev == "auto" else resolve_device(dev, "auto")[0]
+    return engines.preload(_engine_kind(device))
+
+
+def _resolve_model():
+    """Device/engine resolution and weights on disk for the first model to load."""
+    from ptt.model_manager import fetch_model, progressive_starter
+    starter = progressive_starter()
+    return fetch_model(starter, device="cpu" if starter else None,
+                       status_cb=lambda s, m: state.ui_queue.put(("status", s, m)))
+
+
+def launch(t0: float = None):
+    """Start the app; returns the Tk root once the overlay is shown.
+
+    *t0* is the process's own start (``time.perf_counter()`` taken before the
+    heavy imports).  Model load, audio and listener may still be running.
+    Raises ``Cancelled`` when the first-start setup is dismissed.
+    """
+    global _last
+    from ptt import metrics, mic_devices
+    from ptt.audio import start_audio_stream
+    from ptt.config import load_settings
+    from ptt.constants import SETTINGS_FILE
+    from ptt.hardware import detect_devices
+    from ptt.hotkey import start_ptt_listener
+
+    now  = time.perf_counter()
+    boot = _last = Startup(t0 if t0 is not None else now,
+                           ready=("ui", "audio", "listener", "model-ready"))
+    if t0 is not None:
+        boot.record("launch", t0, now)
+
+    def _settings():
+        load_settings()
+        metrics.start()             # metrics_port / metrics_textfile (off by default)
+
+    def _setup():
+        from ptt.ui.setup import show_first_setup
+        if not show_first_setup():
+            raise Cancelled("first-start setup cancelled")
+
+    def _ui():
+        import tkinter as tk
+        from ptt.ui.app import WhisperPTTApp
+        root = tk.Tk()
+        root.withdraw()  # Hide until app is ready
+        app  = WhisperPTTApp(root, autostart=False)
+        root.deiconify()
+        return app
+
+    def _model_load():
+        return boot.results["ui"].load_model(on_ready=lambda: boot.mark("model-ready"))
+
+    boot.add("hardware", detect_devices)
+    boot.add("settings", _settings, main=True)
+    cfg = ("settings",)
+    if not SETTINGS_FILE.exists():
+        boot.add("setup", _setup, after=cfg, main=True)
+        cfg = ("setup",)
+    boot.add("imports",       _preload_engine, after=("settings",))
+    boot.add("model-resolve", _resolve_model,  after=("hardware",) + cfg)
+    boot.add("ui",            _ui,             after=cfg, main=True)
+    boot.add("audio",         start_audio_stream, after=cfg)
+    boot.add("listener",      start_ptt_listener, after=cfg)
+    boot.add("mic-scan",      mic_devices.scan,   after=("audio",))
+    boot.add("model-load",    _model_load,     after=("ui", "imports", "model-resolve"))
+    boot.run()
+    return boot.results["ui"].root
@@ -2,7 +2,7 @@
 ptt/state.py – Global runtime variables shared across all modules.
 
 Other modules do ``import ptt.state as state`` and access e.g. ``state.cfg``,
-``state.recording``, ``state.whisper_model``, etc.
+``state.recording``, ``state.engine``, etc.
 """
 
 import threading
@@ -18,11 +18,13 @@ record_lock  = threading.Lock()
 
 model_load_lock = threading.Lock()   # guards _loading_model check-and-set
 ptt_lock        = threading.Lock()   # guards _ptt_active check-and-set
+model_swap_lock = threading.Lock()   # model handles below change together
 
 # ─── Model handles ─────────────────────────────────────────────────────────────
 
-whisper_model  = None   # faster_whisper.WhisperModel  (CPU / CUDA)
-openvino_pipe  = None   # openvino_genai.WhisperPipeline (NPU)
+engine         = None   # ptt.engines.Engine serving PTT (faster-whisper / OpenVINO / …)
+model_name     = None   # model currently serving (may differ from cfg["model"])
+model_device   = None   # resolved device of the serving model ("cpu", "cuda", "npu")
 
 # ─── Audio / UI state ──────────────────────────────────────────────────────────
 
@@ -2,41 +2,91 @@
 ptt/transcribe.py – Speech-to-text transcription and paste logic.
 """
 
-import os
 import time
-import tempfile
 import threading
 
 import numpy as np
-import soundfile as sf
-import pyperclip
-import pyautogui
-
 import ptt.state as state
 from ptt.constants import SILENT_THRESHOLD
 from ptt.config import T
+from ptt.history import record as record_history
+from ptt import capture, idle, language, metrics
+from ptt.engines import TRANSLATE
+from ptt.model_manager import active_model
+from ptt.output import PasteTimer, type_text
 
 # ─── Paste ─────────────────────────────────────────────────────────────────────
 
 def _do_paste(text: str):
-    time.sleep(0.15)
     if state.cfg["paste_mode"] == "clipboard":
         # Ask the main (tkinter) thread to copy to clipboard, then simulate Ctrl+V.
         # Using ui_queue avoids pyperclip/xclip which loses clipboard on Linux
         # when the helper process exits before the paste target reads it.
-        state.ui_queue.put(("clipboard_paste", text))
+        state.ui_queue.put(("clipboard_paste", text, time.perf_counter()))
+        return
+    from ptt.hotkey import wait_hotkey_released
+    timer = PasteTimer()
+    wait_hotkey_released()
+    timer.step("keys released")
+    if type_text(text):
+        timer.step("typed")
+        timer.log()
     else:
-        pyautogui.write(text, interval=0.01)
+        # typing backend failed → Ctrl+V
+        state.ui_queue.put(("clipboard_paste", text, time.perf_counter()))
 
 # ─── Transcription ─────────────────────────────────────────────────────────────
 
+def recognize(engine, audio_data, timings: dict) -> tuple:
+    """Language resolution and decode of one utterance → ``(text, language)``.
+
+    Shared with ``ptt.replay``; the stage durations (s) go into *timings*.
+    """
+    t_lang   = time.perf_counter()
+    in_lang  = state.cfg["language"]
+    detect   = False    # Whisper detects the language itself → feed result to the cache
+    if not in_lang or in_lang == "auto":
+        in_lang = None  # Whisper expects None for auto-detect, not the string "auto"
+        try:
+            in_lang, detect = language.resolve_language(engine, audio_data)
+        except Exception as e:
+            state.log(f"⚠️  Language detection failed: {e}")
+            detect = True
+    out_lang = state.cfg.get("output_language", "same")
+    task     = "translate" if (out_lang == "en" and in_lang != "en") else "transcribe"
+    if task == "translate":
+        if engine.supports(TRANSLATE):
+            state.log("🌐 Translation mode: → English")
+        else:
+            state.log(f"⚠️  {engine.label} cannot translate – transcribing")
+            task = "transcribe"
+
+    t_decode = time.perf_counter()
+    timings["language"] = t_decode - t_lang
+    segments, info = engine.transcribe(
+        audio_data,
+        language=in_lang, task=task,
+        beam_size=state.cfg["beam_size"],
+        vad_filter=state.cfg["vad_filter"],
+        vad_silence_ms=state.cfg["vad_silence_ms"],
+    )
+    text = " ".join(s.text.strip() for s in segments).strip()
+    if detect and info.language:
+        language.note(info.language, info.language_probability)
+        in_lang = info.language
+    timings["decode"] = time.perf_counter() - t_decode
+    return text, in_lang
+
+
 def transcribe_and_paste():
     from ptt.audio import restart_audio_stream
 
+    t_start = time.perf_counter()
     with state.record_lock:
         chunks = list(state.audio_chunks)
         state.audio_chunks.clear()
     if not chunks:
+        metrics.UTTERANCES.labels("empty").inc()
         state.ui_queue.put(("status", "ready", T("ready"))); return
 
     audio_data = np.concatenate(chunks, axis=0).flatten().astype(np.float32)
@@ -50,9 +100,12 @@ def transcribe_and_paste():
         # _silent_count is safe without a lock: ptt_lock ensures only one
         # transcription thread runs at a time (see hotkey._ptt_trigger_release).
         state._silent_count += 1
+        metrics.SILENT.inc()
+        metrics.UTTERANCES.labels("silent").inc()
         state.log(f"⚠️  {T('log_no_signal')} ({state._silent_count}/{SILENT_THRESHOLD})")
         if state._silent_count >= SILENT_THRESHOLD:
             state._silent_count = 0
+            metrics.MIC_RESTARTS.inc()
             state.log(T("log_restarting"))
             state.ui_queue.put(("status", "error", T("mic_error")))
             threading.Thread(target=restart_audio_stream, daemon=True).start()
@@ -60,56 +113,58 @@ def transcribe_and_paste():
     else:
         state._silent_count = 0
 
-    if len(audio_data) / 16000 < 0.2:
+    audio_s = len(audio_data) / 16000
+    if audio_s < 0.2:
+        metrics.UTTERANCES.labels("too_short").inc()
         state.ui_queue.put(("status", "ready", T("ready")))
         state.log(T("log_too_short")); return
 
+    idle.touch()
     t0       = time.time()
-    in_lang  = state.cfg["language"]
-    if not in_lang or in_lang == "auto":
-        in_lang = None  # Whisper expects None for auto-detect, not the string "auto"
-    out_lang = state.cfg.get("output_language", "same")
-    task     = "translate" if (out_lang == "en" and in_lang != "en") else "transcribe"
-    if task == "translate":
-        state.log("🌐 Translation mode: → English")
-
+    # One snapshot for the whole utterance – a progressive-start swap may
+    # replace the serving model at any time
+    engine, served, served_dev = active_model()
+    if engine is None and idle.wait_ready():
+        engine, served, served_dev = active_model()
+    if engine is None:
+        metrics.UTTERANCES.labels("not_ready").inc()
+        state.log("⏳ Model not ready yet")
+        state.ui_queue.put(("status", "ready", T("ready"))); return
+    timings = {"prepare": time.perf_counter() - t_start}
+    metrics.STAGE.labels("prepare").observe(timings["prepare"])
+    text, in_lang, result = "", None, "error"
     try:
-        if state.openvino_pipe is not None:
-            # ── OpenVINO GenAI (NPU) ──────────────────────────────────────────
-            config = state.openvino_pipe.get_generation_config()
-            if in_lang:
-                config.language = f"<|{in_lang}|>"
-            if task == "translate":
-                config.task = "translate"
-            result = state.openvino_pipe.generate(audio_data, config)
-            text   = " ".join(t.strip() for t in result.texts).strip()
-        else:
-            # ── faster-whisper (CPU / CUDA) ───────────────────────────────────
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-                tmp_path = tmp.name
-            sf.write(tmp_path, audio_data, 16000)
-            try:
-                seg, _ = state.whisper_model.transcribe(
-                    tmp_path,
-                    language=in_lang, task=task,
-                    beam_size=state.cfg["beam_size"],
-                    vad_filter=state.cfg["vad_filter"],
-                    vad_parameters=dict(min_silence_duration_ms=state.cfg["vad_silence_ms"]),
-                    condition_on_previous_text=False,
-                )
-                text = " ".join(s.text.strip() for s in seg).strip()
-            finally:
-                try: os.unlink(tmp_path)
-                except Exception: pass
-
+        text, in_lang = recognize(engine, audio_data, timings)
         elapsed = time.time() - t0
+        metrics.STAGE.labels("language").observe(timings["language"])
+        metrics.STAGE.labels("decode").observe(timings["decode"])
+        metrics.RTF.observe(timings["decode"] / audio_s)
+        metrics.AUDIO.inc(audio_s)
         if not text:
+            result = "no_text"
             state.log(T("log_no_text"))
             state.ui_queue.put(("status", "ready", T("ready"))); return
 
         state.ui_queue.put(("recognized", text))
+        state.ui_queue.put(("served", served, served_dev))
         state.ui_queue.put(("status", "ready", f"{T('ready')}  ({elapsed:.1f}s)"))
+        t_paste = time.perf_counter()
         _do_paste(text)
+        t_end = time.perf_counter()
+        timings["paste"] = t_end - t_paste
+        timings["total"] = t_end - t_start
+        metrics.STAGE.labels("paste").observe(timings["paste"])
+        metrics.STAGE.labels("total").observe(timings["total"])
+        result = "ok"
     except Exception as e:
         state.log(f"❌ Error: {e}")
         state.ui_queue.put(("status", "ready", T("ready")))
+    finally:
+        metrics.UTTERANCES.labels(result).inc()
+        audio_ref = None
+        if state.cfg.get("capture_utterances", False):
+            audio_ref = capture.submit(audio_data, text=text, result=result, timings=timings,
+                                       model=served, device=served_dev, language=in_lang)
+        if text:   # after the capture, so the entry can point at its audio
+            record_history(text, model=served, device=served_dev, language=in_lang,
+                           latency_ms=elapsed * 1000, audio=audio_ref)
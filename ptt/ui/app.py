@@ -2,24 +2,26 @@
 ptt/ui/app.py – Main overlay window (WhisperPTTApp class).
 """
 
-import os
 import queue
-import subprocess
 import time
 import threading
 import tkinter as tk
 from tkinter import messagebox
 
-import pyperclip
 import pyautogui
 
 import ptt.state as state
 from ptt.constants import C, VERSION
 from ptt.config import T, save_settings
-from ptt.audio import restart_audio_stream
-from ptt.hotkey import start_ptt_listener, stop_ptt_listener
-from ptt.model_manager import load_model
+from ptt.audio import restart_audio_stream, switch_audio_stream
+from ptt.hotkey import start_ptt_listener, stop_ptt_listener, wait_hotkey_released
+from ptt import audio_health, idle, language, model_manager, profiler
+from ptt.output import (
+    PasteTimer, is_wayland, log_tools, send_paste_keystroke, tk_copy, type_text, wl_copy,
+)
+from ptt.ui.frame_clock import FrameClock
 from ptt.ui.helpers import _flat_btn, _make_text_widget
+from ptt.ui.history import HistoryWindow
 from ptt.ui.settings import SettingsWindow
 
 
@@ -35,26 +37,41 @@ class WhisperPTTApp:
         "process": C["process"], "error":   C["record"],
     }
 
-    def __init__(self, root: tk.Tk):
+    def __init__(self, root: tk.Tk, autostart: bool = True):
         self.root          = root
         self._minimized    = False
         self._settings_win = None
+        self._history_win  = None
+        self._lang_cfg     = self._language_settings()
+        self._mic_cfg      = state.cfg.get("mic_device", -1)
         self._clean_texts  = []
         self._model_loaded = False
         self._loading_model = False
-        self._spinner_active = False
 
         self._dx = 0
         self._dy = 0
 
+        # One animation clock for meter, pulse and spinner; idle when nothing animates
+        self._clock     = FrameClock(root)
+        self._meter_lv  = 0.0
+
+        self._pending_copy = None   # running wl-copy, awaited before Ctrl+V
+        self._health_ticks = 0      # _poll_queue rounds until the next audio health check
+
         self._build_window()
         self._build_ui()
         self._poll_queue()
-        self._animate_meter()
 
-        # Load model in background on startup
-        self._load_model_async()
-        threading.Thread(target=start_ptt_listener, daemon=True).start()
+        # Probe Wayland output tools once instead of on every paste
+        if is_wayland():
+            threading.Thread(target=log_tools, daemon=True).start()
+
+        idle.start()
+        # Load model + start the PTT listener in background – unless ptt.startup
+        # schedules them itself
+        if autostart:
+            self._load_model_async()
+            threading.Thread(target=start_ptt_listener, daemon=True).start()
 
     def _build_window(self):
         self.root.title("Whisper PTT")
@@ -121,6 +138,13 @@ class WhisperPTTApp:
         gear.bind("<Enter>",    lambda e: gear.config(fg=C["text"]))
         gear.bind("<Leave>",    lambda e: gear.config(fg=C["dim"]))
 
+        hist = tk.Label(row, text="🕘", bg=C["bg"], fg=C["dim"],
+                        font=("Segoe UI", 11), cursor="hand2")
+        hist.pack(side="right", padx=(0, 2))
+        hist.bind("<Button-1>", lambda e: self._open_history())
+        hist.bind("<Enter>",    lambda e: hist.config(fg=C["text"]))
+        hist.bind("<Leave>",    lambda e: hist.config(fg=C["dim"]))
+
         self.mic_btn = tk.Label(row, text="🎤↺", bg=C["bg"], fg=C["dim"],
                                 font=("Segoe UI", 11), cursor="hand2")
         self.mic_btn.pack(side="right", padx=(0, 2))
@@ -138,9 +162,22 @@ class WhisperPTTApp:
                                   font=("Segoe UI", 8))
         self.model_lbl.pack(side="right", padx=(0, 10))
 
-        # Voice meter
-        tk.Label(self.content, text=T("microphone"), bg=C["bg"], fg=C["dim"],
-                 font=("Segoe UI", 7, "bold")).pack(anchor="w")
+        # Detected / locked language (auto-detect only); click resets the cache
+        self.lang_lbl = tk.Label(row, text="", bg=C["bg"], fg=C["dim"],
+                                 font=("Segoe UI", 8), cursor="hand2")
+        self.lang_lbl.pack(side="right", padx=(0, 6))
+        self.lang_lbl.bind("<Button-1>", lambda e: language.reset())
+        self.lang_lbl.bind("<Enter>",    lambda e: self.lang_lbl.config(fg=C["text"]))
+        self.lang_lbl.bind("<Leave>",    lambda e: self.lang_lbl.config(fg=C["dim"]))
+
+        # Voice meter + audio callback health (ptt.audio_health)
+        mrow = tk.Frame(self.content, bg=C["bg"])
+        mrow.pack(fill="x")
+        tk.Label(mrow, text=T("microphone"), bg=C["bg"], fg=C["dim"],
+                 font=("Segoe UI", 7, "bold")).pack(side="left")
+        self.health_lbl = tk.Label(mrow, text="", bg=C["bg"], fg=C["dim"],
+                                   font=("Segoe UI", 7))
+        self.health_lbl.pack(side="right")
         self.meter_cv = tk.Canvas(self.content, height=16, bg=C["bg3"],
                                   highlightthickness=1, highlightbackground=C["sep"])
         self.meter_cv.pack(fill="x", pady=(2, 8))
@@ -171,6 +208,8 @@ class WhisperPTTApp:
         br2 = tk.Frame(self.content, bg=C["bg"])
         br2.pack(fill="x", pady=(0, 0))
         _flat_btn(br2, "btn_copy_log",  C["btn_copy"],  self._copy_debug ).pack(side="left")
+        self.profile_btn = _flat_btn(br2, "btn_profile", C["btn_copy"], self._toggle_profile)
+        self.profile_btn.pack(side="left", padx=(4,0))
         _flat_btn(br2, "btn_clear_log", C["btn_clear"], self._clear_debug).pack(side="right")
 
     # ── Drag (title bar only) ──────────────────────────────────────────────────
@@ -187,72 +226,52 @@ class WhisperPTTApp:
 
     # ── Actions ────────────────────────────────────────────────────────────────
 
-    def _tk_copy(self, text: str):
-        """Copy text to clipboard.
-        On Wayland: use wl-copy (most reliable; keeps clipboard after app exits).
-        On X11: tkinter owns CLIPBOARD selection + pyperclip for UTF8_STRING.
+    def _tk_copy(self, text: str) -> bool:
+        """Copy text to clipboard; returns True once ownership is confirmed.
+        On Wayland: start wl-copy without blocking (keeps clipboard after app
+        exits); ownership is confirmed in the paste thread before Ctrl+V.
+        Elsewhere: Tk owns the CLIPBOARD selection (output.tk_copy).
         """
-        if os.environ.get("XDG_SESSION_TYPE", "").lower() == "wayland":
+        if is_wayland():
             try:
-                subprocess.run(["wl-copy", "--"], input=text.encode(), timeout=3)
-                return
-            except FileNotFoundError:
+                self._pending_copy = wl_copy(text)
+                if self._pending_copy is not None:
+                    return True
                 state.log("⚠️  wl-copy not found – install: sudo apt install wl-clipboard")
             except Exception:
-                pass
+                self._pending_copy = None
         # X11 / fallback
-        self.root.clipboard_clear()
-        self.root.clipboard_append(text)
-        self.root.update()
-        try:
-            pyperclip.copy(text)
-        except Exception:
-            pass
+        return tk_copy(self.root, text)
 
-    def _do_type_or_paste(self, text: str):
-        """On Wayland: type text directly via ydotool (most reliable on GNOME).
-        On X11: simulate Ctrl+V via pyautogui."""
+    def _do_type_or_paste(self, text: str, timer: PasteTimer = None):
+        """On Wayland: type text directly via the output sink (ydotool / wtype).
+        On X11: simulate Ctrl+V via pyautogui.
+        Starts as soon as the hotkey keys are physically released – no fixed delay."""
+        timer = timer or PasteTimer()
         def _run():
-            if os.environ.get("XDG_SESSION_TYPE", "").lower() == "wayland":
-                try:
-                    subprocess.run(
-                        ["ydotool", "type", "--key-delay", "0", "--", text],
-                        timeout=30,
-                    )
+            wait_hotkey_released()
+            timer.step("keys released")
+            if is_wayland():
+                if type_text(text):
+                    timer.step("typed"); timer.log()
                     return
-                except FileNotFoundError:
-                    state.log("⚠️  ydotool not found – install: sudo apt install ydotool")
-                except Exception as e:
-                    state.log(f"⚠️  ydotool type failed: {e}")
                 # fallback: Ctrl+V
                 self._simulate_paste()
             else:
                 self._simulate_paste()
+            timer.step("Ctrl+V"); timer.log()
         threading.Thread(target=_run, daemon=True).start()
 
     def _simulate_paste(self):
         """Simulate Ctrl+V in the active window.
-        GNOME Wayland: ydotool (uinput-based, no compositor protocol needed).
-        Other Wayland:  wtype fallback.
+        Wayland: ydotoold socket, else ydotool / wtype (see ptt.output).
         X11:            pyautogui.
         """
-        if os.environ.get("XDG_SESSION_TYPE", "").lower() == "wayland":
-            # ydotool works on GNOME Wayland via /dev/uinput (no special protocol needed)
-            try:
-                subprocess.run(["ydotool", "key", "ctrl+v"], timeout=5)
-                return
-            except FileNotFoundError:
-                pass
-            except Exception as e:
-                state.log(f"⚠️  ydotool failed: {e}")
-            # wtype works on KDE/wlroots compositors
-            try:
-                subprocess.run(["wtype", "-M", "ctrl", "-k", "v", "-m", "ctrl"], timeout=3)
-                return
-            except FileNotFoundError:
-                state.log("⚠️  Auto-paste: install ydotool (sudo apt install ydotool)")
-            except Exception as e:
-                state.log(f"⚠️  wtype failed: {e}")
+        if is_wayland():
+            copy, self._pending_copy = self._pending_copy, None
+            if copy is not None and not copy.wait():
+                state.log("⚠️  Clipboard ownership not confirmed")
+            send_paste_keystroke()
         else:
             try:
                 pyautogui.hotkey("ctrl", "v")
@@ -272,9 +291,22 @@ class WhisperPTTApp:
                self.recog_txt.get("1.0", "end-1c").strip()
         if text:
             self._tk_copy(text)
-            self.root.after(150, self._simulate_paste)
+            self._after_click_release(
+                lambda: threading.Thread(target=self._simulate_paste, daemon=True).start())
             self._flash(T("flash_pasted"))
 
+    def _after_click_release(self, fn, fallback_ms=1000):
+        """Run *fn* once the mouse button that triggered the click is released
+        (so Ctrl+V is not combined with a held button); *fallback_ms* caps the wait."""
+        done = {"fired": False}
+        def _fire(e=None):
+            if done["fired"]: return
+            done["fired"] = True
+            self.root.unbind_all("<ButtonRelease-1>")
+            fn()
+        self.root.bind_all("<ButtonRelease-1>", _fire)
+        self.root.after(fallback_ms, _fire)
+
     def _clear_recog(self):
         self._clean_texts.clear()
         self.recog_txt.config(state="normal")
@@ -286,6 +318,18 @@ class WhisperPTTApp:
             self._tk_copy(text)
             self._flash(T("flash_copied"))
 
+    def _toggle_profile(self):
+        """Start / stop a profiling session (see ptt.profiler)."""
+        def _run():
+            profiler.toggle()
+            self.root.after(0, self._show_profile_state)
+        # stop() writes files and joins the sampler – keep it off the Tk thread
+        threading.Thread(target=_run, daemon=True, name="profile-toggle").start()
+
+    def _show_profile_state(self):
+        key = "btn_profile_stop" if profiler.active() else "btn_profile"
+        self.profile_btn.winfo_children()[0].config(text=T(key))
+
     def _clear_debug(self):
         self.debug_txt.config(state="normal")
         self.debug_txt.delete("1.0", "end")
@@ -302,13 +346,17 @@ class WhisperPTTApp:
 
     def _toggle_min(self):
         self._minimized = not self._minimized
-        if self._minimized: self.content.pack_forget()
-        else:               self.content.pack(fill="both", expand=True)
+        if self._minimized:
+            self.content.pack_forget()
+            self._clock.pause()   # nothing visible to animate
+        else:
+            self.content.pack(fill="both", expand=True)
+            self._clock.resume()
 
     def _on_close(self):
         state.cfg["window_x"] = self.root.winfo_x()
         state.cfg["window_y"] = self.root.winfo_y()
-        save_settings()
+        save_settings(flush=True)
         stop_ptt_listener()
         if state._audio_stream is not None:
             try: state._audio_stream.stop(); state._audio_stream.close()
@@ -328,11 +376,29 @@ class WhisperPTTApp:
                         self._append_recognized(msg[1])
                     elif msg[0] == "log":
                         self._append_log(msg[1])
+                    elif msg[0] == "language":
+                        _, lang, sticky = msg
+                        self.lang_lbl.config(
+                            text=f"🌐 {lang}{' 🔒' if sticky else ''}" if lang else "")
+                    elif msg[0] == "served":
+                        self._show_model(msg[1], msg[2])
+                    elif msg[0] == "model_loading":
+                        self._show_model(state.model_name, state.model_device, loading=msg[1])
+                    elif msg[0] == "model_idle":
+                        self.model_lbl.config(text=f"Model: {msg[1]} 💤", fg=C["dim"])
                     elif msg[0] == "mic_ok":
                         self.mic_btn.config(fg=C["dim"])
+                    elif msg[0] == "mics_changed":
+                        if self._settings_win is not None and self._settings_win.win.winfo_exists():
+                            self._settings_win.refresh_mics()
                     elif msg[0] == "clipboard_paste":
-                        self._tk_copy(msg[1])  # always copy to clipboard too (for manual paste)
-                        self.root.after(120, lambda t=msg[1]: self._do_type_or_paste(t))
+                        timer = PasteTimer(msg[2] if len(msg) > 2 else None)
+                        timer.step("ui queue")
+                        # always copy to clipboard too (for manual paste)
+                        if not self._tk_copy(msg[1]):
+                            state.log("⚠️  Clipboard ownership not confirmed")
+                        timer.step("clipboard")
+                        self._do_type_or_paste(msg[1], timer)
                     elif msg[0] in ("mic_error", "mic_stream_error"):
                         self.mic_btn.config(fg=C["record"])
                         self._append_log(f"🎤 Mic error: {msg[1]}")
@@ -342,8 +408,21 @@ class WhisperPTTApp:
                     state.log(f"⚠️ UI dispatch error ({msg[0]}): {e}")
         except queue.Empty:
             pass
+        self._health_ticks -= 1
+        if self._health_ticks <= 0:
+            self._health_ticks = 40   # every 2 s
+            self._check_audio_health()
         self.root.after(50, self._poll_queue)
 
+    def _check_audio_health(self):
+        summary, alert = audio_health.check()
+        if alert:
+            self.mic_btn.config(fg=C["record"])
+            self._append_log(alert)
+        if not self._minimized and summary != self.health_lbl.cget("text"):
+            self.health_lbl.config(text=summary,
+                                   fg=C["process"] if "⚠" in summary else C["dim"])
+
     def _show_permission_hint(self):
         messagebox.showinfo(T("mic_perm_title"), T("mic_perm_msg"), parent=self.root)
 
@@ -357,30 +436,51 @@ class WhisperPTTApp:
         self.status_lbl.config(text=text,
                                fg=color if state_key not in ("ready","idle") else C["dim"])
         # Update model label when status changes to "ready"
-        if state_key == "ready" and (state.whisper_model or state.openvino_pipe):
-            device = state.cfg.get("device", "unknown")
-            self.model_lbl.config(text=f"Model: {state.cfg['model']} ({device.upper()})")
-        if state_key == "record": self._pulse(color)
+        if state_key == "ready" and state.engine is not None:
+            self._show_model(state.model_name, state.model_device)
+        if state_key == "record":
+            self._start_pulse(color)
+            self._clock.start("meter", self._meter_frame)
+
+    def _show_model(self, name, device, loading=None):
+        """Model label: the model that served (or will serve) the next utterance;
+        while a progressive-start target loads it reads ``tiny ⇢ large-v3``."""
+        if not name:
+            return
+        text = f"Model: {name} ({(device or '?').upper()})"
+        if loading and loading != name:
+            text = f"Model: {name} ⇢ {loading}"
+        self.model_lbl.config(text=text,
+                              fg=C["process"] if name != state.cfg["model"] else C["dim"])
+
+    # ── Animations (all driven by self._clock) ─────────────────────────────────
+
+    BLINK_FRAMES = 10      # 10 × 40 ms = 400 ms per blink phase
+    METER_EPS    = 0.02    # redraw meter only when level moves ≥ 2 %
+
+    def _blink(self, color, start):
+        """Return a frame callback that toggles the status dot every BLINK_FRAMES."""
+        def _frame(frame):
+            on = ((frame - start) // self.BLINK_FRAMES) % 2 == 0
+            if (frame - start) % self.BLINK_FRAMES == 0:
+                self.dot_cv.itemconfig(self._dot, fill=color if on else C["bg2"])
+            return True
+        return _frame
 
     def _start_spinner(self):
-        self._spinner_active = True
-        self._spinner_step(0)
+        self.dot_cv.itemconfig(self._dot, fill=C["process"])
+        self._clock.start("spinner", self._blink(C["process"], self._clock.frame))
 
     def _stop_spinner(self):
-        self._spinner_active = False
+        self._clock.stop("spinner")
 
-    def _spinner_step(self, step):
-        if not self._spinner_active:
-            return
-        col = C["process"] if step % 2 == 0 else C["bg2"]
-        self.dot_cv.itemconfig(self._dot, fill=col)
-        self.root.after(400, lambda: self._spinner_step(step + 1))
-
-    def _pulse(self, color, step=0):
-        if not state.recording:
-            self.dot_cv.itemconfig(self._dot, fill=color); return
-        self.dot_cv.itemconfig(self._dot, fill=color if step%2==0 else C["bg2"])
-        self.root.after(400, lambda: self._pulse(color, step+1))
+    def _start_pulse(self, color):
+        blink = self._blink(color, self._clock.frame)
+        def _pulse(frame):
+            if not state.recording:
+                self.dot_cv.itemconfig(self._dot, fill=color); return False
+            return blink(frame)
+        self._clock.start("pulse", _pulse)
 
     def _append_recognized(self, text: str):
         self._clean_texts.append(text)
@@ -398,40 +498,76 @@ class WhisperPTTApp:
         self.debug_txt.insert("end", f"[{ts}] {text}\n")
         self.debug_txt.see("end")
 
-    def _animate_meter(self):
+    def _meter_frame(self, frame):
+        lv = state.current_volume if state.recording else 0.0
+        if abs(lv - self._meter_lv) < self.METER_EPS and (lv > 0 or self._meter_lv == 0):
+            return state.recording
+        self._meter_lv = lv
         try:
             w  = self.meter_cv.winfo_width() or 300
-            bw = int(w * state.current_volume)
-            lv = state.current_volume
             c  = C["meter_low"] if lv < 0.5 else C["meter_mid"] if lv < 0.8 else C["meter_high"]
-            self.meter_cv.coords(self._mbar, 0, 0, bw, 16)
+            self.meter_cv.coords(self._mbar, 0, 0, int(w * lv), 16)
             self.meter_cv.itemconfig(self._mbar, fill=c)
         except Exception: pass
-        self.root.after(40, self._animate_meter)
+        return state.recording   # one final zero-level draw, then sleep
 
     # ── Model Loading ──────────────────────────────────────────────────────────
 
     def _load_model_async(self):
         """Load model in background without blocking UI."""
+        threading.Thread(target=self.load_model, daemon=True, name="model-load").start()
+
+    def load_model(self, on_ready=None) -> bool:
+        """Start-up model load, blocking (call off the Tk thread).
+
+        *on_ready* runs each time a model starts serving – with progressive
+        start first for the starter model, long before this returns.
+        """
         with state.model_load_lock:
             if self._loading_model or self._model_loaded:
-                return
+                return False
             self._loading_model = True
-        self._set_status("loading", "Loading model...")
+        state.ui_queue.put(("status", "loading", "Loading model..."))
 
-        def _load():
+        def _status(s, m):
+            state.ui_queue.put(("status", s, m))
+            if s == "ready" and on_ready:
+                on_ready()
+
+        try:
+            # via the module: the profiler may wrap load_model
+            self._model_loaded = model_manager.load_model_progressive(status_cb=_status)
+        except Exception as e:
+            state.log(f"⚠️  Model load error: {e}")
+            state.ui_queue.put(("status", "error", T("load_error")))
+        finally:
+            self._loading_model = False
+        return self._model_loaded
+
+    # ── History ────────────────────────────────────────────────────────────────
+
+    def _open_history(self):
+        if self._history_win is not None:
             try:
-                load_model(
-                    status_cb=lambda s, m: state.ui_queue.put(("status", s, m))
-                )
-                self._model_loaded = True
-            except Exception as e:
-                state.log(f"⚠️  Model load error: {e}")
-                state.ui_queue.put(("status", "error", T("load_error")))
-            finally:
-                self._loading_model = False
+                if self._history_win.win.winfo_exists():
+                    self._history_win.win.lift()
+                    self._history_win.win.focus_force()
+                    return
+            except Exception:
+                pass
+            self._history_win = None
+        self._history_win = HistoryWindow(
+            self.root,
+            on_copy_cb=self._copy_history,
+            on_close_cb=self._on_history_closed,
+        )
 
-        threading.Thread(target=_load, daemon=True).start()
+    def _copy_history(self, text: str):
+        self._tk_copy(text)
+        self._flash(T("flash_copied"))
+
+    def _on_history_closed(self):
+        self._history_win = None
 
     # ── Settings ───────────────────────────────────────────────────────────────
 
@@ -451,6 +587,10 @@ class WhisperPTTApp:
             on_close_cb=self._on_settings_closed,
         )
 
+    def _language_settings(self):
+        return (state.cfg.get("language"), state.cfg.get("language_candidates", ""),
+                state.cfg.get("sticky_language", True))
+
     def _on_settings_closed(self):
         self._settings_win = None
 
@@ -460,6 +600,14 @@ class WhisperPTTApp:
         self.root.attributes("-alpha", state.cfg["opacity"])
         self.root.update_idletasks()
         threading.Thread(target=start_ptt_listener, daemon=True).start()
+        if self._language_settings() != self._lang_cfg:
+            self._lang_cfg = self._language_settings()
+            language.reset()
+        idle.start()                # idle_unload_min may have changed
+        if state.cfg.get("mic_device", -1) != self._mic_cfg:
+            self._mic_cfg = state.cfg.get("mic_device", -1)
+            # opened next to the current stream – no gap if a recording is running
+            threading.Thread(target=switch_audio_stream, daemon=True, name="mic-switch").start()
 
         with state.model_load_lock:
             _should_load = need_model_reload and not self._loading_model
@@ -471,7 +619,7 @@ class WhisperPTTApp:
 
             def _load_with_status():
                 try:
-                    load_model(
+                    model_manager.load_model(
                         status_cb=lambda s, m: state.ui_queue.put(("status", s, m))
                     )
                 except Exception as e:
@@ -480,4 +628,4 @@ class WhisperPTTApp:
                 finally:
                     self._loading_model = False
 
-            threading.Thread(target=_load_with_status, daemon=True).start()
+            threading.Thread(target=_load_with_status, daemon=True, name="model-load").start()
@@ -0,0 +1,78 @@
+"""
+ptt/ui/frame_clock.py – Single after()-driven animation clock for the overlay.
+
+All overlay animations (voice meter, record pulse, loading spinner) subscribe
+to one FrameClock instead of running their own ``root.after()`` loops.  The
+clock only schedules itself while at least one subscriber is active and the
+overlay is not paused (minimized), so an idle overlay causes no animation
+wakeups at all.
+"""
+
+FRAME_MS = 40   # 25 fps – same cadence the old meter loop used
+
+
+class FrameClock:
+    """Drive any number of per-frame callbacks from a single ``after()`` chain.
+
+    A subscriber is ``fn(frame: int) -> bool``; returning False unsubscribes it.
+    ``wakeups`` counts timer firings so idle cost can be measured.
+    """
+
+    def __init__(self, root, interval_ms: int = FRAME_MS):
+        self._root     = root
+        self._interval = interval_ms
+        self._subs     = {}     # name → callback
+        self._job      = None   # pending after() id
+        self._paused   = False
+        self.frame     = 0
+        self.wakeups   = 0
+
+    # ── Subscription ──────────────────────────────────────────────────────────
+
+    def start(self, name: str, fn):
+        """Add (or replace) subscriber *name* and make sure the clock runs."""
+        self._subs[name] = fn
+        self._schedule()
+
+    def stop(self, name: str):
+        self._subs.pop(name, None)
+        if not self._subs:
+            self._cancel()
+
+    def active(self, name: str) -> bool:
+        return name in self._subs
+
+    # ── Pause / resume (minimized overlay) ────────────────────────────────────
+
+    def pause(self):
+        self._paused = True
+        self._cancel()
+
+    def resume(self):
+        self._paused = False
+        self._schedule()
+
+    # ── Internals ─────────────────────────────────────────────────────────────
+
+    def _schedule(self):
+        if self._job is None and self._subs and not self._paused:
+            self._job = self._root.after(self._interval, self._tick)
+
+    def _cancel(self):
+        if self._job is not None:
+            try: self._root.after_cancel(self._job)
+            except Exception: pass
+            self._job = None
+
+    def _tick(self):
+        self._job = None
+        self.wakeups += 1
+        self.frame   += 1
+        for name, fn in list(self._subs.items()):
+            try:
+                keep = fn(self.frame)
+            except Exception:
+                keep = False
+            if keep is False and self._subs.get(name) is fn:
+                del self._subs[name]
+        self._schedule()
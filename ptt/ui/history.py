@@ -0,0 +1,109 @@
+"""
+ptt/ui/history.py – Searchable transcript history (HistoryWindow class).
+"""
+
+import time
+import tkinter as tk
+
+import ptt.state as state
+from ptt.constants import C
+from ptt.config import T
+from ptt.history import get_store
+
+SEARCH_DELAY_MS = 120   # debounce typing before querying
+RESULT_LIMIT    = 200
+
+
+class HistoryWindow:
+
+    def __init__(self, parent, on_copy_cb, on_close_cb):
+        self.parent      = parent
+        self.on_copy_cb  = on_copy_cb
+        self.on_close_cb = on_close_cb
+        self._store      = get_store()
+        self._rows       = []
+        self._job        = None
+
+        self.win = tk.Toplevel(parent)
+        self.win.title(T("history_win_title"))
+        self.win.configure(bg=C["bg"])
+        self.win.attributes("-topmost", True)
+        self.win.minsize(420, 320)
+        self.win.protocol("WM_DELETE_WINDOW", self._on_close)
+
+        px, py = parent.winfo_x(), parent.winfo_y()
+        self.win.geometry(f"520x480+{max(0, px-530)}+{py}")
+
+        self._build()
+        self._search()
+
+    def _on_close(self):
+        if self._job is not None:
+            self.win.after_cancel(self._job)
+        self.on_close_cb()
+        self.win.destroy()
+
+    def _build(self):
+        main = tk.Frame(self.win, bg=C["bg"], padx=10, pady=8)
+        main.pack(fill="both", expand=True)
+
+        self.query = tk.StringVar()
+        entry = tk.Entry(main, textvariable=self.query, bg=C["bg2"], fg=C["text"],
+                         insertbackground=C["text"], relief="flat",
+                         font=("Segoe UI", 10))
+        entry.pack(fill="x", ipady=4)
+        entry.focus_set()
+        self.query.trace_add("write", lambda *_: self._schedule_search())
+        entry.bind("<Return>", lambda e: self._search())
+
+        self.info_lbl = tk.Label(main, text="", bg=C["bg"], fg=C["dim"],
+                                 font=("Segoe UI", 8), anchor="w")
+        self.info_lbl.pack(fill="x", pady=(4, 2))
+
+        lf = tk.Frame(main, bg=C["bg2"], highlightthickness=1,
+                      highlightbackground=C["sep"])
+        lf.pack(fill="both", expand=True)
+        sb = tk.Scrollbar(lf, bg=C["bg"], troughcolor=C["bg2"],
+                          relief="flat", bd=0, width=10)
+        sb.pack(side="right", fill="y")
+        self.listbox = tk.Listbox(
+            lf, bg=C["bg2"], fg=C["text"], selectbackground=C["accent2"],
+            selectforeground=C["text"], font=("Consolas", 9), relief="flat",
+            bd=4, activestyle="none", yscrollcommand=sb.set)
+        self.listbox.pack(side="left", fill="both", expand=True)
+        sb.config(command=self.listbox.yview)
+        self.listbox.bind("<Double-Button-1>", lambda e: self._copy_selected())
+        self.listbox.bind("<Return>",          lambda e: self._copy_selected())
+
+        tk.Label(main, text=T("history_hint"), bg=C["bg"], fg=C["dim"],
+                 font=("Segoe UI", 8)).pack(anchor="w", pady=(4, 0))
+
+    def _schedule_search(self):
+        if self._job is not None:
+            self.win.after_cancel(self._job)
+        self._job = self.win.after(SEARCH_DELAY_MS, self._search)
+
+    def _search(self):
+        self._job = None
+        self.listbox.delete(0, "end")
+        if self._store is None:
+            self.info_lbl.config(text=T("history_disabled"))
+            return
+        t0 = time.perf_counter()
+        try:
+            self._rows = self._store.search(self.query.get(), RESULT_LIMIT)
+        except Exception as e:
+            state.log(f"⚠️  History search failed: {e}")
+            self._rows = []
+        ms = (time.perf_counter() - t0) * 1000
+        for r in self._rows:
+            ts   = time.strftime("%Y-%m-%d %H:%M", time.localtime(r["ts"]))
+            line = " ".join(r["text"].split())
+            self.listbox.insert("end", f"{ts}  {line}")
+        self.info_lbl.config(
+            text=f"{T('history_count').format(n=len(self._rows))}  ({ms:.1f} ms)")
+
+    def _copy_selected(self):
+        sel = self.listbox.curselection()
+        if sel:
+            self.on_copy_cb(self._rows[sel[0]]["text"])
@@ -10,13 +10,14 @@ from pynput import keyboard as pynput_kb
 from pynput import mouse    as pynput_ms
 
 import ptt.state as state
+from ptt import mic_devices
 from ptt.constants import (
     C, DEFAULTS, TRANSLATIONS, UI_LANGUAGES, MODELS,
     DEVICES, COMPUTE_TYPES, _recog_lang_labels,
 )
 from ptt.hotkey import MOUSE_BTN_NAMES, _pynput_key_name
 from ptt.config import T, save_settings, get_models_dir
-from ptt.hardware import detect_devices, get_mic_devices
+from ptt.hardware import auto_threads, detect_devices, get_mic_devices
 from ptt.ui.helpers import _lighten, _section, _flat_btn, _scrollable_tab
 
 
@@ -37,7 +38,9 @@ class SettingsWindow:
         self._held_ms          = set()
         self._model_snapshot   = (
             state.cfg["model"], state.cfg["device"], state.cfg["compute_type"],
-            state.cfg.get("models_dir", "")
+            state.cfg.get("models_dir", ""),
+            state.cfg.get("cpu_threads", 0), state.cfg.get("num_workers", 0),
+            state.cfg.get("inference_process", False),
         )
 
         self.win = tk.Toplevel(parent)
@@ -57,6 +60,8 @@ class SettingsWindow:
         self._build()
         self._load_values()
         threading.Thread(target=self._detect_hw, daemon=True).start()
+        # the scan finishes on the "mic-scan" thread → hand over to the Tk thread
+        mic_devices.refresh(on_done=lambda: state.ui_queue.put(("mics_changed", None)))
 
     def _try_grab(self):
         try:
@@ -181,6 +186,21 @@ class SettingsWindow:
         ttk.Combobox(p, textvariable=self.lang_var,
                      values=list(self._recog_labels.values()), state="readonly", width=28,
                      font=("Segoe UI", 9)).pack(anchor="w", pady=(4,0))
+        cand_row = tk.Frame(p, bg=C["bg"])
+        cand_row.pack(anchor="w", pady=(6,0))
+        tk.Label(cand_row, text=T("lang_candidates_label"), bg=C["bg"], fg=C["text"],
+                 font=("Segoe UI", 9)).pack(side="left")
+        self.lang_cand_var = tk.StringVar()
+        tk.Entry(cand_row, textvariable=self.lang_cand_var, width=10,
+                 bg=C["bg3"], fg=C["text"], insertbackground=C["text"],
+                 relief="flat", font=("Segoe UI", 9)).pack(side="left", padx=6)
+        tk.Label(p, text=T("lang_candidates_hint"), bg=C["bg"], fg=C["dim"],
+                 font=("Segoe UI", 8)).pack(anchor="w")
+        self.sticky_lang_var = tk.BooleanVar()
+        tk.Checkbutton(p, text=T("sticky_language"), variable=self.sticky_lang_var,
+                       bg=C["bg"], fg=C["text"], selectcolor=C["bg3"],
+                       activebackground=C["bg"], activeforeground=C["text"],
+                       font=("Segoe UI", 9)).pack(anchor="w")
 
         # Output language / translation
         _section(p, "sec_output_lang")
@@ -204,6 +224,11 @@ class SettingsWindow:
                            bg=C["bg"], fg=C["text"], selectcolor=C["bg3"],
                            activebackground=C["bg"], activeforeground=C["text"],
                            font=("Segoe UI", 9)).pack(anchor="w")
+        self.history_var = tk.BooleanVar()
+        tk.Checkbutton(p, text=T("history_enabled"), variable=self.history_var,
+                       bg=C["bg"], fg=C["text"], selectcolor=C["bg3"],
+                       activebackground=C["bg"], activeforeground=C["text"],
+                       font=("Segoe UI", 9)).pack(anchor="w", pady=(4,0))
 
         # Appearance
         _section(p, "sec_appearance")
@@ -247,10 +272,10 @@ class SettingsWindow:
         _section(p, "sec_mic_device")
         self.mic_devices = get_mic_devices()
         self.mic_device_var = tk.StringVar()
-        mic_labels = [f"{v} (#{k})" if k != -1 else v for k, v in self.mic_devices.items()]
-        ttk.Combobox(p, textvariable=self.mic_device_var,
-                     values=mic_labels, state="readonly", width=30,
-                     font=("Segoe UI", 9)).pack(anchor="w", pady=(4,2))
+        self.mic_combo = ttk.Combobox(p, textvariable=self.mic_device_var,
+                                      values=[self._mic_label(k) for k in self.mic_devices],
+                                      state="readonly", width=30, font=("Segoe UI", 9))
+        self.mic_combo.pack(anchor="w", pady=(4,2))
         tk.Label(p, text=T("mic_device_hint"), bg=C["bg"], fg=C["dim"],
                  font=("Segoe UI", 8)).pack(anchor="w", pady=(0,8))
 
@@ -278,6 +303,18 @@ class SettingsWindow:
             tk.Label(row, text=T(model_desc_keys.get(m,"")), bg=C["bg"], fg=C["dim"],
                      font=("Segoe UI", 8)).pack(side="left")
 
+        prog_row = tk.Frame(p, bg=C["bg"])
+        prog_row.pack(fill="x", pady=(6,0))
+        self.progressive_var = tk.BooleanVar()
+        tk.Checkbutton(prog_row, text=T("progressive_start"), variable=self.progressive_var,
+                       bg=C["bg"], fg=C["text"], selectcolor=C["bg3"],
+                       activebackground=C["bg"], activeforeground=C["text"],
+                       font=("Segoe UI", 9), wraplength=300, justify="left").pack(side="left")
+        self.progressive_model_var = tk.StringVar()
+        ttk.Combobox(prog_row, textvariable=self.progressive_model_var,
+                     values=["tiny", "base"], state="readonly", width=6,
+                     font=("Segoe UI", 9)).pack(side="left", padx=6)
+
     # ── Tab 3: Advanced ────────────────────────────────────────────────────────
 
     def _tab_advanced(self, frame):
@@ -317,6 +354,48 @@ class SettingsWindow:
         tk.Label(beam_row, text=T("beam_hint"), bg=C["bg"], fg=C["dim"],
                  font=("Segoe UI", 8)).pack(side="left")
 
+        _section(p, "sec_threads")
+        thr_row = tk.Frame(p, bg=C["bg"])
+        thr_row.pack(anchor="w", pady=(4,0))
+        self.threads_var = tk.IntVar()
+        self.workers_var = tk.IntVar()
+        for key, var, hi in [("cpu_threads_label", self.threads_var, 64),
+                             ("num_workers_label", self.workers_var, 8)]:
+            tk.Label(thr_row, text=T(key), bg=C["bg"], fg=C["text"],
+                     font=("Segoe UI", 9)).pack(side="left")
+            tk.Spinbox(thr_row, textvariable=var,
+                       from_=0, to=hi, increment=1, width=4,
+                       bg=C["bg3"], fg=C["text"], buttonbackground=C["accent"],
+                       insertbackground=C["text"], relief="flat",
+                       font=("Segoe UI", 9)).pack(side="left", padx=(6,12))
+        tk.Label(p, text=T("threads_hint").format(n=auto_threads("cpu")),
+                 bg=C["bg"], fg=C["dim"], font=("Segoe UI", 8)).pack(anchor="w")
+
+        self.process_var = tk.BooleanVar()
+        tk.Checkbutton(p, text=T("inference_process"), variable=self.process_var,
+                       bg=C["bg"], fg=C["text"], selectcolor=C["bg3"],
+                       activebackground=C["bg"], activeforeground=C["text"],
+                       font=("Segoe UI", 9)).pack(anchor="w", pady=(6,0))
+        self.capture_var = tk.BooleanVar()
+        tk.Checkbutton(p, text=T("capture_utterances"), variable=self.capture_var,
+                       bg=C["bg"], fg=C["text"], selectcolor=C["bg3"],
+                       activebackground=C["bg"], activeforeground=C["text"],
+                       font=("Segoe UI", 9)).pack(anchor="w")
+
+        _section(p, "sec_idle")
+        idle_row = tk.Frame(p, bg=C["bg"])
+        idle_row.pack(anchor="w", pady=(4,0))
+        self.idle_var = tk.IntVar()
+        tk.Label(idle_row, text=T("idle_unload_label"), bg=C["bg"], fg=C["text"],
+                 font=("Segoe UI", 9)).pack(side="left")
+        tk.Spinbox(idle_row, textvariable=self.idle_var,
+                   from_=0, to=480, increment=5, width=4,
+                   bg=C["bg3"], fg=C["text"], buttonbackground=C["accent"],
+                   insertbackground=C["text"], relief="flat",
+                   font=("Segoe UI", 9)).pack(side="left", padx=6)
+        tk.Label(p, text=T("idle_hint"), bg=C["bg"], fg=C["dim"],
+                 font=("Segoe UI", 8)).pack(anchor="w")
+
         _section(p, "sec_models_dir")
         self.models_dir_var = tk.StringVar()
         dir_row = tk.Frame(p, bg=C["bg"])
@@ -331,6 +410,14 @@ class SettingsWindow:
         tk.Label(p, text=T("models_dir_hint"), bg=C["bg"], fg=C["dim"],
                  font=("Segoe UI", 8)).pack(anchor="w", pady=(2,0))
 
+        _section(p, "sec_prefetch")
+        self.prefetch_var = tk.StringVar()
+        ttk.Combobox(p, textvariable=self.prefetch_var,
+                     values=[T("prefetch_none")] + MODELS, state="readonly", width=28,
+                     font=("Segoe UI", 9)).pack(anchor="w", pady=(4,2))
+        tk.Label(p, text=T("prefetch_hint"), bg=C["bg"], fg=C["dim"],
+                 font=("Segoe UI", 8)).pack(anchor="w")
+
         _section(p, "")
         tk.Button(p, text=T("btn_reset"),
                   bg=C["btn_clear"], fg=C["dim"], relief="flat",
@@ -344,12 +431,18 @@ class SettingsWindow:
         self.hotkey_var.set(state.cfg["hotkey"])
         self.paste_var.set(state.cfg["paste_mode"])
         self.sound_var.set(state.cfg["sound_feedback"])
+        self.history_var.set(state.cfg.get("history_enabled", True))
         self.opacity_var.set(state.cfg["opacity"])
         self.opacity_lbl.config(text=f"{state.cfg['opacity']:.0%}")
         self.model_var.set(state.cfg["model"])
         self.vad_var.set(state.cfg["vad_filter"])
         self.vad_ms_var.set(state.cfg["vad_silence_ms"])
         self.beam_var.set(state.cfg["beam_size"])
+        self.threads_var.set(state.cfg.get("cpu_threads", 0))
+        self.idle_var.set(state.cfg.get("idle_unload_min", 0))
+        self.process_var.set(state.cfg.get("inference_process", False))
+        self.capture_var.set(state.cfg.get("capture_utterances", False))
+        self.workers_var.set(state.cfg.get("num_workers", 0))
 
         # UI language
         ui_lbl = next((k for k,v in UI_LANGUAGES.items() if v==state.cfg.get("ui_lang","en")), "English")
@@ -359,6 +452,8 @@ class SettingsWindow:
         rl = _recog_lang_labels(state.cfg["ui_lang"])
         rec_code = state.cfg.get("language") or "auto"
         self.lang_var.set(rl.get(rec_code, rl["auto"]))
+        self.lang_cand_var.set(state.cfg.get("language_candidates", ""))
+        self.sticky_lang_var.set(state.cfg.get("sticky_language", True))
 
         # Output language
         out_opts = {"same": T("output_same"), "en": rl["en"]}
@@ -374,14 +469,13 @@ class SettingsWindow:
 
         # Microphone device
         mic_idx = state.cfg.get("mic_device", -1)
-        if mic_idx in self.mic_devices:
-            mic_label = f"{self.mic_devices[mic_idx]} (#{mic_idx})" if mic_idx != -1 else self.mic_devices[mic_idx]
-        else:
-            mic_label = list(self.mic_devices.values())[0] if self.mic_devices else "Default"
-        self.mic_device_var.set(mic_label)
+        self.mic_device_var.set(self._mic_label(mic_idx if mic_idx in self.mic_devices else -1))
 
         # Models directory
         self.models_dir_var.set(state.cfg.get("models_dir", ""))
+        self.progressive_var.set(state.cfg.get("progressive_start", False))
+        self.progressive_model_var.set(state.cfg.get("progressive_model", "tiny"))
+        self.prefetch_var.set(state.cfg.get("prefetch_model", "") or T("prefetch_none"))
 
     def _browse_models_dir(self):
         chosen = filedialog.askdirectory(
@@ -392,6 +486,21 @@ class SettingsWindow:
         if chosen:
             self.models_dir_var.set(chosen)
 
+    def _mic_label(self, idx) -> str:
+        if idx == -1:
+            return self.mic_devices[-1]
+        no16 = mic_devices.supports(idx) is False
+        return f"{self.mic_devices[idx]} (#{idx})" + ("  – no 16 kHz" if no16 else "")
+
+    def refresh_mics(self):
+        """The cached list is shown at once; a re-scan updates it if devices changed.
+
+        Called on the Tk thread (``"mics_changed"`` in the app's UI queue)."""
+        sel = next((k for k in self.mic_devices if self._mic_label(k) == self.mic_device_var.get()), -1)
+        self.mic_devices = get_mic_devices()
+        self.mic_combo.config(values=[self._mic_label(k) for k in self.mic_devices])
+        self.mic_device_var.set(self._mic_label(sel if sel in self.mic_devices else -1))
+
     def _detect_hw(self):
         devs  = detect_devices()
         na    = T("hw_not_available")
@@ -490,6 +599,10 @@ class SettingsWindow:
         rl      = _recog_lang_labels(state.cfg["ui_lang"])
         sel_lbl = self.lang_var.get()
         state.cfg["language"] = next((code for code, lbl in rl.items() if lbl == sel_lbl), None)
+        state.cfg["language_candidates"] = ",".join(
+            c.strip().lower() for c in self.lang_cand_var.get().replace(";", ",").split(",")
+            if c.strip())
+        state.cfg["sticky_language"] = self.sticky_lang_var.get()
 
         # Resolve output language (label → code)
         out_opts = {"same": T("output_same"), "en": rl["en"]}
@@ -499,6 +612,7 @@ class SettingsWindow:
 
         state.cfg["paste_mode"]     = self.paste_var.get()
         state.cfg["sound_feedback"] = self.sound_var.get()
+        state.cfg["history_enabled"] = self.history_var.get()
         state.cfg["opacity"]        = round(self.opacity_var.get(), 2)
         state.cfg["model"]          = self.model_var.get()
         state.cfg["device"]         = next(
@@ -508,18 +622,28 @@ class SettingsWindow:
         state.cfg["vad_filter"]     = self.vad_var.get()
         state.cfg["vad_silence_ms"] = self.vad_ms_var.get()
         state.cfg["beam_size"]      = self.beam_var.get()
+        state.cfg["cpu_threads"]    = max(0, self.threads_var.get())
+        state.cfg["num_workers"]    = max(0, self.workers_var.get())
+        state.cfg["idle_unload_min"] = max(0, self.idle_var.get())
+        state.cfg["inference_process"] = self.process_var.get()
+        state.cfg["capture_utterances"] = self.capture_var.get()
         state.cfg["models_dir"]     = self.models_dir_var.get().strip()
+        state.cfg["progressive_start"] = self.progressive_var.get()
+        state.cfg["progressive_model"] = self.progressive_model_var.get() or "tiny"
+        state.cfg["prefetch_model"] = (self.prefetch_var.get()
+                                       if self.prefetch_var.get() in MODELS else "")
         
         # Resolve microphone device (label → index)
         mic_sel = self.mic_device_var.get()
-        mic_idx = next((k for k, v in self.mic_devices.items() 
-                        if (f"{v} (#{k})" if k != -1 else v) == mic_sel), -1)
+        mic_idx = next((k for k in self.mic_devices if self._mic_label(k) == mic_sel), -1)
         state.cfg["mic_device"]     = mic_idx
         
         save_settings()
         need_reload = (
             state.cfg["model"], state.cfg["device"], state.cfg["compute_type"],
-            state.cfg.get("models_dir", "")
+            state.cfg.get("models_dir", ""),
+            state.cfg.get("cpu_threads", 0), state.cfg.get("num_workers", 0),
+            state.cfg.get("inference_process", False),
         ) != self._model_snapshot
         self.win.grab_release()
         self.win.destroy()
@@ -67,7 +67,7 @@ def show_first_setup():
     def _use_default():
         selected_dir["path"] = MODEL_CACHE_DIR
         state.cfg["models_dir"] = ""
-        save_settings()
+        save_settings(flush=True)
         result["done"] = True
         root.destroy()
     
@@ -79,7 +79,7 @@ def show_first_setup():
         if path:
             selected_dir["path"] = path
             state.cfg["models_dir"] = path
-            save_settings()
+            save_settings(flush=True)
             result["done"] = True
             root.destroy()
     
@@ -94,7 +94,7 @@ def show_first_setup():
                 new_path.mkdir(parents=True, exist_ok=True)
                 selected_dir["path"] = str(new_path)
                 state.cfg["models_dir"] = str(new_path)
-                save_settings()
+                save_settings(flush=True)
                 messagebox.showinfo(
                     "Success",
                     f"Models directory created:\n{new_path}",
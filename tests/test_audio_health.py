@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+tests/test_audio_health.py – Audio callback health monitor.
+Run: python tests/test_audio_health.py
+
+Drives audio_callback directly with 512-frame blocks, so no sound card is
+needed.
+
+Tests:
+  1. Paced callbacks: jitter and duration histograms fill, nothing is flagged
+  2. Overflow / underflow flags, a slow callback and a gap in the ADC
+     timestamps are counted as such
+  3. Alerts are rate-limited and report only what is new since the last one
+  4. Updates allocate nothing that outlives the callback
+"""
+import sys
+import os
+import time
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+import ptt.state as state
+from ptt import audio_health
+from ptt.audio import audio_callback
+from ptt.audio_health import MONITOR
+
+BLOCK = np.zeros((512, 1), dtype=np.float32)
+
+
+class _TimeInfo:
+    def __init__(self, adc): self.inputBufferAdcTime = adc
+
+
+class _Flags:
+    """Stands in for sounddevice.CallbackFlags."""
+    def __init__(self, **flags): self.__dict__.update(flags)
+    def __bool__(self): return True
+
+
+def test_paced():
+    MONITOR.reset()
+    state.recording = False
+    nxt = time.perf_counter()
+    for i in range(30):
+        nxt += 0.032
+        time.sleep(max(0.0, nxt - time.perf_counter()))
+        audio_callback(BLOCK, 512, _TimeInfo(100 + i * 0.032), None)
+    s = MONITOR.snapshot()
+    assert s["callbacks"] == 30 and sum(MONITOR.jit_hist) == 29
+    assert s["dropped"] == s["overflows"] == s["late"] == 0, s
+    summary, alert = audio_health.check()
+    assert summary.startswith("cb ≤") and "⚠" not in summary and alert is None
+    print(f"  30 paced callbacks: {summary} (max {s['dur_max_ms']:.2f} ms, "
+          f"jitter max {s['jit_max_ms']:.2f} ms)")
+
+
+def test_problems():
+    MONITOR.reset()
+    audio_callback(BLOCK, 512, _TimeInfo(200.000), _Flags(input_overflow=True))
+    audio_callback(BLOCK, 512, _TimeInfo(200.032), _Flags(input_underflow=True))
+    audio_callback(BLOCK, 512, _TimeInfo(200.128), None)     # 2 blocks missing
+    audio_callback(BLOCK, 512, _TimeInfo(200.160), _Flags(priming_output=True))
+    t0 = MONITOR.begin(512)
+    time.sleep(0.045)                                        # over the 32 ms budget
+    MONITOR.end(t0)
+    s = MONITOR.snapshot()
+    assert (s["overflows"], s["underflows"], s["other"], s["dropped"], s["late"]) == (1, 1, 1, 2, 1), s
+    assert s["dur_p99_ms"] == float("inf") and s["dur_max_ms"] > 40
+    print(f"  counted: {s['overflows']} overflow, {s['underflows']} underflow, "
+          f"{s['dropped']} dropped, {s['late']} late ({s['dur_max_ms']:.0f} ms)")
+
+
+def test_rate_limit():
+    summary, alert = audio_health.check(now=1000.0)
+    assert alert and "2 dropped blocks" in alert and "1 late callbacks" in alert, alert
+    assert "⚠ 5" in summary, summary
+    print(f"  alert: {alert}")
+    MONITOR.flags(_Flags(input_overflow=True))
+    assert audio_health.check(now=1010.0)[1] is None, "within 30 s → no alert"
+    MONITOR.flags(_Flags(input_overflow=True))
+    _, alert = audio_health.check(now=1031.0)
+    assert alert and alert.startswith("🎚️  Audio: 2 input overflows (") and "dropped" not in alert, alert
+    assert audio_health.check(now=1100.0)[1] is None, "nothing new → no alert"
+    print("  rate-limited: 1 alert per 30 s, only new problems")
+
+
+def test_no_allocation(n=20000):
+    MONITOR.reset()
+    info = _TimeInfo(0.0)
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    for i in range(n):
+        info.inputBufferAdcTime = 300 + i * 0.032
+        t0 = MONITOR.begin(512, info)
+        MONITOR.end(t0)
+    retained = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    print(f"  {n} updates: {retained} bytes retained")
+    assert retained < 1024, retained
+
+
+if __name__ == "__main__":
+    print("Audio health test")
+    test_paced()
+    test_problems()
+    test_rate_limit()
+    test_no_allocation()
+    print("Done.")
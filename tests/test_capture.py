@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+tests/test_capture.py – Utterance capture and offline replay.
+Run: python tests/test_capture.py
+
+Uses the stub engine plus a "stub-v2" variant that recognizes differently,
+so no model is needed.
+
+Tests:
+  1. Off by default: transcribing writes nothing
+  2. Capture: audio (16-bit, lossless within one LSB) and a JSON record with
+     text, outcome, stage timings and the settings snapshot; the history
+     entry's audio column names the capture; submit() only queues, a full
+     queue drops instead of blocking
+  3. Size limit: the oldest captures are deleted beyond capture_max_mb
+  4. Replay: same engine → no text changes; another engine → word diffs,
+     and --save / --compare round-trip
+"""
+import sys
+import os
+import contextlib
+import io
+import json
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+import ptt.state as state
+from ptt import capture, history, replay
+from ptt.constants import DEFAULTS
+from ptt.engines import register
+from ptt.engines.stub import StubEngine
+from ptt.model_manager import load_model
+from ptt.transcribe import transcribe_and_paste
+
+
+@register
+class StubV2(StubEngine):
+    name = "stub-v2"
+
+    def _reply(self, duration, task):
+        return f"stub {duration:.2f} seconds"
+
+
+def _cfg(folder, **kw):
+    state.cfg.clear(); state.cfg.update(DEFAULTS)
+    state.cfg.update({"model": "small", "device": "cpu", "engine": "stub",
+                      "paste_mode": "clipboard", "history_enabled": False,
+                      "sound_feedback": False, "language": "en",
+                      "capture_dir": folder, **kw})
+
+
+def _speak(seconds):
+    t = np.arange(int(seconds * 16000)) / 16000
+    state.audio_chunks.append((0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)[:, None])
+    transcribe_and_paste()
+
+
+def test_off_by_default(folder):
+    _cfg(folder)
+    assert DEFAULTS["capture_utterances"] is False
+    assert load_model()
+    _speak(1.0)
+    capture.flush()
+    assert not os.listdir(folder)
+    print("  disabled: nothing written")
+
+
+def test_capture(folder):
+    _cfg(folder, capture_utterances=True, history_enabled=True)
+    with tempfile.TemporaryDirectory() as d:
+        store = history._store = history.HistoryStore(os.path.join(d, "history.db"))
+        try:
+            for s in (1.0, 1.5, 2.0):
+                _speak(s)
+            assert capture.flush()
+            store.flush()
+            rows = store.recent()
+        finally:
+            history._store = None
+            store.close()
+    entries = capture.load(folder)
+    assert len(entries) == 3, os.listdir(folder)
+    assert [r["audio"] for r in reversed(rows)] == [cid for cid, _, _ in entries], rows
+    cid, rec, path = entries[1]
+    assert rec["text"] == "stub 1.50 s" and rec["result"] == "ok"
+    assert rec["settings"]["engine"] == "stub" and rec["settings"]["beam_size"] == 5
+    assert {"prepare", "language", "decode", "total"} <= set(rec["timings"]), rec["timings"]
+    audio = capture.read_audio(path)
+    t = np.arange(24000) / 16000
+    assert len(audio) == 24000
+    assert np.max(np.abs(audio - 0.3 * np.sin(2 * np.pi * 220 * t))) < 2 / 32767
+    print(f"  {cid}: {path.name} ({path.stat().st_size} bytes) + json, "
+          f"timings {sorted(rec['timings'])}")
+
+    # hot path only queues; a full queue drops
+    before = capture.dropped
+    big = np.zeros(16000 * 30, dtype=np.float32)
+    t0  = time.perf_counter()
+    sent = [capture.submit(big, text="", result="ok", timings={}) for _ in range(capture.QUEUE_MAX * 3)]
+    dt  = (time.perf_counter() - t0) / len(sent)
+    assert capture.flush()
+    assert capture.dropped - before == sent.count(None)
+    kept = [s for s in sent if s]
+    assert len(set(kept)) == len(kept) and all(os.path.exists(os.path.join(folder, s + ".json"))
+                                               for s in kept)
+    print(f"  submit {dt * 1e6:.0f} µs each, {sent.count(None)} of {len(sent)} dropped while "
+          f"the writer was busy")
+    for _, _, p in capture.load(folder)[3:]:
+        for f in p.parent.glob(p.stem + ".*"):
+            f.unlink()
+
+
+def test_eviction(folder):
+    with tempfile.TemporaryDirectory() as d:
+        _cfg(d, capture_utterances=True, capture_max_mb=1)
+        big = np.zeros(16000 * 20, dtype=np.float32)   # 640 KB as 16-bit WAV
+        for _ in range(3):
+            capture.submit(big, text="", result="ok", timings={})
+            assert capture.flush()
+            time.sleep(0.002)   # distinct file names
+        total = sum(os.path.getsize(os.path.join(d, f)) for f in os.listdir(d))
+        assert len(capture.load(d)) == 1 and total < 1024 * 1024, os.listdir(d)
+    print("  size limit: oldest captures evicted")
+
+
+def _run(*argv):
+    out = io.StringIO()
+    with contextlib.redirect_stdout(out):
+        rc = replay.main(list(argv))
+    return rc, out.getvalue()
+
+
+def test_replay(folder):
+    with tempfile.TemporaryDirectory() as d:
+        base = os.path.join(d, "base.json")
+        rc, out = _run(folder, "--engine", "stub", "--save", base)
+        assert rc == 0 and "0/3 texts changed" in out, out
+        rc, out = _run(folder, "--engine", "stub-v2", "--set", "beam_size=1", "--compare", base)
+        assert rc == 0 and "3/3 texts changed" in out, out
+        assert "stub 1.50 [-s-] {+seconds+}" in out, out
+        saved = json.load(open(base, encoding="utf-8"))
+        assert len(saved["results"]) == 3 and saved["config"]["engine"] == "stub"
+    print("  " + "\n  ".join(out.strip().splitlines()))
+
+
+if __name__ == "__main__":
+    print("Capture / replay test")
+    with tempfile.TemporaryDirectory() as folder:
+        test_off_by_default(folder)
+        test_capture(folder)
+        test_eviction(folder)
+        test_replay(folder)
+    print("Done.")
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+tests/test_downloader.py – Download manager against a local HTTP stand-in.
+Run: python tests/test_downloader.py
+
+A ThreadingHTTPServer mimics the two HuggingFace endpoints the manager uses
+(repo listing API + /resolve/ with Range support, optional per-request delay,
+an injected connection drop and a redirect to a second "CDN" server).
+
+Tests:
+  1. Parallel ranged download of a repo – content and progress are exact
+  2. Resume: a dropped connection leaves a .part; the retry fetches only the
+     missing ranges
+  3. Corrupted download → checksum mismatch is reported, nothing is installed
+  4. Verification is cached by size/mtime: a second load hashes nothing and
+     still reports full progress
+  5. Throughput with simulated latency: 1 vs. 4 connections
+  6. Background prefetch
+  7. HF_TOKEN is sent to the Hub but not forwarded when /resolve/ redirects
+     to the CDN
+"""
+import sys
+import os
+import hashlib
+import json
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from ptt import downloader
+from ptt.downloader import DownloadError, DownloadManager, VerifyCache
+
+REPO  = "Test/whisper-stand-in"
+FILES = {
+    "config.json": b'{"model": "stand-in"}',
+    "model.bin":   os.urandom(3 * 1024 * 1024 + 123),
+    "vocabulary.txt": b"\n".join(b"tok%d" % i for i in range(5000)),
+}
+
+
+class HubHandler(BaseHTTPRequestHandler):
+    files      = FILES
+    delay_s    = 0.0     # per request – simulates network latency
+    drop_after = None    # bytes: close the next model.bin response early
+    corrupt    = False
+    redirect   = None    # base URL: answer /resolve/ with a 302 to it
+    requests   = []
+    auth       = []      # Authorization header of every request
+
+    def log_message(self, *a): pass
+
+    def do_GET(self):
+        cls = type(self)
+        cls.auth.append(self.headers.get("Authorization"))
+        if self.path.startswith(f"/api/models/{REPO}/"):
+            body = json.dumps({"siblings": [
+                {"rfilename": n, "size": len(d),
+                 **({"lfs": {"sha256": hashlib.sha256(d).hexdigest(), "size": len(d)}}
+                    if len(d) > 1024 else {})}
+                for n, d in cls.files.items()]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers(); self.wfile.write(body); return
+
+        name = self.path.rsplit("/", 1)[-1]
+        data = cls.files.get(name)
+        if data is None:
+            self.send_error(404); return
+        if cls.redirect:
+            self.send_response(302)
+            self.send_header("Location", cls.redirect + self.path)
+            self.send_header("Content-Length", "0")
+            self.end_headers(); return
+        if cls.corrupt:
+            data = b"\0" + data[1:]
+        time.sleep(cls.delay_s)
+        rng = self.headers.get("Range")
+        cls.requests.append((name, rng))
+        start, end = 0, len(data) - 1
+        if rng:
+            a, b = rng.split("=")[1].split("-")
+            start, end = int(a), min(int(b), len(data) - 1)
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(data)}")
+        else:
+            self.send_response(200)
+        chunk = data[start:end + 1]
+        self.send_header("Content-Length", str(len(chunk)))
+        self.end_headers()
+        if name == "model.bin" and cls.drop_after is not None and end > start:
+            self.wfile.write(chunk[:cls.drop_after])
+            cls.drop_after = None
+            self.close_connection = True
+            return
+        self.wfile.write(chunk)
+
+
+class CdnHandler(HubHandler):
+    redirect = None
+    requests = []
+    auth     = []
+
+
+def serve(handler=HubHandler):
+    srv = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    return srv, f"http://127.0.0.1:{srv.server_address[1]}"
+
+
+def _reset_handler():
+    HubHandler.delay_s, HubHandler.drop_after, HubHandler.corrupt = 0.0, None, False
+    HubHandler.redirect, HubHandler.requests, HubHandler.auth = None, [], []
+
+
+def test_parallel_download(endpoint):
+    _reset_handler()
+    dest  = Path(tempfile.mkdtemp())
+    seen  = []
+    mgr   = DownloadManager(endpoint, connections=4, part_size=256 * 1024)
+    mgr.fetch_repo(REPO, dest, progress_cb=lambda d, t, r: seen.append((d, t)))
+    for n, d in FILES.items():
+        assert (dest / n).read_bytes() == d, n
+    total = sum(len(d) for d in FILES.values())
+    assert seen[-1] == (total, total) and all(a <= b for (a, _), (b, _) in zip(seen, seen[1:]))
+    assert not list(dest.glob("*.part*"))
+    ranged = sum(1 for n, r in HubHandler.requests if n == "model.bin" and r != "bytes=0-0")
+    print(f"  {total} bytes in {len(FILES)} files, model.bin as {ranged} ranged requests")
+
+
+def test_resume(endpoint):
+    _reset_handler()
+    dest = Path(tempfile.mkdtemp())
+    mgr  = DownloadManager(endpoint, connections=1, part_size=256 * 1024)
+    HubHandler.drop_after = 100_000
+    try:
+        mgr.fetch_repo(REPO, dest, allow=["model.bin"])
+        raise AssertionError("dropped connection not detected")
+    except (DownloadError, OSError):
+        pass
+    assert (dest / "model.bin.part").exists() and not (dest / "model.bin").exists()
+    done_before = len(json.loads((dest / "model.bin.part.json").read_text())["done"])
+    HubHandler.requests = []
+    mgr.fetch_repo(REPO, dest, allow=["model.bin"])
+    assert (dest / "model.bin").read_bytes() == FILES["model.bin"]
+    parts   = -(-len(FILES["model.bin"]) // mgr.part_size)
+    fetched = sum(1 for n, r in HubHandler.requests if r != "bytes=0-0")
+    assert fetched == parts - done_before, (fetched, parts, done_before)
+    print(f"  interrupted after {done_before}/{parts} parts → resumed with {fetched} requests")
+
+
+def test_checksum_mismatch(endpoint):
+    _reset_handler()
+    dest = Path(tempfile.mkdtemp())
+    HubHandler.corrupt = True
+    try:
+        DownloadManager(endpoint).fetch_repo(REPO, dest, allow=["model.bin"])
+        raise AssertionError("corrupt file accepted")
+    except DownloadError as e:
+        assert "checksum" in str(e)
+    assert not (dest / "model.bin").exists() and not list(dest.glob("*.part*"))
+    print("  corrupted download rejected")
+
+
+def test_verify_cache(endpoint):
+    _reset_handler()
+    dest = Path(tempfile.mkdtemp())
+    mgr  = DownloadManager(endpoint)
+    mgr.fetch_repo(REPO, dest)
+    HubHandler.requests = []
+    verify = VerifyCache(dest)
+    for rf in mgr.list_repo(REPO):
+        mgr.fetch_file(rf, dest / rf.name, verify=verify)
+    assert verify.hashed == 0 and not HubHandler.requests
+    assert mgr.is_complete(dest, list(FILES))
+    seen  = []
+    mgr.fetch_repo(REPO, dest, progress_cb=lambda d, t, r: seen.append((d, t)))
+    total = sum(len(d) for d in FILES.values())
+    assert seen[-1] == (total, total), seen
+    # touching the file invalidates the cached result → hashed once more
+    os.utime(dest / "model.bin", ns=(0, 0))
+    assert verify.verified(dest / "model.bin", "model.bin",
+                           hashlib.sha256(FILES["model.bin"]).hexdigest()) and verify.hashed == 1
+    print("  second load: 0 files hashed, 0 bytes downloaded")
+
+
+def test_throughput(endpoint):
+    _reset_handler()
+    HubHandler.delay_s = 0.05
+    times = {}
+    for n in (1, 4):
+        dest = Path(tempfile.mkdtemp())
+        t0 = time.perf_counter()
+        DownloadManager(endpoint, connections=n, part_size=256 * 1024).fetch_repo(
+            REPO, dest, allow=["model.bin"])
+        times[n] = time.perf_counter() - t0
+    print(f"  50 ms/request latency: 1 connection {times[1]:.2f} s, 4 connections {times[4]:.2f} s")
+    assert times[4] < times[1]
+    _reset_handler()
+
+
+def test_prefetch(endpoint):
+    _reset_handler()
+    dest = Path(tempfile.mkdtemp())
+    mgr  = DownloadManager(endpoint)
+    t = downloader.prefetch("stand-in", lambda: mgr.fetch_repo(REPO, dest))
+    assert downloader.prefetch("stand-in", lambda: None) is None   # already running
+    t.join(10)
+    assert mgr.is_complete(dest, list(FILES))
+    print("  background prefetch complete")
+
+
+def test_redirect_drops_token(endpoint):
+    _reset_handler()
+    dest = Path(tempfile.mkdtemp())
+    cdn, cdn_url = serve(CdnHandler)
+    HubHandler.redirect = cdn_url
+    saved = os.environ.get("HF_TOKEN")
+    os.environ["HF_TOKEN"] = "hf_secret"
+    try:
+        DownloadManager(endpoint).fetch_repo(REPO, dest, allow=["model.bin"])
+    finally:
+        if saved is None:
+            os.environ.pop("HF_TOKEN", None)
+        else:
+            os.environ["HF_TOKEN"] = saved
+        cdn.shutdown()
+        _reset_handler()
+    assert (dest / "model.bin").read_bytes() == FILES["model.bin"]
+    assert CdnHandler.requests and not any(CdnHandler.auth), CdnHandler.auth
+    print(f"  {len(CdnHandler.requests)} redirected requests, none carried the token")
+
+
+if __name__ == "__main__":
+    print("Download manager test")
+    srv, endpoint = serve()
+    try:
+        test_parallel_download(endpoint)
+        test_resume(endpoint)
+        test_checksum_mismatch(endpoint)
+        test_verify_cache(endpoint)
+        test_throughput(endpoint)
+        test_prefetch(endpoint)
+        test_redirect_drops_token(endpoint)
+    finally:
+        srv.shutdown()
+    print("Done.")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+tests/test_e2e.py – Headless press → paste cycle with a simulated microphone.
+Run: python tests/test_e2e.py
+
+No sound card, display or model needed: PTT_SIM_AUDIO makes
+start_audio_stream() open ptt.sim's simulated stream, the stub engine
+decodes at 0.1× real time, and the text lands in a CaptureSink.
+
+Tests:
+  1. The simulated stream keeps the 32 ms block pace (and ×10 accelerated)
+     and reports PortAudio-style ADC timestamps and status flags
+  2. Full cycle through _ptt_trigger_press / _ptt_trigger_release: the spoken
+     audio is recorded, transcribed and typed; press→text is timed, and an
+     injected overflow reaches the audio health monitor
+  3. Accelerated stream: the same cycle with a 4 s utterance in ~0.4 s
+"""
+import sys
+import os
+import statistics
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+os.environ["PTT_SIM_AUDIO"] = ""          # silence between utterances
+os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+
+import numpy as np
+
+import ptt.state as state
+from ptt.audio import audio_callback, start_audio_stream
+from ptt.audio_health import MONITOR
+from ptt.constants import DEFAULTS
+from ptt.engines import register
+from ptt.engines.stub import StubEngine
+from ptt.model_manager import load_model
+from ptt.sim import PTTDriver, SimulatedInputStream, Status
+
+SR = 16000
+
+
+@register
+class SlowStub(StubEngine):
+    name = "stub-rtf"
+
+    def _load(self, path, device, **kw):
+        return super()._load(path, device, rtf=0.1)
+
+
+def _speech(seconds):
+    t = np.arange(int(seconds * SR)) / SR
+    return (0.3 * np.sin(2 * np.pi * 180 * t) * (0.5 + 0.5 * np.sin(2 * np.pi * 4 * t))).astype(np.float32)
+
+
+def _setup():
+    state.cfg.clear(); state.cfg.update(DEFAULTS)
+    state.cfg.update({"model": "small", "device": "cpu", "engine": "stub-rtf",
+                      "history_enabled": False, "sound_feedback": False, "language": "en"})
+    assert load_model()
+
+
+def test_stream_pace():
+    for speed, seconds in ((1.0, 0.64), (10.0, 3.2)):
+        seen = []
+        s = SimulatedInputStream(lambda d, n, ti, st: seen.append(
+            (time.perf_counter(), d.shape, ti.inputBufferAdcTime, bool(st))), speed=speed)
+        s.start()
+        s.inject(Status(input_overflow=True))
+        time.sleep(seconds / speed)
+        s.close()
+        n = len(seen)
+        assert abs(n - seconds / 0.032) <= 3, (speed, n)
+        assert seen[0][1] == (512, 1) and seen[0][3] and not any(x[3] for x in seen[1:])
+        assert all(abs(b[2] - a[2] - 0.032) < 1e-9 for a, b in zip(seen, seen[1:]))
+        gaps = [(b[0] - a[0]) * 1000 * speed for a, b in zip(seen, seen[1:])]
+        print(f"  ×{speed:g}: {n} blocks in {seconds / speed:.2f}s, interval median "
+              f"{statistics.median(gaps):.1f} ms (stream time)")
+
+
+def test_press_to_paste(runs=3):
+    _setup()
+    MONITOR.reset()
+    assert start_audio_stream()
+    assert isinstance(state._audio_stream, SimulatedInputStream)
+    driver = PTTDriver()
+    rows = [driver.utterance(_speech(1.0)) for _ in range(runs)]
+    state._audio_stream.inject(Status(input_overflow=True))
+    time.sleep(0.1)
+    for r in rows:
+        # 1 s of speech + ~0.1 s tail, quantized to 32 ms blocks
+        dur = float(r["text"].split()[1])
+        assert r["text"].startswith("stub ") and 1.0 <= dur <= 1.25, r
+        assert r["release_s"] >= 0.1 * dur * 0.9      # stub decodes at RTF 0.1
+    snap = MONITOR.snapshot()
+    assert snap["callbacks"] > 30 * runs and snap["overflows"] == 1, snap
+    med = statistics.median(r["release_s"] for r in rows)
+    print(f"  {runs}× 1.0 s utterance: release→text median {med * 1000:.0f} ms, "
+          f"press→text {statistics.median(r['total_s'] for r in rows) * 1000:.0f} ms")
+    state._audio_stream.close()
+
+
+def test_accelerated():
+    stream = state._audio_stream = SimulatedInputStream(audio_callback, speed=10.0)
+    stream.start()
+    driver = PTTDriver(stream)
+    r = driver.utterance(_speech(4.0))
+    stream.close()
+    assert r["text"].startswith("stub 4.") and r["total_s"] < 2.0, r
+    print(f"  ×10: 4.0 s utterance → '{r['text']}' in {r['total_s']:.2f}s press→text")
+
+
+if __name__ == "__main__":
+    print("End-to-end (simulated audio) test")
+    test_stream_pace()
+    test_press_to_paste()
+    test_accelerated()
+    print("Done.")
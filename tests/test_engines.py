@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+tests/test_engines.py – Engine interface, registry, counters and the PTT hot path.
+Run: python tests/test_engines.py
+
+Uses the deterministic stub engine and a test-local engine registered at
+runtime – no models needed.
+
+Tests:
+  1. Registry: built-ins present, device → engine mapping, unknown names rejected
+  2. Stub engine is deterministic and streams segments word by word
+  3. Counters: calls, audio seconds, RTF, errors, time to first segment
+  4. transcribe_and_paste() runs unchanged on any registered engine; missing
+     capabilities (translate, language detection) are handled by the hot path
+  5. OpenVINO: beam_size becomes num_beams on CPU only – NPU keeps the
+     pipeline's greedy default
+"""
+import sys
+import os
+import time
+import types
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+import ptt.state as state
+from ptt import engines
+from ptt.constants import DEFAULTS
+from ptt.engines import Engine, Info, Segment, register
+from ptt.model_manager import _publish, load_model
+
+SR = 16000
+
+
+def _audio(seconds: float) -> np.ndarray:
+    t = np.arange(int(seconds * SR)) / SR
+    return (0.1 * np.sin(2 * np.pi * 220 * t)).astype(np.float32)
+
+
+@register
+class EchoEngine(Engine):
+    """Minimal third-party style engine: no streaming, no translate, no detection."""
+    name  = "echo"
+    label = "Echo"
+
+    def _load(self, path, device, **_):
+        return object()
+
+    def _transcribe(self, audio, language, task, **opts):
+        self.last = (language, task, opts)
+        if opts.get("beam_size") == 99:
+            raise RuntimeError("boom")
+        return iter([Segment(f"echo {len(audio) / SR:.1f}")]), Info(language, 0.0, len(audio) / SR)
+
+
+def test_registry():
+    assert {"ct2", "openvino", "stub", "echo"} <= set(engines.names())
+    assert engines.for_device("cuda") == "ct2" and engines.for_device("ov_cpu") == "openvino"
+    assert engines.for_device("npu") == "openvino"
+    try:
+        engines.create("nope")
+        raise AssertionError("unknown engine accepted")
+    except ValueError as e:
+        assert "available" in str(e)
+    print(f"  registered: {', '.join(engines.names())}")
+
+
+def test_stub_streaming():
+    eng = engines.create("stub").load(None, "cpu", model_name="stub",
+                                      text="hello world from the stub", latency_s=0.2)
+    audio = _audio(2.0)
+    t0 = time.perf_counter()
+    segments, info = eng.transcribe(audio, language="de")
+    first = next(segments)
+    t_first = time.perf_counter() - t0
+    rest = list(segments)
+    total = time.perf_counter() - t0
+    words = [first.text] + [s.text for s in rest]
+    assert " ".join(words) == "hello world from the stub" and info.language == "de"
+    assert t_first < total / 2, (t_first, total)
+    again, _ = eng.transcribe(audio)
+    assert " ".join(s.text for s in again) == " ".join(words)
+    assert eng.detect_language(audio, ["fr", "de"]) == ("fr", 1.0)
+    print(f"  first segment after {t_first * 1000:.0f} ms of {total * 1000:.0f} ms")
+
+
+def test_counters():
+    eng = engines.create("echo").load(None, "cpu", model_name="echo")
+    for s in (1.0, 2.0, 3.0):
+        list(eng.transcribe(_audio(s))[0])
+    try:
+        eng.transcribe(_audio(1.0), beam_size=99)
+    except RuntimeError:
+        pass
+    st = eng.stats.snapshot()
+    assert st["calls"] == 4 and st["errors"] == 1 and abs(st["audio_s"] - 7.0) < 1e-6
+    assert 0 <= st["rtf"] < 0.1
+    rows = [c for c in engines.counters() if c["model"] == "echo"]
+    assert rows and rows[-1]["calls"] == 4
+    print(f"  echo: {st['calls']} calls, {st['errors']} error, {st['audio_s']:.0f} s audio, "
+          f"RTF {st['rtf']:.4f}")
+
+
+def _run_hot_path(audio):
+    from ptt.transcribe import transcribe_and_paste
+    while not state.ui_queue.empty():
+        state.ui_queue.get_nowait()
+    state.audio_chunks[:] = [audio.reshape(-1, 1)]
+    transcribe_and_paste()
+    msgs = []
+    while not state.ui_queue.empty():
+        msgs.append(state.ui_queue.get_nowait())
+    return msgs
+
+
+def test_hot_path():
+    state.cfg.clear(); state.cfg.update(DEFAULTS)
+    state.cfg.update({"device": "cpu", "paste_mode": "clipboard", "history_enabled": False,
+                      "language": "auto", "output_language": "en",
+                      "language_candidates": "de,fr"})
+    assert load_model(model_name="stub", engine="stub")
+    msgs = _run_hot_path(_audio(1.5))
+    assert ("recognized", "[en] stub 1.50 s") in msgs, msgs
+    assert ("served", "stub", "cpu") in msgs
+
+    # echo: no TRANSLATE and no DETECT_LANGUAGE – same hot path, no changes
+    eng = engines.create("echo").load(None, "cpu", model_name="echo")
+    _publish(eng, name="echo", device="cpu")
+    msgs = _run_hot_path(_audio(1.0))
+    assert ("recognized", "echo 1.0") in msgs, msgs
+    assert eng.last[0] is None and eng.last[1] == "transcribe"
+    assert eng.last[2]["beam_size"] == state.cfg["beam_size"]
+    _publish()
+    print("  stub + echo engines served through transcribe_and_paste()")
+
+
+def test_openvino_beams():
+    class Pipeline:
+        def get_generation_config(self):
+            return types.SimpleNamespace(language=None, task=None, num_beams=1)
+
+    for device, beams in (("CPU", 5), ("NPU", 1)):
+        eng = engines.create("openvino")
+        eng.model, eng.device = Pipeline(), device
+        config = eng.generation_config("de", "transcribe", beam_size=5)
+        assert config.num_beams == beams and config.language == "<|de|>", (device, config)
+        assert eng.supports(engines.BEAM_SEARCH) == (device == "CPU")
+    print("  OpenVINO: beam_size 5 → num_beams 5 on CPU, pipeline default on NPU")
+
+
+if __name__ == "__main__":
+    print("Engine interface test")
+    test_registry()
+    test_stub_streaming()
+    test_counters()
+    test_hot_path()
+    test_openvino_beams()
+    print("Done.")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+tests/test_evdev_hotplug.py – evdev listener loop: epoll, inotify hot-plug, shutdown.
+Run: python tests/test_evdev_hotplug.py
+
+No input devices or python-evdev needed: a stand-in ``evdev`` module serves
+"keyboards" whose fds are pipes, and the inotify watch points at a temp
+directory in place of /dev/input – creating / deleting ``eventN`` there is
+plugging / unplugging.
+
+Tests:
+  1. Start-up: keyboards are attached, other devices skipped; only hotkey
+     keys reach the callbacks (other keys and key-repeat are dropped)
+  2. Hot-plug: a keyboard created later is attached via inotify and serves
+     the hotkey; deleting it detaches it and releases the keys held on it
+  3. A device that hangs up (EPOLLHUP) is detached and its keys released
+  4. Shutdown: _EvdevStop wakes the blocking epoll wait at once; the thread
+     ends and the stop fd is closed
+"""
+import sys
+import os
+import queue
+import struct
+import tempfile
+import threading
+import time
+import types
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+
+import ptt.state as state
+from ptt import hotkey
+
+EV_KEY, EV_MSC = 1, 4
+KEY_LEFTCTRL, KEY_A, KEY_F9 = 29, 30, 67
+EVENT   = struct.Struct("HHi")    # type, code, value
+DEVICES = {}                      # path → (read fd, name, is keyboard)
+
+
+class FakeInputDevice:
+    def __init__(self, path):
+        if path not in DEVICES:
+            raise OSError(19, "No such device")
+        self.path = path
+        self.fd, self.name, self._keyboard = DEVICES[path]
+
+    def capabilities(self):
+        return {EV_KEY: [KEY_A, KEY_F9, KEY_LEFTCTRL] if self._keyboard else [272, 273]}
+
+    def read(self):
+        data = os.read(self.fd, 4096)     # BlockingIOError when empty
+        if not data:
+            raise OSError(19, "No such device")
+        return [types.SimpleNamespace(type=t, code=c, value=v)
+                for t, c, v in EVENT.iter_unpack(data)]
+
+    def close(self):
+        try: os.close(self.fd)
+        except OSError: pass
+
+
+def _fake_evdev(input_dir):
+    ecodes = types.SimpleNamespace(
+        EV_KEY=EV_KEY, KEY_A=KEY_A, KEY_F9=KEY_F9, KEY_LEFTCTRL=KEY_LEFTCTRL, KEY_MAX=0x2ff,
+        KEY={KEY_LEFTCTRL: "KEY_LEFTCTRL", KEY_A: "KEY_A", KEY_F9: "KEY_F9"})
+    mod = types.ModuleType("evdev")
+    mod.ecodes = ecodes
+    mod.InputDevice = FakeInputDevice
+    mod.list_devices = lambda: sorted(os.path.join(input_dir, n) for n in os.listdir(input_dir)
+                                      if n.startswith("event"))
+    return mod
+
+
+def plug(input_dir, node, name, keyboard=True):
+    """Create /dev/input/<node>; returns the write end of its event pipe."""
+    r, w = os.pipe()
+    os.set_blocking(r, False)
+    path = os.path.join(input_dir, node)
+    DEVICES[path] = (r, name, keyboard)
+    open(path, "w").close()
+    return w
+
+
+def key(w, code, value):
+    os.write(w, EVENT.pack(EV_KEY, code, value) + EVENT.pack(EV_MSC, 4, code))
+
+
+class Recorder:
+    def __init__(self):
+        self.events = queue.Queue()
+        self.logs   = []
+
+    def press(self, name):
+        self.events.put(("press", name))
+
+    def release(self, name):
+        self.events.put(("release", name))
+
+    def next(self, timeout=2.0):
+        return self.events.get(timeout=timeout)
+
+    def quiet(self, s=0.1):
+        try:
+            return self.events.get(timeout=s)
+        except queue.Empty:
+            return None
+
+    def wait_log(self, text, timeout=2.0):
+        deadline = time.perf_counter() + timeout
+        while time.perf_counter() < deadline:
+            try:
+                msg = state.ui_queue.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            if msg[0] == "log":
+                self.logs.append(msg[1])
+                if text in msg[1]:
+                    return msg[1]
+        raise AssertionError(f"no log containing {text!r}: {self.logs}")
+
+
+def test_listener(input_dir):
+    rec  = Recorder()
+    kb   = plug(input_dir, "event0", "Laptop keyboard")
+    plug(input_dir, "event1", "USB mouse", keyboard=False)
+    stop = hotkey._EvdevStop()
+    th   = threading.Thread(target=hotkey._evdev_listener_thread, daemon=True,
+                            args=(set(), rec.press, rec.release, stop, {"f9", "ctrl"}))
+    th.start()
+    line = rec.wait_log("evdev listening on")
+    assert "1 device(s): Laptop keyboard" in line, line
+
+    key(kb, KEY_A, 1); key(kb, KEY_F9, 1); key(kb, KEY_F9, 2); key(kb, KEY_F9, 0); key(kb, KEY_A, 0)
+    assert rec.next() == ("press", "f9") and rec.next() == ("release", "f9")
+    assert rec.quiet() is None, "filtered key or repeat reached the callbacks"
+    print("  start-up: keyboard attached, mouse skipped; only f9 down/up delivered")
+
+    t0  = time.perf_counter()
+    usb = plug(input_dir, "event7", "USB keyboard")
+    rec.wait_log("keyboard attached: USB keyboard")
+    attach_ms = (time.perf_counter() - t0) * 1000
+    key(usb, KEY_LEFTCTRL, 1)
+    assert rec.next() == ("press", "ctrl")
+    os.unlink(os.path.join(input_dir, "event7"))    # unplugged with Ctrl held
+    assert rec.next() == ("release", "ctrl")
+    rec.wait_log("keyboard detached: USB keyboard")
+    os.close(usb)
+    print(f"  hot-plug: attached {attach_ms:.1f} ms after the node appeared; "
+          "unplug released the held Ctrl")
+
+    key(kb, KEY_F9, 1)
+    assert rec.next() == ("press", "f9")
+    os.close(kb)                                    # device hangs up
+    assert rec.next() == ("release", "f9")
+    rec.wait_log("keyboard detached: Laptop keyboard")
+    print("  hang-up: detached, held f9 released")
+
+    assert th.is_alive(), "listener must keep waiting for keyboards via inotify"
+    time.sleep(0.05)
+    t0 = time.perf_counter()
+    stop.set()
+    th.join(2)
+    stop_ms = (time.perf_counter() - t0) * 1000
+    assert not th.is_alive() and stop_ms < 100, stop_ms
+    assert stop._r is None, "stop fd left open"
+    print(f"  shutdown: listener ended {stop_ms:.1f} ms after stop.set()")
+
+
+if __name__ == "__main__":
+    print("evdev hot-plug test")
+    probe = hotkey._inotify_watch(tempfile.gettempdir(), hotkey._IN_CREATE)
+    if probe is None:
+        print("inotify not available – skipped")
+        sys.exit(0)
+    os.close(probe)
+    saved = (sys.modules.get("evdev"), hotkey._INPUT_DIR, hotkey._EVDEV_NAMES)
+    with tempfile.TemporaryDirectory() as d:
+        sys.modules["evdev"] = _fake_evdev(d)
+        hotkey._INPUT_DIR, hotkey._EVDEV_NAMES = d, None
+        try:
+            test_listener(d)
+        finally:
+            if saved[0] is None:
+                sys.modules.pop("evdev", None)
+            else:
+                sys.modules["evdev"] = saved[0]
+            hotkey._INPUT_DIR, hotkey._EVDEV_NAMES = saved[1], saved[2]
+    print("Done.")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+tests/test_evdev_table.py – evdev key-name table check + per-event micro-benchmark.
+Run: python tests/test_evdev_table.py
+
+Tests:
+  1. The precomputed table yields the same names as the old per-event lookup
+  2. Per-event cost: old lookup vs. table lookup vs. table + hotkey filter
+     (no input devices needed – synthetic key codes)
+"""
+import sys
+import os
+import random
+import timeit
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+
+try:
+    from evdev import ecodes
+except ImportError:
+    print("evdev not installed: pip install evdev")
+    sys.exit(1)
+
+from ptt.hotkey import (
+    _evdev_key_name, _evdev_name_table, _evdev_wanted_codes, _evdev_normalize,
+)
+
+
+def legacy_key_name(code: int) -> str:
+    """Pre-table implementation (per-event import + linear getattr loops)."""
+    try:
+        from evdev import ecodes
+        if code in (ecodes.KEY_LEFTCTRL,  ecodes.KEY_RIGHTCTRL):  return 'ctrl'
+        if code in (ecodes.KEY_LEFTALT,   ecodes.KEY_RIGHTALT):   return 'alt'
+        if code in (ecodes.KEY_LEFTSHIFT, ecodes.KEY_RIGHTSHIFT): return 'shift'
+        if code in (ecodes.KEY_LEFTMETA,  ecodes.KEY_RIGHTMETA):  return 'cmd'
+        if code == ecodes.KEY_SPACE:     return 'space'
+        if code == ecodes.KEY_ENTER:     return 'enter'
+        if code == ecodes.KEY_BACKSPACE: return 'backspace'
+        if code == ecodes.KEY_TAB:       return 'tab'
+        if code == ecodes.KEY_ESC:       return 'esc'
+        for n in range(1, 13):
+            fk = getattr(ecodes, f'KEY_F{n}', None)
+            if fk is not None and code == fk:
+                return f'f{n}'
+        for c in 'abcdefghijklmnopqrstuvwxyz':
+            ak = getattr(ecodes, f'KEY_{c.upper()}', None)
+            if ak is not None and code == ak:
+                return c
+        for n in range(10):
+            dk = getattr(ecodes, f'KEY_{n}', None)
+            if dk is not None and code == dk:
+                return str(n)
+        names = ecodes.KEY.get(code, None)
+        if isinstance(names, str):
+            return names.replace('KEY_', '').lower()
+        if isinstance(names, list) and names:
+            return names[0].replace('KEY_', '').lower()
+        return f'key_{code}'
+    except Exception:
+        return f'key_{code}'
+
+
+def test_table_matches_legacy():
+    mismatches = [c for c in range(len(_evdev_name_table()))
+                  if _evdev_normalize(legacy_key_name(c)) != _evdev_key_name(c)]
+    assert not mismatches, mismatches[:10]
+    print(f"  {len(_evdev_name_table())} key codes – names identical")
+
+
+def test_per_event_cost(n=200_000):
+    # Typing mix: mostly letters/digits/space, as seen on a normal keyboard
+    pool  = [getattr(ecodes, f"KEY_{c}") for c in "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"]
+    pool += [ecodes.KEY_SPACE, ecodes.KEY_BACKSPACE, ecodes.KEY_ENTER, ecodes.KEY_LEFTSHIFT]
+    codes = [random.choice(pool) for _ in range(1000)]
+    table = _evdev_name_table()
+    wanted = _evdev_wanted_codes({"ctrl", "space"})
+
+    def old():
+        for c in codes: _evdev_normalize(legacy_key_name(c))
+    def new():
+        for c in codes: table[c]
+    def filtered():
+        for c in codes:
+            if c in wanted: table[c]
+
+    reps = max(1, n // len(codes))
+    print(f"  {'path':<22s} {'ns/event':>10s}")
+    for label, fn in [("old lookup", old), ("table lookup", new),
+                      ("table + hotkey filter", filtered)]:
+        t = timeit.timeit(fn, number=reps)
+        print(f"  {label:<22s} {t / (reps * len(codes)) * 1e9:>10.0f}")
+
+
+if __name__ == "__main__":
+    print("evdev key table test")
+    test_table_matches_legacy()
+    test_per_event_cost()
+    print("Done.")
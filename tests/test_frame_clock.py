@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+tests/test_frame_clock.py – Overlay animation wakeup / CPU measurement.
+Run: python tests/test_frame_clock.py [--tk]
+
+Compares the old per-animation after() loops (meter every 40 ms forever,
+pulse / spinner every 400 ms) against the unified FrameClock:
+  1. Simulated timeline (no display needed): wakeups during 60 s idle,
+     10 s recording and 60 s minimized
+  2. --tk: real Tk root, CPU time spent by an idle overlay for 5 s
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from ptt.ui.frame_clock import FrameClock, FRAME_MS
+
+
+class FakeRoot:
+    """Minimal after()/after_cancel() scheduler driven by a virtual clock."""
+
+    def __init__(self):
+        self.now  = 0
+        self.jobs = {}
+        self._id  = 0
+        self.wakeups = 0
+
+    def after(self, ms, fn):
+        self._id += 1
+        self.jobs[self._id] = (self.now + ms, fn)
+        return self._id
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run_until(self, t_ms):
+        while True:
+            due = [(t, j) for j, (t, _) in self.jobs.items() if t <= t_ms]
+            if not due:
+                break
+            t, j = min(due)
+            _, fn = self.jobs.pop(j)
+            self.now = t
+            self.wakeups += 1
+            fn()
+        self.now = t_ms
+
+
+def legacy_loops(root, recording):
+    """Re-creation of the pre-FrameClock loops (_animate_meter + _pulse)."""
+    def meter():
+        root.after(40, meter)
+    def pulse():
+        if recording[0]:
+            root.after(400, pulse)
+    meter()
+    return pulse
+
+
+def simulate(use_clock: bool) -> dict:
+    root      = FakeRoot()
+    recording = [False]
+    phases    = {}
+
+    if use_clock:
+        clock = FrameClock(root)
+        def start_recording():
+            clock.start("meter", lambda f: recording[0])
+            clock.start("pulse", lambda f: recording[0])
+        minimize = clock.pause
+    else:
+        pulse = legacy_loops(root, recording)
+        def start_recording(): pulse()
+        minimize = lambda: None
+
+    t = 0
+    for name, dur, action in [
+        ("idle 60 s",      60_000, None),
+        ("recording 10 s", 10_000, "record"),
+        ("idle 60 s (2)",  60_000, "stop"),
+        ("minimized 60 s", 60_000, "minimize"),
+    ]:
+        if action == "record":
+            recording[0] = True; start_recording()
+        elif action == "stop":
+            recording[0] = False
+        elif action == "minimize":
+            minimize()
+        before = root.wakeups
+        t += dur
+        root.run_until(t)
+        phases[name] = root.wakeups - before
+    return phases
+
+
+def test_idle_wakeups():
+    old = simulate(use_clock=False)
+    new = simulate(use_clock=True)
+    print(f"  {'phase':<16s} {'old loops':>10s} {'FrameClock':>11s}")
+    for k in old:
+        print(f"  {k:<16s} {old[k]:>10d} {new[k]:>11d}")
+    # Idle and minimized overlays must not wake up for animation at all
+    # (the first idle phase after recording may see one final meter frame).
+    assert new["idle 60 s"] == 0
+    assert new["minimized 60 s"] == 0
+    assert new["idle 60 s (2)"] <= 1
+    assert new["recording 10 s"] <= 10_000 // FRAME_MS + 1
+
+
+def test_tk_idle_cpu(seconds=5.0):
+    import tkinter as tk
+    root = tk.Tk()
+    cv   = tk.Canvas(root, width=300, height=16); cv.pack()
+    bar  = cv.create_rectangle(0, 0, 0, 16)
+
+    def measure(label):
+        root.update()
+        c0, w0 = time.process_time(), time.perf_counter()
+        root.after(int(seconds * 1000), root.quit)
+        root.mainloop()
+        cpu = time.process_time() - c0
+        print(f"  {label:<12s} CPU {cpu*1000:7.1f} ms over {time.perf_counter()-w0:.1f} s")
+        return cpu
+
+    job = [None]
+    def meter():
+        cv.coords(bar, 0, 0, 150, 16); cv.itemconfig(bar, fill="#00d4aa")
+        job[0] = root.after(40, meter)
+    meter()
+    old = measure("old loop")
+    root.after_cancel(job[0])
+
+    FrameClock(root)   # nothing subscribed → no wakeups
+    new = measure("FrameClock")
+    root.destroy()
+    return old, new
+
+
+if __name__ == "__main__":
+    print("Overlay animation wakeups – simulated timeline")
+    test_idle_wakeups()
+    if "--tk" in sys.argv:
+        print("\nIdle overlay CPU – real Tk")
+        test_tk_idle_cpu()
+    print("Done.")
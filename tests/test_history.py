@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+tests/test_history.py – Transcript history store: batching + search latency.
+Run: python tests/test_history.py [entries]
+
+Tests:
+  1. add() from the transcription thread is batched into few transactions
+  2. Search over 100k entries (default): FTS prefix query latency vs. LIKE scan
+  3. Deleted entries disappear from the index
+  4. A query of nothing but quotes lists the newest entries instead of
+     failing on an empty MATCH
+"""
+import sys
+import os
+import random
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from ptt.history import HistoryStore
+
+WORDS = ("meeting agenda invoice customer deadline project budget review "
+         "Angebot Rechnung Termin Kunde Besprechung Projekt Entwurf Freigabe "
+         "server deploy backup release ticket sprint roadmap feedback").split()
+
+
+def _store():
+    return HistoryStore(os.path.join(tempfile.mkdtemp(), "history.db"))
+
+
+def _sentence(rnd):
+    return " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(6, 30)))
+
+
+def test_batched_writes(n=500):
+    store = _store()
+    t0 = time.perf_counter()
+    for i in range(n):
+        store.add(f"utterance {i}", model="base", device="cpu", latency_ms=420.0)
+    enqueue_us = (time.perf_counter() - t0) / n * 1e6
+    assert store.flush()
+    assert store.count() == n
+    print(f"  {n} adds: {enqueue_us:.1f} µs/add on caller, {store.writes} transactions")
+    assert store.writes < n // 10
+    row = store.recent(1)[0]
+    assert row["text"] == f"utterance {n-1}" and row["model"] == "base"
+    store.close()
+
+
+def test_search_latency(n=100_000):
+    store = _store()
+    rnd   = random.Random(1)
+    now   = time.time()
+    rows  = [(now - i, _sentence(rnd), "base", "cpu", "de", 400.0, None) for i in range(n)]
+    rows[n // 2] = (now, "Die Quartalsrechnung für Kunde Zebraholz ist fertig",
+                    "base", "cpu", "de", 400.0, None)
+    t0 = time.perf_counter()
+    store.add_many(rows)
+    print(f"  inserted {n} entries in {time.perf_counter()-t0:.1f} s (fts={store.fts})")
+
+    def timed(fn, reps=20):
+        t0 = time.perf_counter()
+        for _ in range(reps): res = fn()
+        return res, (time.perf_counter() - t0) / reps * 1000
+
+    hit, ms_rare = timed(lambda: store.search("zebra"))
+    assert len(hit) == 1 and "Zebraholz" in hit[0]["text"]
+    common, ms_common = timed(lambda: store.search("rechnung kunde"))
+    assert common and all("kunde" in r["text"].lower() for r in common)
+    _, ms_like = timed(lambda: store._select(
+        "SELECT * FROM entries WHERE text LIKE ? ORDER BY id DESC LIMIT 100", ("%zebra%",)), 3)
+
+    print(f"  {'query':<26s} {'ms':>8s}")
+    print(f"  {'rare word (FTS)':<26s} {ms_rare:>8.2f}")
+    print(f"  {'two common words (FTS)':<26s} {ms_common:>8.2f}")
+    print(f"  {'rare word (LIKE scan)':<26s} {ms_like:>8.2f}")
+    if store.fts:
+        assert ms_rare < 20 and ms_common < 50, (ms_rare, ms_common)
+    store.close()
+
+
+def test_delete():
+    store = _store()
+    store.add("remove me please"); store.add("keep me")
+    store.flush()
+    entry = store.search("remove")[0]
+    store.delete(entry["id"])
+    assert store.search("remove") == [] and len(store.search("keep")) == 1
+    store.close()
+
+
+def test_quote_only_query():
+    store = _store()
+    store.add("first"); store.add("second")
+    store.flush()
+    for q in ('"', '""', ' " " '):
+        assert [e["text"] for e in store.search(q)] == ["second", "first"], q
+    store.close()
+    print("  quote-only query → newest entries")
+
+
+if __name__ == "__main__":
+    print("History store test")
+    test_batched_writes()
+    test_search_latency(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
+    test_delete()
+    test_quote_only_query()
+    print("Done.")
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+tests/test_idle.py – Idle unload and reload overlapping the recording.
+Run: python tests/test_idle.py
+
+A test engine holds a 400 MB buffer as its "model" and takes 0.6 s to load,
+so no real model is needed.
+
+Tests:
+  1. The watcher unloads after idle_unload_min; resident memory drops.  It
+     sleeps until the idle deadline (a press moves it), exists only while
+     unloading is enabled and the model is loaded, and a shorter setting
+     wakes it
+  2. PTT press on a parked model starts the reload at once: with 0.5 s of
+     recording only the remaining ~0.1 s is waited for after release, and the
+     utterance is transcribed by the reloaded model
+  3. Nothing is unloaded while recording or when unloading is disabled
+"""
+import sys
+import os
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+import ptt.state as state
+from ptt import idle
+from ptt.constants import DEFAULTS
+from ptt.engines import register
+from ptt.engines.stub import StubEngine
+from ptt.hardware import process_rss
+from ptt.model_manager import load_model
+
+LOAD_S   = 0.6
+MODEL_MB = 400
+
+
+@register
+class HeavyStubEngine(StubEngine):
+    name = "heavy"
+
+    def _load(self, path, device, **kw):
+        time.sleep(LOAD_S)
+        super()._load(path, device, text="reloaded fine", **kw)
+        return np.ones(MODEL_MB * 1024 * 1024 // 8)   # touched → resident
+
+
+def _mb(n): return n / 1048576
+
+
+def _reset():
+    state.cfg.clear(); state.cfg.update(DEFAULTS)
+    state.cfg.update({"model": "large-v3", "device": "cpu", "engine": "heavy",
+                      "paste_mode": "clipboard", "history_enabled": False,
+                      "sound_feedback": False, "language": "en"})
+    assert load_model()
+
+
+def _wait_parked(timeout=3):
+    deadline = time.perf_counter() + timeout
+    while not idle.is_parked() and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    return idle.is_parked()
+
+
+def test_watcher_unload():
+    _reset()
+    state.cfg["idle_unload_min"] = 0
+    idle.start()
+    assert idle._watcher is None, "watcher running with unloading disabled"
+    state.cfg["idle_unload_min"] = 60          # armed, deadline far away …
+    idle.start()
+    watcher = idle._watcher
+    assert watcher is not None and watcher.is_alive()
+    time.sleep(0.1)
+    before = process_rss()
+    state.cfg["idle_unload_min"] = 0.5 / 60     # … settings: 0.5 s
+    idle.touch()
+    t0 = time.perf_counter()
+    idle.start()
+    time.sleep(0.3)
+    idle.touch()                               # PTT press moves the deadline
+    t1 = time.perf_counter()
+    assert _wait_parked()
+    waited = time.perf_counter() - t1
+    after = process_rss()
+    assert state.engine is None and 0.45 < waited < 0.65, waited
+    watcher.join(1)
+    assert not watcher.is_alive() and idle._watcher is None   # parked: no thread
+    print(f"  unloaded {waited:.2f} s after the last press (limit 0.5 s, "
+          f"{time.perf_counter() - t0:.2f} s after arming): RSS {_mb(before):.0f} → {_mb(after):.0f} MB")
+    assert before - after > MODEL_MB * 0.8 * 1048576, (before, after)
+    state.cfg["idle_unload_min"] = 0
+
+
+def test_reload_overlaps_recording(record_s=0.5):
+    from ptt.transcribe import transcribe_and_paste
+    assert idle.is_parked()
+    while not state.ui_queue.empty():
+        state.ui_queue.get_nowait()
+    t0 = time.perf_counter()
+    # what hotkey._ptt_trigger_press() does before it starts recording
+    assert idle.ensure_loaded(), "press on a parked model must record"
+    state.recording = True
+    state.audio_chunks.append((0.1 * np.ones((int(record_s * 16000), 1))).astype(np.float32))
+    time.sleep(record_s)
+    state.recording = False
+    t_release = time.perf_counter()
+    transcribe_and_paste()
+    waited = time.perf_counter() - t_release
+    msgs = []
+    while not state.ui_queue.empty():
+        msgs.append(state.ui_queue.get_nowait())
+    assert ("recognized", "reloaded fine") in msgs, msgs
+    assert not idle.is_parked() and state.engine is not None
+    print(f"  reload {LOAD_S:.1f} s, recording {record_s:.1f} s → "
+          f"{waited:.2f} s after release (cold start {time.perf_counter() - t0:.2f} s total)")
+    assert waited < LOAD_S - record_s + 0.35
+
+
+def test_no_unload_while_busy():
+    state.recording = True
+    try:
+        assert not idle.unload()
+    finally:
+        state.recording = False
+    assert state.engine is not None
+    assert idle.unload() and idle.ensure_loaded()
+    assert idle.wait_ready(5) and idle._watcher is None
+    print("  busy → kept; disabled watcher leaves the model alone")
+
+
+if __name__ == "__main__":
+    print("Idle unload test")
+    test_watcher_unload()
+    test_reload_overlaps_recording()
+    test_no_unload_while_busy()
+    print("Done.")
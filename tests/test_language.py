@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+tests/test_language.py – Sticky language cache + restricted candidate detection.
+Run: python tests/test_language.py
+
+Tests:
+  1. The cache locks a language after STICKY_HITS confident detections in a row
+     (low-confidence or alternating detections don't lock)
+  2. Restricting to de/en renormalises over those tokens only – a sentence the
+     full detector scores as Dutch is returned as German
+  3. 20 utterances with a fake model: detection runs until the language sticks,
+     then is skipped
+"""
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+import ptt.state as state
+from ptt import language
+from ptt.engines import create
+from ptt.language import LanguageCache, STICKY_HITS, restrict_probs
+
+# Detector output for a German sentence with a Dutch-sounding start
+PROBS = [("nl", 0.46), ("de", 0.41), ("af", 0.06), ("en", 0.04), ("fr", 0.03)]
+
+
+class FakeFeatureExtractor:
+    nb_max_frames = 3000
+    def __call__(self, audio):
+        return np.zeros((80, max(1, len(audio) // 160)), dtype=np.float32)
+
+class FakeCT2:
+    def __init__(self): self.calls = 0
+    def detect_language(self, encoder_output):
+        self.calls += 1
+        return [[(f"<|{l}|>", p) for l, p in PROBS]]
+
+class FakeModel:
+    def __init__(self):
+        self.feature_extractor = FakeFeatureExtractor()
+        self.model = FakeCT2()
+        self.encoded_shapes = []
+    def encode(self, features):
+        self.encoded_shapes.append(features.shape)
+        return object()
+
+
+def test_cache():
+    c = LanguageCache()
+    for _ in range(STICKY_HITS - 1):
+        assert not c.observe("de", 0.95)
+    c.observe("en", 0.95)                 # streak broken
+    for _ in range(STICKY_HITS - 1):
+        assert not c.observe("de", 0.95)
+    assert not c.observe("de", 0.5)       # not confident → no hit
+    assert c.sticky is None
+    for i in range(STICKY_HITS):
+        locked = c.observe("de", 0.9)
+    assert locked and c.sticky == "de"
+    c.reset()
+    assert c.sticky is None and c.last is None
+    print(f"  locks after {STICKY_HITS} confident hits in a row; reset clears it")
+
+
+def test_restricted():
+    assert restrict_probs(PROBS, {"de", "en", "nl"})[0] == "nl"
+    lang, prob = restrict_probs(PROBS, {"de", "en"})
+    assert lang == "de" and abs(prob - 0.41 / 0.45) < 1e-9
+    model = FakeModel()
+    lang, prob = language.detect_restricted(model, np.zeros(16000, np.float32), ["de", "en"])
+    assert lang == "de" and model.encoded_shapes == [(80, 3000)]
+    print(f"  full set → nl, restricted to de/en → {lang} (p={prob:.2f})")
+
+
+def test_detection_skipped(n=20):
+    state.cfg.clear()
+    state.cfg.update({"language_candidates": "de,en", "sticky_language": True})
+    language.reset()
+    model = FakeModel()
+    engine = create("ct2", model)
+    audio = np.zeros(32000, np.float32)
+    langs = [language.resolve_language(engine, audio)[0] for _ in range(n)]
+    assert set(langs) == {"de"}
+    # restricted probability 0.91 ≥ STICKY_PROB → sticky after STICKY_HITS utterances
+    assert model.model.calls == STICKY_HITS, model.model.calls
+    assert language.cache.sticky == "de"
+    print(f"  {n} utterances → {model.model.calls} detections, {n - model.model.calls} skipped")
+    language.reset()
+    language.resolve_language(engine, audio)
+    assert model.model.calls == STICKY_HITS + 1
+
+
+if __name__ == "__main__":
+    print("Language cache test")
+    test_cache()
+    test_restricted()
+    test_detection_skipped()
+    print("Done.")
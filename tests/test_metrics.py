@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+tests/test_metrics.py – Prometheus metrics exporter.
+Run: python tests/test_metrics.py
+
+Uses the stub engine, so no model is needed.
+
+Tests:
+  1. Text format: HELP/TYPE per metric, cumulative histogram buckets,
+     +Inf bucket == _count, escaped label values
+  2. Pipeline: a model load, an utterance, a silent recording and callback
+     overflows show up in a scrape of the localhost endpoint
+  3. Textfile exporter writes the file atomically and once more on stop()
+  4. Cost of an update on the hot path (no lock)
+"""
+import sys
+import os
+import re
+import tempfile
+import time
+import urllib.request
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+import ptt.state as state
+from ptt import metrics
+from ptt.constants import DEFAULTS
+
+LINE = re.compile(r'^(# (HELP|TYPE) \w+ .+|\w+(\{(\w+="[^"]*",?)+\})? -?[\d.e+-]+|\w+\{.*le="\+Inf".*\} \d+)$')
+
+
+def _value(text, series):
+    for line in text.splitlines():
+        if line.startswith(series + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_format():
+    h = metrics.Histogram("ptt_test_seconds", "test", (0.1, 1.0), label="stage")
+    for v in (0.05, 0.5, 0.5, 3.0):
+        h.labels('we"ird').observe(v)
+    out = "\n".join(h.render())
+    assert '# TYPE ptt_test_seconds histogram' in out
+    assert _value(out, 'ptt_test_seconds_bucket{stage="we\\"ird",le="0.1"}') == 1
+    assert _value(out, 'ptt_test_seconds_bucket{stage="we\\"ird",le="1.0"}') == 3
+    assert _value(out, 'ptt_test_seconds_bucket{stage="we\\"ird",le="+Inf"}') == 4
+    assert _value(out, 'ptt_test_seconds_count{stage="we\\"ird"}') == 4
+    assert _value(out, 'ptt_test_seconds_sum{stage="we\\"ird"}') == 4.05
+    metrics._REGISTRY.remove(h)
+    bad = [l for l in metrics.render().splitlines() if not LINE.match(l)]
+    assert not bad, bad
+    print("  exposition format ok")
+
+
+class _Flags:
+    """Stands in for sounddevice.CallbackFlags."""
+    def __init__(self, **flags): self.__dict__.update(flags)
+    def __bool__(self): return True
+    def __str__(self): return "input overflow"
+
+
+def test_pipeline_scrape():
+    from ptt.audio import audio_callback
+    from ptt.model_manager import load_model
+    from ptt.transcribe import transcribe_and_paste
+    state.cfg.clear(); state.cfg.update(DEFAULTS)
+    state.cfg.update({"model": "small", "device": "cpu", "engine": "stub",
+                      "paste_mode": "clipboard", "history_enabled": False,
+                      "sound_feedback": False, "language": "en", "metrics_port": 19464})
+    assert metrics.start()
+    try:
+        assert load_model()
+        state.audio_chunks.append((0.1 * np.ones((32000, 1))).astype(np.float32))
+        transcribe_and_paste()
+        state.audio_chunks.append(np.zeros((16000, 1), dtype=np.float32))
+        transcribe_and_paste()
+        block = np.zeros((512, 1), dtype=np.float32)
+        for _ in range(3):
+            audio_callback(block, 512, None, _Flags(input_overflow=True))
+        audio_callback(block, 512, None, None)
+        with urllib.request.urlopen("http://127.0.0.1:19464/metrics", timeout=5) as r:
+            assert r.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            text = r.read().decode("utf-8")
+    finally:
+        metrics.stop()
+    assert _value(text, 'ptt_utterances_total{result="ok"}') == 1
+    assert _value(text, 'ptt_utterances_total{result="silent"}') == 1
+    assert _value(text, "ptt_silent_recordings_total") == 1
+    assert _value(text, 'ptt_audio_callback_status_total{flag="input_overflow"}') == 3
+    assert _value(text, 'ptt_stage_seconds_count{stage="decode"}') == 1
+    assert _value(text, 'ptt_stage_seconds_count{stage="total"}') == 1
+    assert _value(text, "ptt_realtime_factor_count") == 1
+    assert _value(text, "ptt_audio_seconds_total") == 2
+    assert _value(text, 'ptt_model_load_seconds_count{engine="stub"}') == 1
+    assert _value(text, "ptt_ui_queue_depth") > 0
+    assert _value(text, "ptt_model_loaded") == 1
+    assert _value(text, 'ptt_engine_calls{engine="stub/small"}') >= 1
+    print(f"  scrape: {len(text.splitlines())} lines, utterance / silence / overflow / load counted")
+
+
+def test_textfile():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "ptt.prom")
+        state.cfg.update({"metrics_port": 0, "metrics_textfile": path})
+        assert metrics.start()
+        deadline = time.time() + 3
+        while not os.path.exists(path) and time.time() < deadline:
+            time.sleep(0.02)
+        metrics.UTTERANCES.labels("ok").inc()
+        metrics.stop()
+        text = open(path, encoding="utf-8").read()
+        assert _value(text, 'ptt_utterances_total{result="ok"}') == 2, "final write on stop"
+        assert os.listdir(d) == ["ptt.prom"], os.listdir(d)
+    print("  textfile written and refreshed on stop")
+
+
+def test_update_cost(n=200_000):
+    c, h = metrics.UTTERANCES.labels("bench"), metrics.STAGE.labels("bench")
+    t0 = time.perf_counter()
+    for _ in range(n):
+        c.inc()
+    t1 = time.perf_counter()
+    for _ in range(n):
+        h.observe(0.3)
+    t2 = time.perf_counter()
+    inc_ns, obs_ns = (t1 - t0) / n * 1e9, (t2 - t1) / n * 1e9
+    print(f"  counter inc {inc_ns:.0f} ns, histogram observe {obs_ns:.0f} ns")
+    assert obs_ns < 20_000
+
+
+if __name__ == "__main__":
+    print("Metrics test")
+    test_format()
+    test_pipeline_scrape()
+    test_textfile()
+    test_update_cost()
+    print("Done.")
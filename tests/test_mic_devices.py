@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+tests/test_mic_devices.py – Cached microphone list and capability probe.
+Run: python tests/test_mic_devices.py
+
+PortAudio is replaced by a stand-in with 12 input endpoints whose
+check_input_settings() takes 20 ms (slow ALSA / PipeWire probing), so no
+sound card is needed.
+
+Tests:
+  1. First scan lists and probes every input device; devices() / supports()
+     answer from memory and the result is written to mic_devices.json
+  2. Next start: the list comes from the file without touching PortAudio, and
+     the re-scan probes nothing when the devices are unchanged; a cached
+     probe result is ignored once its index belongs to another device
+  3. Hot-plug: a new device appears only after PortAudio is re-initialised –
+     never while a stream is open – and only the new device is probed
+  4. start_audio_stream() goes straight to the default device when the
+     selected one can't record 16 kHz (no failing trial open)
+  5. refresh() runs in the background and calls back when done
+"""
+import sys
+import os
+import tempfile
+import threading
+import time
+import types
+from pathlib import Path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import ptt.state as state
+from ptt import audio, mic_devices
+from ptt.constants import DEFAULTS
+
+PROBE_S = 0.02
+
+
+class FakePortAudio:
+    def __init__(self):
+        self.devices = [{"name": "Speakers", "hostapi": 0, "max_input_channels": 0,
+                         "default_samplerate": 48000.0}]
+        for i in range(12):
+            self.devices.append({"name": f"hw:{i} Mic ", "hostapi": 0, "max_input_channels": 2,
+                                 "default_samplerate": 48000.0 if i == 3 else 44100.0})
+        self.plugged = []          # visible after _initialize()
+        self.default = types.SimpleNamespace(device=[1, 0])
+        self.calls   = 0
+        self.inits   = 0
+
+    def query_devices(self, device=None):
+        self.calls += 1
+        if device is not None:
+            return dict(self.devices[device])
+        return list(self.devices)
+
+    def query_hostapis(self):
+        return [{"name": "ALSA"}]
+
+    def check_input_settings(self, device, channels, dtype, samplerate):
+        self.calls += 1
+        time.sleep(PROBE_S)
+        if self.devices[device]["name"].startswith("hw:3") and samplerate != 48000:
+            raise ValueError("Invalid sample rate")
+
+    def _terminate(self):
+        pass
+
+    def _initialize(self):
+        self.inits += 1
+        self.devices += self.plugged
+        self.plugged = []
+
+
+def _new_process():
+    mic_devices._loaded, mic_devices._entries, mic_devices._default = False, [], None
+
+
+def test_first_scan(pa):
+    t0 = time.perf_counter()
+    assert mic_devices.scan() is True
+    dt = time.perf_counter() - t0
+    assert mic_devices.probed == 12 and dt >= 12 * 3 * PROBE_S * 0.9
+    devs = mic_devices.devices()
+    assert list(devs)[0] == -1 and devs[-1] == "Default  [hw:0 Mic]" and devs[1] == "hw:0 Mic"
+    assert 0 not in devs and len(devs) == 13
+    assert mic_devices.supports(1) is True and mic_devices.supports(4) is False
+    assert mic_devices.supports(-1) is True and mic_devices.supports(99) is None
+    assert mic_devices.MIC_CACHE_FILE.exists()
+    print(f"  first scan: 12 devices probed in {dt * 1000:.0f} ms")
+    return dt
+
+
+def test_cached(pa, first_s):
+    _new_process()
+    pa.calls = 0
+    t0 = time.perf_counter()
+    devs = mic_devices.devices()
+    lookup = time.perf_counter() - t0
+    assert len(devs) == 13 and pa.calls == 0
+    assert mic_devices.supports(4) is False
+    # a device plugged in between runs took index 4: the cached probe is stale
+    real = pa.devices
+    pa.devices = real[:4] + [{"name": "USB Headset", "hostapi": 0, "max_input_channels": 1,
+                              "default_samplerate": 16000.0}] + real[4:]
+    assert mic_devices.supports(4) is None and mic_devices.supports(5) is None
+    pa.devices = real
+    t0 = time.perf_counter()
+    assert mic_devices.scan() is False
+    rescan = time.perf_counter() - t0
+    assert mic_devices.probed == 0 and rescan < first_s / 5
+    print(f"  next start: list from cache in {lookup * 1e6:.0f} µs, re-scan "
+          f"{rescan * 1000:.1f} ms (0 probed) vs {first_s * 1000:.0f} ms")
+
+
+def test_hotplug(pa):
+    pa.plugged = [{"name": "USB Headset", "hostapi": 0, "max_input_channels": 1,
+                   "default_samplerate": 16000.0}]
+    state._audio_stream = object()               # a stream is open
+    assert mic_devices.scan(reinit=True) is False and pa.inits == 0
+    state._audio_stream = None
+    assert mic_devices.scan(reinit=True) is True and pa.inits == 1
+    assert mic_devices.probed == 1 and mic_devices.devices()[13] == "USB Headset"
+    assert mic_devices.supports(13) is True
+    print("  hot-plug: seen after re-init (skipped while a stream was open), 1 device probed")
+
+
+def test_stream_fallback():
+    opened = []
+
+    class Stream:
+        def stop(self): pass
+        def close(self): pass
+
+    def fake_open(device, samplerate=16000, suppress_errors=False, **kw):
+        opened.append(device)
+        return Stream()
+
+    real, audio._open_input_stream = audio._open_input_stream, fake_open
+    try:
+        state.cfg["mic_device"] = 4                 # 48 kHz only
+        assert audio.start_audio_stream() and opened == [None]
+        opened.clear()
+        state.cfg["mic_device"] = 2
+        assert audio.start_audio_stream() and opened == [2]
+    finally:
+        audio._open_input_stream = real
+        state._audio_stream = None
+    print("  unsupported selected mic → default opened directly, no trial open")
+
+
+def test_refresh(pa):
+    done = threading.Event()
+    t0 = time.perf_counter()
+    t  = mic_devices.refresh(on_done=done.set)
+    t2 = mic_devices.refresh(on_done=lambda: None)   # joins the running scan
+    call = time.perf_counter() - t0
+    assert t is t2 and t.name == "mic-scan" and call < 0.01
+    assert done.wait(5)
+    print(f"  refresh(): returned in {call * 1e6:.0f} µs, callback after the scan")
+
+
+if __name__ == "__main__":
+    print("Mic device cache test")
+    state.cfg.clear(); state.cfg.update(DEFAULTS)
+    with tempfile.TemporaryDirectory() as d:
+        mic_devices.MIC_CACHE_FILE = Path(d) / "mic_devices.json"
+        pa = mic_devices.sd = FakePortAudio()
+        _new_process()
+        first = test_first_scan(pa)
+        test_cached(pa, first)
+        test_hotplug(pa)
+        test_stream_fallback()
+        test_refresh(pa)
+    print("Done.")
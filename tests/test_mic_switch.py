@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+tests/test_mic_switch.py – Gapless microphone hot-switch.
+Run: python tests/test_mic_switch.py
+
+Every "device" is a ptt.sim stream playing its own tone (mic 2: 300 Hz,
+mic 5: 1000 Hz), so no sound card is needed.
+
+Tests:
+  1. Switching during a recording: the new stream opens next to the old one
+     and takes over at a block boundary – recorded samples match the wall
+     time (no gap, nothing twice), the tone changes from mic 2 to mic 5, and
+     the switch time is logged and exported as ptt_mic_switch_seconds
+  2. 🎤 restart during a recording hot-switches; without a recording it
+     reopens – neither path sleeps or asks for Windows permission
+  3. A new stream that delivers no audio is closed again and the old one
+     keeps recording; a device that can't be opened twice is reopened
+"""
+import sys
+import os
+import tempfile
+import time
+import types
+from pathlib import Path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+import ptt.state as state
+from ptt import audio, metrics, mic_devices
+from ptt.constants import DEFAULTS
+from ptt.sim import BLOCK, SimulatedInputStream
+
+SR    = 16000
+TONES = {2: 300.0, 5: 1000.0}
+opened, busy = [], set()
+
+
+class DeadStream(SimulatedInputStream):
+    def start(self): pass             # opens fine, never calls back
+
+
+def _tone(freq):
+    t = np.arange(SR) / SR            # 1 s loop, whole periods
+    return (0.3 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def fake_open(device, samplerate=16000, suppress_errors=False, callback=audio.audio_callback):
+    if device in busy and any(s.active for s in opened):
+        raise OSError("Device unavailable")
+    cls = DeadStream if device == 9 else SimulatedInputStream
+    stream = cls(callback, samplerate, source=_tone(TONES.get(device, 500.0)))
+    stream.start()
+    opened.append(stream)
+    return stream
+
+
+def _freq(x):
+    return np.count_nonzero(np.diff(np.signbit(x))) * SR / 2 / len(x)
+
+
+def _logs():
+    out = []
+    while not state.ui_queue.empty():
+        msg = state.ui_queue.get_nowait()
+        if msg[0] == "log":
+            out.append(msg[1])
+    return out
+
+
+def _record(seconds_before, seconds_after, action):
+    state.audio_chunks.clear()
+    t0 = time.perf_counter()
+    state.recording = True
+    time.sleep(seconds_before)
+    result = action()
+    time.sleep(seconds_after)
+    state.recording = False
+    wall = time.perf_counter() - t0
+    return result, wall, np.concatenate(state.audio_chunks).reshape(-1)
+
+
+def test_switch():
+    state.cfg["mic_device"] = 2
+    assert audio.start_audio_stream()
+    old = state._audio_stream
+    time.sleep(0.1)
+    state.cfg["mic_device"] = 5
+    ok, wall, rec = _record(0.5, 0.5, audio.switch_audio_stream)
+    assert ok and state._audio_stream is not old and not old.active
+    missing = wall * SR - len(rec)
+    assert abs(missing) <= 1.5 * BLOCK, (len(rec), wall * SR)
+    assert abs(_freq(rec[:4000]) - 300) < 15 and abs(_freq(rec[-4000:]) - 1000) < 15
+    quiet = np.abs(rec) < 0.01                    # a tone is never quiet for 3 samples
+    assert not (quiet[:-2] & quiet[1:-1] & quiet[2:]).any(), "silence in the recording"
+    sw = dict(audio.last_switch)
+    assert 0 < sw["total_s"] < audio.VALIDATE_TIMEOUT_S and sw["handover_s"] < 0.1, sw
+    assert any(m.startswith("🎤 Microphone switched in") for m in _logs())
+    assert "ptt_mic_switch_seconds_count 1" in metrics.render()
+    print(f"  {wall:.2f}s recorded across the switch: {len(rec)} samples "
+          f"(wall × 16 kHz {wall * SR:.0f}, off by {missing:+.0f}); switch "
+          f"{sw['total_s'] * 1000:.0f} ms, hand-over {sw['handover_s'] * 1000:.1f} ms")
+
+
+def test_restart_no_sleep():
+    asked = []
+
+    def no_sleep(s):
+        raise AssertionError(f"time.sleep({s}) in the restart path")
+
+    real_time, real_ask = audio.time, audio.request_windows_mic_permission
+    audio.time = types.SimpleNamespace(perf_counter=time.perf_counter, sleep=no_sleep)
+    audio.request_windows_mic_permission = lambda: asked.append(1) or False
+    try:
+        state.cfg["mic_device"] = 2
+        old = state._audio_stream
+        _, wall, rec = _record(0.3, 0.3, audio.restart_audio_stream)
+        assert state._audio_stream is not old and abs(wall * SR - len(rec)) <= 1.5 * BLOCK
+        old = state._audio_stream
+        t0 = time.perf_counter()
+        audio.restart_audio_stream()              # idle: plain reopen
+        dt = time.perf_counter() - t0
+        assert state._audio_stream is not old and not old.active and dt < 0.1, dt
+        assert asked == []
+    finally:
+        audio.time, audio.request_windows_mic_permission = real_time, real_ask
+    logs = _logs()
+    assert sum(m.startswith("🎤 Microphone switched") for m in logs) == 1, logs
+    print(f"  🎤 while recording: hot switch; idle: reopened in {dt * 1000:.1f} ms, no sleep")
+
+
+def test_fallbacks():
+    state.cfg["mic_device"] = 2
+    assert audio.start_audio_stream()
+    old = state._audio_stream
+    state.cfg["mic_device"] = 9                   # opens, never delivers
+    t0 = time.perf_counter()
+    ok, wall, rec = _record(0.2, 0.2, audio.switch_audio_stream)
+    waited = time.perf_counter() - t0 - 0.4
+    assert ok is False and state._audio_stream is old and old.active
+    assert not opened[-1].active and abs(wall * SR - len(rec)) <= 1.5 * BLOCK
+    assert audio.VALIDATE_TIMEOUT_S * 0.9 < waited < audio.VALIDATE_TIMEOUT_S + 0.3
+    assert any("delivered no audio" in m for m in _logs())
+    busy.update((5, None))                        # exclusive mode (e.g. WASAPI)
+    state.cfg["mic_device"] = 5
+    assert audio.switch_audio_stream() and not old.active
+    assert any("next to the running one" in m for m in _logs())
+    busy.clear()
+    print(f"  dead stream dropped after {waited:.2f}s, old kept recording; "
+          "busy device reopened")
+
+
+if __name__ == "__main__":
+    print("Microphone hot-switch test")
+    state.cfg.clear(); state.cfg.update(DEFAULTS)
+    with tempfile.TemporaryDirectory() as d:
+        mic_devices.MIC_CACHE_FILE = Path(d) / "mic_devices.json"
+        real, audio._open_input_stream = audio._open_input_stream, fake_open
+        try:
+            test_switch()
+            test_restart_no_sleep()
+            test_fallbacks()
+        finally:
+            audio._open_input_stream = real
+            for s in opened:
+                s.close()
+    print("Done.")
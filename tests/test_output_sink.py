@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+tests/test_output_sink.py – Output sink chunking + headless throughput benchmark.
+Run: python tests/test_output_sink.py
+
+Tests:
+  1. Chunking keeps Unicode intact (umlauts, emoji, combining accents)
+  2. Throughput of a 600-character transcript: old per-character typing
+     (10 ms interval) vs. bulk chunks, using the CaptureSink stand-in
+  3. Ctrl+V through a local ydotoold stand-in socket vs. spawning a process
+  4. Tk clipboard: on X11 Tk keeps CLIPBOARD ownership (pyperclip's xclip
+     would take it), elsewhere pyperclip copies too; with $DISPLAY also
+     against a real Tk root
+"""
+import sys
+import os
+import socket
+import subprocess
+import tempfile
+import time
+import types
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from ptt.output import CaptureSink, YdotoolClient, _chunks, _KEY_LEFTCTRL, _KEY_V, tk_copy
+
+TEXT = ("Grüße aus Köln – das ist ein längerer diktierter Absatz mit Umlauten, "
+        "Emoji 🎤 und é kombinierten Akzenten. ") * 5
+
+
+def test_unicode_chunking():
+    sink = CaptureSink(chunk_chars=7)
+    sink.type_text(TEXT)
+    assert sink.text == TEXT
+    for chunk in sink.chunks:
+        assert not chunk.startswith("\u0301"), "combining mark split from its base"
+    assert all(len(c) <= 8 for c in _chunks(TEXT, 7))
+    print(f"  {len(TEXT)} chars → {len(sink.chunks)} chunks, text intact")
+
+
+def test_throughput():
+    text = (TEXT * 2)[:600]
+    # Old behaviour: pyautogui.write(text, interval=0.01) → ≥10 ms per char
+    old = CaptureSink(per_char_s=0.010, chunk_chars=1)
+    # Bulk sink: one injection call per 128-char chunk (~1 ms each)
+    new = CaptureSink(per_chunk_s=0.001, chunk_chars=128)
+    old_cps = old.type_text(text)
+    new_cps = new.type_text(text)
+    print(f"  per-char (10 ms):  {old_cps:8.0f} chars/s  → {len(text)/old_cps:5.2f} s")
+    print(f"  bulk chunks:       {new_cps:8.0f} chars/s  → {len(text)/new_cps:5.3f} s")
+    assert new.text == text and new_cps > old_cps * 10
+
+
+def test_ydotoold_socket(n=200):
+    path = os.path.join(tempfile.mkdtemp(), ".ydotool_socket")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    server.bind(path)
+    client = YdotoolClient(path)
+    client.combo(_KEY_LEFTCTRL, _KEY_V)
+    events = [YdotoolClient._EVENT.unpack(server.recv(64))[2:] for _ in range(8)]
+    keys = [(code, value) for typ, code, value in events if typ == 1]
+    assert keys == [(_KEY_LEFTCTRL, 1), (_KEY_V, 1), (_KEY_V, 0), (_KEY_LEFTCTRL, 0)], keys
+    assert client.can_type("Hello, world!") and not client.can_type("Grüße")
+
+    server.setblocking(False)
+    t0 = time.perf_counter()
+    for _ in range(n):
+        client.combo(_KEY_LEFTCTRL, _KEY_V)
+        try:
+            while server.recv(64): pass
+        except BlockingIOError:
+            pass
+    sock_ms = (time.perf_counter() - t0) / n * 1000
+    # Stand-in for `ydotool key ctrl+v`: cost of one fork/exec per paste
+    t0 = time.perf_counter()
+    for _ in range(20):
+        subprocess.run([sys.executable, "-c", "pass"])
+    spawn_ms = (time.perf_counter() - t0) / 20 * 1000
+    client.close(); server.close(); os.unlink(path)
+    print(f"  Ctrl+V via socket: {sock_ms:7.3f} ms   via process spawn: {spawn_ms:6.1f} ms")
+    assert sock_ms < spawn_ms
+
+
+class FakeSelection:
+    """Tk root with X11 selection semantics: one CLIPBOARD owner at a time."""
+
+    def __init__(self, system):
+        self.system, self.owner, self.data = system, None, ""
+        self.tk = types.SimpleNamespace(call=self.call)
+
+    def clipboard_clear(self):
+        self.owner, self.data = ".", ""
+
+    def clipboard_append(self, text):
+        self.data += text
+
+    def clipboard_get(self):
+        return self.data
+
+    def call(self, *args):
+        if args == ("tk", "windowingsystem"):
+            return self.system
+        assert args == ("selection", "own", "-selection", "CLIPBOARD"), args
+        return self.owner or ""
+
+
+def test_tk_copy():
+    copied = []
+    fake = types.ModuleType("pyperclip")
+    real = sys.modules.get("pyperclip")
+    sys.modules["pyperclip"] = fake
+    try:
+        for system in ("x11", "win32"):
+            root = FakeSelection(system)
+
+            def xclip(text, root=root):
+                copied.append((system, text))
+                if root.system == "x11":      # xclip / xsel now own CLIPBOARD
+                    root.owner = None
+            fake.copy = xclip
+            assert tk_copy(root, TEXT), system
+        assert copied == [("win32", TEXT)], copied
+    finally:
+        if real is None:
+            sys.modules.pop("pyperclip", None)
+        else:
+            sys.modules["pyperclip"] = real
+    print("  Tk clipboard: X11 keeps ownership (no pyperclip), win32 copies twice")
+    if not os.environ.get("DISPLAY"):
+        print("  (no $DISPLAY – real Tk clipboard check skipped)")
+        return
+    import tkinter as tk
+    root = tk.Tk()
+    root.withdraw()
+    try:
+        system = root.tk.call("tk", "windowingsystem")
+        t0 = time.perf_counter()
+        assert tk_copy(root, TEXT), system
+        dt = time.perf_counter() - t0
+        assert root.clipboard_get() == TEXT
+    finally:
+        root.destroy()
+    print(f"  real Tk ({system}): ownership confirmed in {dt * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    print("Output sink test")
+    test_unicode_chunking()
+    test_throughput()
+    test_ydotoold_socket()
+    test_tk_copy()
+    print("Done.")
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+tests/test_ov_cache.py – OpenVINO compiled-model cache: keys, invalidation, eviction.
+Run: python tests/test_ov_cache.py [--ov MODEL_DIR]
+
+Tests (no OpenVINO needed):
+  1. Same model/device/version/props → same directory, reported as hit once
+     blobs exist
+  2. OpenVINO upgrade, changed properties or re-downloaded IR files → new
+     directory; the stale one is removed
+  3. Size limit evicts least recently used directories, never the current one
+  --ov MODEL_DIR: compile a WhisperPipeline on the OpenVINO CPU device twice
+     (separate processes) – the second launch must hit the cache
+"""
+import sys
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import ptt.state as state
+from ptt import ov_cache
+
+
+def _model_dir(root: Path, name="base-ov") -> Path:
+    d = root / name
+    d.mkdir(parents=True, exist_ok=True)
+    (d / "openvino_encoder_model.xml").write_text("<net/>")
+    (d / "openvino_encoder_model.bin").write_bytes(b"\0" * 1000)
+    return d
+
+
+def _fake_compile(d: Path, size=1024 * 1024):
+    (d / "1234567890.blob").write_bytes(b"\1" * size)
+
+
+def test_hit_and_invalidation():
+    state.cfg.clear()
+    root  = Path(tempfile.mkdtemp())
+    model = _model_dir(root)
+    cache = root / "ov_cache"
+    props = {"INFERENCE_NUM_THREADS": 4}
+
+    d1, hit = ov_cache.prepare("base", "CPU", model, props, root=cache, version="2025.1")
+    assert not hit
+    _fake_compile(d1)
+    d2, hit = ov_cache.prepare("base", "CPU", model, props, root=cache, version="2025.1")
+    assert hit and d2 == d1
+    print("  second launch: cache hit, same directory")
+
+    for label, kw in [("OV upgrade", dict(props=props, version="2025.2")),
+                      ("new props",  dict(props={"INFERENCE_NUM_THREADS": 2}, version="2025.2"))]:
+        d, hit = ov_cache.prepare("base", "CPU", model, root=cache, **kw)
+        assert not hit and d != d1 and not d1.exists()
+        _fake_compile(d); d1 = d
+        print(f"  {label}: recompiles, stale directory removed")
+
+    time.sleep(0.01)
+    (model / "openvino_encoder_model.bin").write_bytes(b"\0" * 2000)   # re-downloaded
+    d, hit = ov_cache.prepare("base", "CPU", model, {"INFERENCE_NUM_THREADS": 2},
+                              root=cache, version="2025.2")
+    assert not hit and not d1.exists()
+    print("  changed IR files: recompiles")
+
+    other, _ = ov_cache.prepare("base", "NPU", model, {}, root=cache, version="2025.2")
+    assert d.exists() and other.exists(), "other device must not be dropped"
+
+
+def test_eviction():
+    root  = Path(tempfile.mkdtemp())
+    cache = root / "ov_cache"
+    dirs  = []
+    for name in ("tiny", "base", "small"):
+        d, _ = ov_cache.prepare(name, "CPU", _model_dir(root, f"{name}-ov"), {},
+                                root=cache, version="x", max_mb=100)
+        _fake_compile(d, 2 * 1024 * 1024)
+        dirs.append(d)
+        time.sleep(0.01)
+    # touch "tiny" again → "base" is now least recently used
+    ov_cache.prepare("tiny", "CPU", root / "tiny-ov", {}, root=cache, version="x", max_mb=100)
+    current, _ = ov_cache.prepare("medium", "CPU", _model_dir(root, "medium-ov"), {},
+                                  root=cache, version="x", max_mb=5)
+    left = sorted(p.name.split("-")[0] for p in cache.iterdir())
+    assert not dirs[1].exists() and current.exists(), left
+    assert sum(ov_cache.dir_size(p) for p in cache.iterdir()) <= 5 * 1024 * 1024
+    print(f"  5 MB limit: kept {left}, evicted least recently used")
+
+
+_CHILD = """
+import sys, time
+sys.path.insert(0, {root!r})
+import ptt.state as state
+from ptt.config import load_settings
+load_settings(); state.cfg["models_dir"] = {models!r}
+from ptt.model_manager import _ov_engine
+t0 = time.time(); _ov_engine({model_dir!r}, "CPU"); print(time.time() - t0)
+"""
+
+def test_real_cpu_compile(model_dir: str):
+    models = tempfile.mkdtemp()
+    code = _CHILD.format(root=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         models=models, model_dir=model_dir)
+    times = [float(subprocess.run([sys.executable, "-c", code], capture_output=True,
+                                  text=True, check=True).stdout.split()[-1]) for _ in range(2)]
+    print(f"  OpenVINO CPU: first launch {times[0]:.1f} s, second launch {times[1]:.1f} s")
+    assert any(Path(models, "ov_cache").rglob("*.blob"))
+    assert times[1] < times[0]
+
+
+if __name__ == "__main__":
+    print("OpenVINO compiled-model cache test")
+    test_hit_and_invalidation()
+    test_eviction()
+    if "--ov" in sys.argv:
+        test_real_cpu_compile(sys.argv[sys.argv.index("--ov") + 1])
+    print("Done.")
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+tests/test_profiler.py – Sampling profiler and allocation tracing.
+Run: python tests/test_profiler.py
+
+Uses the stub engine, so no model is needed.
+
+Tests:
+  1. Off by default: nothing wrapped, no sampler thread, tracemalloc idle
+  2. Sampler: a busy named thread shows up in the folded stacks with its
+     function, in the "frame;frame;… count" format flame graph tools read
+  3. Allocation tracing: load_model / transcribe_and_paste log their peak and
+     retained memory, the report is written and the originals are restored
+  4. stop() while a traced call runs: it waits for the call, whose report
+     lines are kept; past STOP_WAIT_S the call still returns its value
+"""
+import sys
+import os
+import re
+import tempfile
+import threading
+import time
+import tracemalloc
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+import ptt.state as state
+from ptt import model_manager, profiler, transcribe
+from ptt.constants import DEFAULTS
+
+ORIGINALS = (transcribe.transcribe_and_paste, model_manager.load_model)
+
+
+def _drain():
+    msgs = []
+    while not state.ui_queue.empty():
+        msgs.append(state.ui_queue.get_nowait())
+    return msgs
+
+
+def test_off_by_default():
+    os.environ.pop("PTT_PROFILE", None)
+    assert not profiler.start_from_env() and not profiler.active()
+    assert (transcribe.transcribe_and_paste, model_manager.load_model) == ORIGINALS
+    assert not any(t.name == "profiler" for t in threading.enumerate())
+    assert not tracemalloc.is_tracing()
+    print("  disabled: no wrappers, no sampler thread, no tracemalloc")
+
+
+def _spin(stop):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def test_sampler():
+    stop = threading.Event()
+    th = threading.Thread(target=_spin, args=(stop,), name="busy-worker")
+    th.start()
+    with tempfile.TemporaryDirectory() as d:
+        assert profiler.start(alloc=False)
+        assert not profiler.start(), "second session must be refused"
+        time.sleep(0.5)
+        path = profiler.stop(d)
+        stop.set(); th.join()
+        lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines and all(re.match(r"^\S.* \d+$", l) for l in lines), lines[:3]
+    busy = [l for l in lines if l.startswith("busy-worker;")]
+    assert busy and any("_spin (test_profiler.py:" in l for l in busy), busy[:3]
+    total = sum(int(l.rsplit(" ", 1)[1]) for l in busy)
+    print(f"  {len(lines)} folded stacks, busy-worker in {total} samples")
+    assert not profiler.active()
+
+
+def test_alloc_tracing():
+    state.cfg.clear(); state.cfg.update(DEFAULTS)
+    state.cfg.update({"model": "small", "device": "cpu", "engine": "stub",
+                      "paste_mode": "clipboard", "history_enabled": False,
+                      "sound_feedback": False, "language": "en"})
+    with tempfile.TemporaryDirectory() as d:
+        assert profiler.start(sample=False)
+        assert model_manager.load_model is not ORIGINALS[1]
+        _drain()
+        assert model_manager.load_model()
+        state.audio_chunks.append((0.1 * np.ones((16000, 1))).astype(np.float32))
+        transcribe.transcribe_and_paste()
+        path = profiler.stop(d)
+        report = path.read_text(encoding="utf-8")
+    logs = [m[1] for m in _drain() if m[0] == "log"]
+    for name in ("load_model", "transcribe_and_paste"):
+        assert any(l.startswith(f"🧠 {name}: peak +") for l in logs), logs
+        assert f" {name}: peak +" in report
+    print("  " + "\n  ".join(l for l in logs if l.startswith("🧠 ") and "peak" in l))
+    assert (transcribe.transcribe_and_paste, model_manager.load_model) == ORIGINALS
+    assert not tracemalloc.is_tracing()
+
+
+def _slow(seconds):
+    def fn():
+        data = bytearray(1 << 20)
+        time.sleep(seconds)
+        return len(data)
+    return fn
+
+
+def _in_thread(fn):
+    out = {}
+
+    def run():
+        try:
+            out["value"] = fn()
+        except BaseException as e:
+            out["error"] = e
+    th = threading.Thread(target=run)
+    th.start()
+    return th, out
+
+
+def test_stop_during_call():
+    with tempfile.TemporaryDirectory() as d:
+        assert profiler.start(sample=False)
+        th, out = _in_thread(profiler._traced("slow_call", _slow(0.3), profiler._report))
+        time.sleep(0.05)
+        t0 = time.perf_counter()
+        path = profiler.stop(d)
+        waited = time.perf_counter() - t0
+        th.join()
+        assert out == {"value": 1 << 20}, out
+        assert waited > 0.2 and " slow_call: peak +" in path.read_text(encoding="utf-8")
+
+        wait, profiler.STOP_WAIT_S = profiler.STOP_WAIT_S, 0.05
+        try:
+            assert profiler.start(sample=False)
+            th, out = _in_thread(profiler._traced("slow_call", _slow(0.3), profiler._report))
+            time.sleep(0.05)
+            profiler.stop(d)
+            th.join()
+        finally:
+            profiler.STOP_WAIT_S = wait
+    assert out == {"value": 1 << 20}, out
+    logs = [m[1] for m in _drain() if m[0] == "log"]
+    assert any("slow_call: tracing stopped before it finished" in l for l in logs), logs
+    assert not tracemalloc.is_tracing()
+    print(f"  stop() waited {waited * 1000:.0f} ms for the call in flight; "
+          "past the limit the call still returned its value")
+
+
+if __name__ == "__main__":
+    print("Profiler test")
+    test_off_by_default()
+    test_sampler()
+    test_alloc_tracing()
+    test_stop_during_call()
+    print("Done.")
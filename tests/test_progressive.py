@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+tests/test_progressive.py – Progressive startup: time-to-first-utterance + atomic swap.
+Run: python tests/test_progressive.py
+
+faster-whisper is replaced by a stand-in whose load time scales with the
+model size (tiny 0.1 s … large-v3 2 s), so no models are needed.
+
+Tests:
+  1. Time until PTT can serve: plain load vs. progressive start
+  2. While the target loads, every snapshot is a complete (model, name) pair –
+     never None after the first serve, never a mix of two models
+  3. After the swap the configured model serves and the starter is released
+"""
+import sys
+import os
+import threading
+import time
+import types
+import weakref
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+LOAD_S = {"tiny": 0.1, "base": 0.2, "small": 0.5, "medium": 1.0, "large-v3": 2.0}
+
+
+class StandInWhisperModel:
+    def __init__(self, path, **kw):
+        self.name = os.path.basename(str(path)).replace("faster-whisper-", "")
+        time.sleep(LOAD_S.get(self.name, 0.1))
+
+    def transcribe(self, audio, **kw):
+        return iter(()), types.SimpleNamespace(language="en", language_probability=1.0,
+                                               duration=len(audio) / 16000)
+
+fw = types.ModuleType("faster_whisper")
+fw.WhisperModel = StandInWhisperModel
+sys.modules["faster_whisper"] = fw
+
+import ptt.state as state
+from ptt import model_manager
+from ptt.constants import DEFAULTS
+from ptt.model_manager import active_model, load_model_progressive
+
+# No downloads: hand the model name straight to the stand-in
+model_manager._resolve_model = lambda name, status_cb=None: name
+
+
+def run(progressive: bool, target="large-v3"):
+    state.cfg.clear(); state.cfg.update(DEFAULTS)
+    state.cfg.update({"model": target, "device": "cpu", "progressive_start": progressive})
+    model_manager._publish()
+    t0, first, bad, served = time.perf_counter(), None, 0, set()
+    th = threading.Thread(target=load_model_progressive); th.start()
+    while th.is_alive():
+        eng, name, _ = active_model()
+        if eng is not None:
+            first = first or time.perf_counter() - t0
+            served.add(name)
+            bad += eng.model.name != name
+        elif first is not None:
+            bad += 1          # model vanished after first serve
+        time.sleep(0.002)
+    th.join()
+    served.add(state.model_name)
+    return first, time.perf_counter() - t0, bad, served
+
+
+def test_time_to_first_serve():
+    plain = run(False)
+    prog  = run(True)
+    print(f"  {'mode':<12s} {'first serve':>12s} {'target ready':>13s}")
+    print(f"  {'plain':<12s} {plain[0] or plain[1]:>11.2f}s {plain[1]:>12.2f}s")
+    print(f"  {'progressive':<12s} {prog[0]:>11.2f}s {prog[1]:>12.2f}s")
+    assert prog[0] < 0.5 and (plain[0] or plain[1]) > 1.5
+    assert prog[2] == 0, "inconsistent snapshot during swap"
+    assert prog[3] == {"tiny", "large-v3"}
+
+
+def test_swap_releases_starter():
+    state.cfg.update({"model": "medium", "progressive_start": True})
+    model_manager._publish()
+    starter = []
+    orig = model_manager._publish
+    def spy(engine=None, **kw):
+        if kw.get("name") == "tiny":
+            starter.append(weakref.ref(engine))
+        orig(engine, **kw)
+    model_manager._publish = spy
+    try:
+        load_model_progressive()
+    finally:
+        model_manager._publish = orig
+    assert state.model_name == "medium" and starter and starter[0]() is None
+    print("  after swap: 'medium' serves, starter model released")
+
+
+def test_plain_when_not_smaller():
+    state.cfg.update({"model": "tiny", "progressive_start": True})
+    t0 = time.perf_counter()
+    load_model_progressive()
+    assert state.model_name == "tiny" and time.perf_counter() - t0 < 0.5
+
+
+if __name__ == "__main__":
+    print("Progressive startup test")
+    test_time_to_first_serve()
+    test_swap_releases_starter()
+    test_plain_when_not_smaller()
+    print("Done.")
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+tests/test_settings_store.py – Debounced / atomic settings writer test.
+Run: python tests/test_settings_store.py
+
+Tests:
+  1. A burst of saves (e.g. a title-bar drag) results in a single write
+  2. Saving unchanged settings does not touch the file
+  3. flush() writes synchronously and leaves no temp files behind
+  4. Reverting to what is on disk while a write is in flight is not lost
+  5. flush() with nothing pending waits for the write in progress
+"""
+import sys
+import os
+import json
+import time
+import tempfile
+import threading
+from pathlib import Path
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from ptt.config import _SettingsWriter, _serialize
+
+
+def _writer(tmp):
+    return _SettingsWriter(Path(tmp) / "settings.json", debounce=0.1)
+
+
+def test_burst_coalesced():
+    with tempfile.TemporaryDirectory() as tmp:
+        w = _writer(tmp)
+        for x in range(50):
+            w.submit(_serialize({"window_x": x}))
+        time.sleep(0.4)
+        assert w.writes == 1, w.writes
+        assert json.loads(w.path.read_text(encoding="utf-8")) == {"window_x": 49}
+        print(f"  50 saves → {w.writes} write")
+
+
+def test_unchanged_not_rewritten():
+    with tempfile.TemporaryDirectory() as tmp:
+        w = _writer(tmp)
+        w.submit(_serialize({"a": 1})); w.flush()
+        mtime = w.path.stat().st_mtime_ns
+        w.submit(_serialize({"a": 1}))
+        assert not w.dirty
+        time.sleep(0.3)
+        assert w.writes == 1 and w.path.stat().st_mtime_ns == mtime
+        print("  unchanged settings → no write")
+
+
+def test_flush_atomic():
+    with tempfile.TemporaryDirectory() as tmp:
+        w = _writer(tmp)
+        w.submit(_serialize({"hotkey": "ctrl+space"}))
+        w.flush()
+        assert json.loads(w.path.read_text(encoding="utf-8"))["hotkey"] == "ctrl+space"
+        assert sorted(os.listdir(tmp)) == ["settings.json"]
+        print("  flush → written, no temp files left")
+
+
+class _SlowWriter(_SettingsWriter):
+    """Holds every write until ``gate`` is set."""
+
+    def __init__(self, path):
+        super().__init__(path, debounce=0.0)
+        self.gate, self.started = threading.Event(), threading.Event()
+
+    def _write_file(self, snapshot):
+        self.started.set()
+        self.gate.wait(5)
+        super()._write_file(snapshot)
+
+
+def test_revert_during_write():
+    with tempfile.TemporaryDirectory() as tmp:
+        w = _SlowWriter(Path(tmp) / "settings.json")
+        a, b = _serialize({"opacity": 0.9}), _serialize({"opacity": 0.5})
+        w.gate.set(); w.submit(a); w.flush()
+        w.gate.clear(); w.started.clear()
+        w.submit(b)                       # B taken by the writer thread …
+        assert w.started.wait(2)
+        w.submit(a)                       # … user reverts to A meanwhile
+        assert w.dirty
+        w.gate.set(); w.flush()
+        assert w.path.read_text(encoding="utf-8") == a and w.writes == 3
+        print("  revert to the on-disk value during a write → A written again")
+
+
+def test_flush_waits_for_write():
+    with tempfile.TemporaryDirectory() as tmp:
+        w = _SlowWriter(Path(tmp) / "settings.json")
+        w.submit(_serialize({"hotkey": "f9"}))
+        assert w.started.wait(2)          # in flight, nothing pending
+        threading.Timer(0.2, w.gate.set).start()
+        t0 = time.perf_counter()
+        w.flush()
+        waited = time.perf_counter() - t0
+        assert waited >= 0.15 and w.writes == 1 and not w.dirty, waited
+        assert json.loads(w.path.read_text(encoding="utf-8")) == {"hotkey": "f9"}
+        print(f"  flush() waited {waited * 1000:.0f} ms for the write in progress")
+
+
+if __name__ == "__main__":
+    print("Settings writer test")
+    test_burst_coalesced()
+    test_unchanged_not_rewritten()
+    test_flush_atomic()
+    test_revert_during_write()
+    test_flush_waits_for_write()
+    print("Done.")
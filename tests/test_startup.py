@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+tests/test_startup.py – Startup orchestrator and timeline.
+Run: python tests/test_startup.py
+
+Steps are sleeps standing in for the real ones (hardware probe, imports,
+model load, …), so no display, sound card or model is needed.
+
+Tests:
+  1. Dependencies are respected, independent steps overlap: wall time is the
+     critical path, not the sum; main-thread steps run on the caller's thread
+     and run() returns without waiting for background steps
+  2. A failed background step is logged and its dependents still run; a
+     failing main-thread step (setup cancelled) aborts before anything that
+     depends on it starts
+  3. Ready milestone, timeline log and ptt_startup_seconds
+  4. The app's helper steps: engine preload and model resolution (stub engine)
+"""
+import sys
+import os
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import ptt.state as state
+from ptt import metrics, model_manager, startup
+from ptt.constants import DEFAULTS
+from ptt.startup import Cancelled, Startup
+
+
+def _logs():
+    out = []
+    while not state.ui_queue.empty():
+        msg = state.ui_queue.get_nowait()
+        if msg[0] == "log":
+            out.append(msg[1])
+    return out
+
+
+def _sleep(s, result=None, seen=None, name=None):
+    def fn():
+        if seen is not None:
+            seen.append((name, threading.current_thread().name))
+        time.sleep(s)
+        return result
+    return fn
+
+
+def test_overlap():
+    seen = []
+    boot = Startup()
+    boot.add("hardware", _sleep(0.3, seen=seen, name="hardware"))
+    boot.add("settings", _sleep(0.05, "cfg", seen, "settings"), main=True)
+    boot.add("imports",  _sleep(0.3, seen=seen, name="imports"), after=("settings",))
+    boot.add("ui",       _sleep(0.1, "app", seen, "ui"), after=("settings",), main=True)
+    boot.add("resolve",  _sleep(0.1, seen=seen, name="resolve"), after=("hardware", "settings"))
+    boot.add("load",     _sleep(0.2, seen=seen, name="load"), after=("ui", "imports", "resolve"))
+    t0 = time.perf_counter()
+    boot.run()
+    returned = time.perf_counter() - t0
+    assert boot.results["ui"] == "app" and returned < 0.25, returned
+    assert boot.wait(5)
+    wall = time.perf_counter() - t0
+    s = boot.steps
+    assert s["imports"].start >= s["settings"].end and s["resolve"].start >= s["hardware"].end
+    assert s["load"].start >= max(s["ui"].end, s["imports"].end, s["resolve"].end)
+    assert s["hardware"].start < s["settings"].end          # no dependency: starts at once
+    threads = dict(seen)
+    assert threads["settings"] == threads["ui"] == threading.current_thread().name
+    assert threads["load"] == "startup-load"
+    serial = 0.3 + 0.05 + 0.3 + 0.1 + 0.1 + 0.2
+    assert wall < 0.8, wall               # critical path hardware → resolve → load: 0.6 s
+    _logs()
+    print(f"  6 steps ({serial:.2f}s serial): run() returned after {returned * 1000:.0f} ms, "
+          f"all done after {wall * 1000:.0f} ms")
+
+
+def test_failures():
+    ran = []
+
+    def boom():
+        raise OSError("no accelerator")
+
+    boot = Startup()
+    boot.add("hardware", boom)
+    boot.add("resolve",  lambda: ran.append("resolve"), after=("hardware",))
+    boot.run()
+    assert boot.wait(5) and ran == ["resolve"]
+    assert any("'hardware' failed: no accelerator" in m for m in _logs())
+    assert "failed: no accelerator" in boot.timeline()
+
+    def cancel():
+        raise Cancelled("first-start setup cancelled")
+
+    boot = Startup()
+    boot.add("settings", lambda: None, main=True)
+    boot.add("setup",    cancel, after=("settings",), main=True)
+    boot.add("ui",       lambda: ran.append("ui"), after=("setup",), main=True)
+    boot.add("audio",    lambda: ran.append("audio"), after=("setup",))
+    try:
+        boot.run()
+        raise AssertionError("Cancelled not raised")
+    except Cancelled:
+        pass
+    time.sleep(0.05)
+    assert ran == ["resolve"], ran
+    try:
+        b = Startup(); b.add("x", lambda: None, after=("missing",)); b.run()
+        raise AssertionError("unknown dependency accepted")
+    except ValueError:
+        pass
+    print("  failed background step logged, dependents still run; cancelled setup aborts")
+
+
+def test_ready_and_timeline():
+    boot = startup._last = Startup(time.perf_counter() - 0.1, ready=("ui", "model-ready"))
+    boot.record("launch", boot.t0, boot.t0 + 0.1)
+
+    def load():
+        time.sleep(0.1)
+        boot.mark("model-ready")      # starter serving …
+        time.sleep(0.2)               # … while the target loads
+        boot.mark("model-ready")
+
+    boot.add("ui",   _sleep(0.05), main=True)
+    boot.add("load", load, after=("ui",))
+    boot.run()
+    assert boot.wait(5)
+    assert 0.2 < boot.ready_s < 0.35 and boot.done_s > boot.ready_s + 0.15, (boot.ready_s, boot.done_s)
+    logs = _logs()
+    assert any(m.startswith("🚀 Ready after") for m in logs), logs
+    tl = [m for m in logs if m.startswith("🚀 Startup timeline")]
+    assert len(tl) == 1 and "launch" in tl[0] and "◆" in tl[0] and "main" in tl[0], logs
+    text = metrics.render()
+    assert 'ptt_startup_seconds{step="ready"}' in text and 'ptt_startup_seconds{step="load"}' in text
+    print("  " + "\n  ".join(tl[0].splitlines()))
+
+
+def test_app_steps():
+    state.cfg.clear(); state.cfg.update(DEFAULTS)
+    state.cfg.update({"engine": "stub", "device": "cpu", "model": "small"})
+    assert startup._preload_engine() == []
+    assert model_manager.fetch_model() == "stub"
+    state.cfg.update({"engine": "auto", "device": "cpu"})
+    missing = startup._preload_engine()
+    assert missing in ([], ["faster_whisper"]), missing
+    print(f"  preload ct2 → missing {missing or 'nothing'}; stub resolves without files")
+
+
+if __name__ == "__main__":
+    print("Startup orchestrator test")
+    test_overlap()
+    test_failures()
+    test_ready_and_timeline()
+    test_app_steps()
+    print("Done.")
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+tests/test_worker.py – Out-of-process inference worker.
+Run: python tests/test_worker.py
+
+Stand-in engines (registered here, so the spawned worker registers them too):
+"busy" decodes for 1.5 s in Python code holding the GIL, "crashy" kills its
+process on the 3rd decode (warm-up counts as the 1st).
+
+Tests:
+  1. Round trip: same text as in-process, audio goes through shared memory
+     (pipe messages stay a few hundred bytes for 10 s of audio)
+  2. Crash: the request in flight fails, the GUI process lives on, the worker
+     is restarted and serves the next utterance; during a restart backoff
+     requests fail at once instead of waiting behind it
+  3. Jitter of a simulated 32 ms audio callback while decoding in-process vs.
+     in the worker
+"""
+import sys
+import os
+import pickle
+import statistics
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import numpy as np
+
+import ptt.state as state
+from ptt import engines
+from ptt.constants import DEFAULTS
+from ptt.engines import register
+from ptt.engines.process import ProcessEngine, WorkerCrashed
+from ptt.engines.stub import StubEngine
+
+SR     = 16000
+BUSY_S = 1.5
+
+
+@register
+class BusyStub(StubEngine):
+    name = "busy"
+
+    def _load(self, path, device, **kw):
+        return super()._load(path, device, text="one two three four five six",
+                             latency_s=BUSY_S, busy=True)
+
+
+@register
+class CrashyStub(StubEngine):
+    name = "crashy"
+
+    def _load(self, path, device, **kw):
+        return super()._load(path, device, crash_every=3)
+
+
+def _audio(seconds):
+    return (0.1 * np.sin(np.arange(int(seconds * SR)) / 10)).astype(np.float32)
+
+
+def _cfg():
+    state.cfg.clear(); state.cfg.update(DEFAULTS)
+    state.cfg.update({"device": "cpu", "inference_process": False})
+    return dict(state.cfg)
+
+
+def _text(eng, audio):
+    segments, _ = eng.transcribe(audio, language="en")
+    return " ".join(s.text for s in segments)
+
+
+def test_round_trip():
+    from ptt.model_manager import create_engine
+    _cfg()
+    state.cfg["inference_process"] = True
+    local = engines.create("stub").load("m", "cpu", model_name="m")
+    eng   = create_engine("stub", "m", "cpu")
+    assert isinstance(eng, ProcessEngine)
+    sent  = []
+    send  = eng.model.conn.send
+    eng.model.conn.send = lambda msg: (sent.append(len(pickle.dumps(msg))), send(msg))
+    audio = _audio(10)
+    assert _text(eng, audio) == _text(local, audio) == "stub 10.00 s"
+    assert eng.detect_language(audio, ["de", "en"]) == ("en", 1.0)
+    assert max(sent) < 1000, sent
+    print(f"  10 s audio ({audio.nbytes} bytes) → pipe messages {max(sent)} bytes max, "
+          f"worker pid {eng.pid}")
+    eng.unload()
+
+
+def test_crash_restart():
+    cfg = _cfg()
+    eng = ProcessEngine("crashy").load("m", "cpu", model_name="m", cfg=cfg)
+    eng.warmup()
+    pid = eng.pid
+    assert _text(eng, _audio(1)) == "stub 1.00 s"
+    try:
+        _text(eng, _audio(1))
+        raise AssertionError("crash not reported")
+    except WorkerCrashed as e:
+        print(f"  utterance in flight: {e}")
+    t0 = time.perf_counter()
+    assert _text(eng, _audio(2)) == "stub 2.00 s"   # waits for the restart
+    assert eng.pid != pid and eng.stats.errors == 1
+    print(f"  worker restarted (pid {pid} → {eng.pid}) and served after "
+          f"{time.perf_counter() - t0:.1f}s; GUI process {os.getpid()} unaffected")
+
+    worker = eng.model
+    worker.restarts = 2                  # third crash in a row: 2 s backoff
+    worker.proc.kill()
+    worker.proc.join()
+    t0 = time.perf_counter()
+    try:
+        _text(eng, _audio(1))
+        raise AssertionError("request waited for the backoff")
+    except WorkerCrashed as e:
+        failed = time.perf_counter() - t0
+        assert failed < 0.2 and "restart" in str(e), (failed, e)
+    deadline = time.perf_counter() + 10
+    while worker._restart_at is None and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert worker._restart_at is not None
+    while True:                          # served again once the backoff is over
+        try:
+            assert _text(eng, _audio(1)) == "stub 1.00 s"
+            break
+        except WorkerCrashed:
+            assert time.perf_counter() < deadline
+            time.sleep(0.1)
+    print(f"  during the 2 s backoff: request failed in {failed * 1000:.0f} ms; served "
+          f"again after {time.perf_counter() - t0:.1f}s")
+    eng.unload()
+
+
+def _callback_jitter(decode, block_s=0.032):
+    """Lateness of a 32 ms periodic callback while *decode* runs."""
+    late, stop = [], threading.Event()
+
+    def callback_loop():
+        nxt = time.perf_counter() + block_s
+        while not stop.is_set():
+            time.sleep(max(0.0, nxt - time.perf_counter()))
+            late.append((time.perf_counter() - nxt) * 1000)
+            nxt += block_s
+
+    th = threading.Thread(target=callback_loop); th.start()
+    time.sleep(0.2)
+    decode()
+    stop.set(); th.join()
+    late.sort()
+    return (statistics.median(late), late[int(len(late) * 0.99) - 1], late[-1])
+
+
+def test_jitter():
+    cfg     = _cfg()
+    audio   = _audio(5)
+    local   = engines.create("busy").load("m", "cpu", model_name="m")
+    worker  = ProcessEngine("busy").load("m", "cpu", model_name="m", cfg=cfg)
+    results = {"in-process": _callback_jitter(lambda: _text(local, audio)),
+               "worker":     _callback_jitter(lambda: _text(worker, audio))}
+    print(f"  {'callback lateness':<18s} {'p50 ms':>7s} {'p99 ms':>7s} {'max ms':>7s}")
+    for k, (p50, p99, mx) in results.items():
+        print(f"  {k:<18s} {p50:>7.2f} {p99:>7.2f} {mx:>7.2f}")
+    assert results["worker"][0] < results["in-process"][0]
+    worker.unload()
+
+
+if __name__ == "__main__":
+    print("Inference worker test")
+    test_round_trip()
+    test_crash_restart()
+    test_jitter()
+    print("Done.")
@@ -6,11 +6,13 @@ Thin launcher: devnull redirect (PyInstaller) + main().
 All application logic lives in the ptt/ package.
 """
 
+import time
+T0 = time.perf_counter()   # process start for the startup timeline (ptt/startup.py)
+
 import os
 import sys
 import signal
-import threading
-import tkinter as tk
+import multiprocessing
 
 # PyInstaller windowed builds set sys.stdout/stderr to None; redirect to devnull
 # so that third-party libraries (openvino_genai, tqdm, …) don't crash on .write()
@@ -19,11 +21,7 @@ if sys.stdout is None:
 if sys.stderr is None:
     sys.stderr = open(os.devnull, "w")
 
-from ptt import state
-from ptt.config import load_settings
-from ptt.audio import start_audio_stream
-from ptt.ui.app import WhisperPTTApp
-from ptt.constants import SETTINGS_FILE
+from ptt import state, metrics, profiler, startup
 
 
 def main():
@@ -32,23 +30,17 @@ def main():
     if sys.platform != "win32":
         signal.signal(signal.SIGINT, signal.SIG_IGN)
 
-    load_settings()
-    
-    # Show first-time setup dialog if no settings.json exists
-    if not SETTINGS_FILE.exists():
-        from ptt.ui.setup import show_first_setup
-        if not show_first_setup():
-            # User cancelled setup
-            return
-
-    root = tk.Tk()
-    root.withdraw()  # Hide until app is ready
-    app  = WhisperPTTApp(root)  # noqa: F841
+    profiler.start_from_env()   # PTT_PROFILE=1 | sample | alloc
 
-    threading.Thread(target=start_audio_stream, daemon=True).start()
+    # Settings, first-time setup, hardware probe, model, mic, listener and
+    # overlay in dependency order, overlapping where possible
+    try:
+        root = startup.launch(T0)
+    except startup.Cancelled:
+        return   # User cancelled setup
 
-    root.deiconify()  # Show after app initialization
     root.mainloop()
+    metrics.stop()
 
     if state._audio_stream is not None:
         try: state._audio_stream.stop(); state._audio_stream.close()
@@ -56,4 +48,5 @@ def main():
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()   # frozen build: the inference worker re-enters here
     main()